@@ -7,24 +7,18 @@ for each feature, using the feature's files and description.
 """
 
 import sys
-import subprocess
-import yaml
 import click
 from pathlib import Path
 
-# Import shared utilities
-from utils import log_info, log_error, log_success, log_warning
-
+# Make the build package importable when run as a standalone script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def load_features(features_file: Path) -> dict:
-    """Load features from YAML file"""
-    try:
-        with open(features_file, 'r') as f:
-            data = yaml.safe_load(f)
-            return data.get('features', {})
-    except Exception as e:
-        log_error(f"Failed to load features file: {e}")
-        return {}
+# Import shared utilities
+from build.common.git import GitError
+from build.common.utils import log_info, log_error, log_success, log_warning
+from build.modules.annotate.annotate import git_add_and_commit, group_modified_files
+from build.modules.annotate.status import WorktreeStatus
+from build.modules.feature.index import load_feature_index
 
 
 def check_git_repo(chromium_src: Path) -> bool:
@@ -33,85 +27,34 @@ def check_git_repo(chromium_src: Path) -> bool:
     return git_dir.exists()
 
 
-def get_modified_files(chromium_src: Path, files: list[str]) -> list[str]:
-    """Get list of files that have modifications or are untracked"""
-    modified = []
-
-    for file_path in files:
-        full_path = chromium_src / file_path
-
-        # Check if file exists
-        if not full_path.exists():
-            continue
-
-        try:
-            # Check git status for this file
-            result = subprocess.run(
-                ['git', 'status', '--porcelain', str(file_path)],
-                cwd=chromium_src,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            # If output exists, file has changes
-            if result.stdout.strip():
-                modified.append(file_path)
-
-        except subprocess.CalledProcessError:
-            # If git status fails, skip this file
-            continue
-
-    return modified
-
-
-def git_add_and_commit(chromium_src: Path, files: list[str], commit_message: str) -> bool:
-    """Add files and create commit"""
-
-    # First, add all files
-    try:
-        for file_path in files:
-            subprocess.run(
-                ['git', 'add', str(file_path)],
-                cwd=chromium_src,
-                check=True,
-                capture_output=True
-            )
-    except subprocess.CalledProcessError as e:
-        log_error(f"Failed to add files: {e}")
-        return False
-
-    # Then commit
-    try:
-        subprocess.run(
-            ['git', 'commit', '-m', commit_message],
-            cwd=chromium_src,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return True
-    except subprocess.CalledProcessError as e:
-        # Check if it's because nothing was staged
-        stderr = e.stderr or ''
-        if 'nothing to commit' in stderr or 'nothing added to commit' in stderr:
-            return False
-        log_error(f"Failed to commit: {stderr}")
-        return False
-
-
 def process_features(chromium_src: Path, features_file: Path) -> int:
     """Process all features and create commits. Returns number of commits created."""
 
-    features = load_features(features_file)
+    try:
+        index = load_feature_index(features_file)
+    except Exception as e:
+        log_error(f"Failed to load features file: {e}")
+        return 0
+
+    features = index.features
     if not features:
         log_error("No features found in features.yaml")
         return 0
 
+    # One status snapshot answers every feature's query
+    try:
+        status = WorktreeStatus.snapshot(chromium_src)
+    except GitError as e:
+        log_error(str(e))
+        return 0
+
+    modified_by_feature = group_modified_files(chromium_src, status, index)
+
     log_info(f"📋 Found {len(features)} features")
     log_info("=" * 60)
 
     commits_created = 0
+    committed = set()
 
     for feature_name, feature_data in features.items():
         description = feature_data.get('description', feature_name)
@@ -124,8 +67,12 @@ def process_features(chromium_src: Path, features_file: Path) -> int:
             log_warning("   No files specified, skipping")
             continue
 
-        # Find files with modifications
-        modified_files = get_modified_files(chromium_src, files)
+        # Find files with modifications not committed by an earlier feature
+        modified_files = [
+            path
+            for path in modified_by_feature.get(feature_name, [])
+            if path not in committed
+        ]
 
         if not modified_files:
             log_warning(f"   No modified files ({len(files)} files checked)")
@@ -140,6 +87,7 @@ def process_features(chromium_src: Path, features_file: Path) -> int:
         if git_add_and_commit(chromium_src, modified_files, commit_message):
             log_success(f"   ✓ Committed {len(modified_files)} file(s)")
             commits_created += 1
+            committed.update(modified_files)
         else:
             log_warning("   No changes staged, skipping commit")
 
@@ -3,6 +3,7 @@
 
 import os
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -10,10 +11,23 @@ from typing import Optional
 import typer
 
 # Import common modules
+from ..common.action_cache import ActionCache
 from ..common.context import Context
+from ..common.env import EnvConfig
 from ..common.config import load_config, validate_required_envs
+from ..common.dag import ModuleNode, build_module_graph, describe_graph, run_module_graph
 from ..common.pipeline import validate_pipeline, show_available_modules
 from ..common.resolver import resolve_config, resolve_pipeline
+from ..common.run_report import RunReport
+from ..common.run_state import (
+    RunState,
+    dependents,
+    module_fingerprint,
+    run_identity,
+    slice_graph,
+)
+from ..common.rusage import UsageCollector, collect_usage
+from ..common.trace import enable_tracing, instant, span
 from ..common.notify import (
     notify_pipeline_start,
     notify_pipeline_end,
@@ -27,6 +41,7 @@ from ..common.utils import (
     log_error,
     log_info,
     log_success,
+    log_warning,
     IS_MACOS,
     IS_WINDOWS,
     IS_LINUX,
@@ -39,7 +54,10 @@ from ..modules.setup.configure import ConfigureModule
 from ..modules.compile import CompileModule, UniversalBuildModule
 from ..modules.patches.patches import PatchesModule
 from ..modules.patches.series_patches import SeriesPatchesModule
-from ..modules.resources.chromium_replace import ChromiumReplaceModule
+from ..modules.resources.chromium_replace import (
+    ChromiumReplaceModule,
+    ChromiumRestoreModule,
+)
 from ..modules.resources.string_replaces import StringReplacesModule
 from ..modules.resources.resources import ResourcesModule
 from ..modules.upload import UploadModule
@@ -63,6 +81,7 @@ AVAILABLE_MODULES = {
     "patches": PatchesModule,
     "series_patches": SeriesPatchesModule,
     "chromium_replace": ChromiumReplaceModule,
+    "chromium_restore": ChromiumRestoreModule,
     "string_replaces": StringReplacesModule,
     "resources": ResourcesModule,
     # Build
@@ -151,22 +170,45 @@ def execute_pipeline(
     pipeline: list[str],
     available_modules: dict,
     pipeline_name: str = "build",
+    max_parallel: int = 1,
+    run_state: Optional[RunState] = None,
+    resume: bool = False,
+    from_module: Optional[str] = None,
+    until_module: Optional[str] = None,
+    action_cache: Optional[ActionCache] = None,
+    force: bool = False,
+    explain: bool = False,
 ) -> None:
-    """Execute a build pipeline by running modules sequentially.
+    """Execute a build pipeline over its module dependency graph.
 
     Args:
         ctx: Build context with paths and configuration
         pipeline: List of module names to execute in order
         available_modules: Dictionary mapping module names to module classes
         pipeline_name: Name of pipeline for notifications (default: "build")
+        max_parallel: Maximum modules to run at once (1 = sequential)
+        run_state: Checkpoint state to record progress in (see common/run_state.py)
+        resume: Skip modules that completed in the recorded (unfinished) run;
+            modules with declared inputs only if those are unchanged
+        from_module: Start at this module (earlier modules are not run)
+        until_module: Stop after this module
+        action_cache: Skip modules whose declared inputs are unchanged
+            (see common/action_cache.py)
+        force: Run every module, but still record fingerprints
+        explain: Log why each module runs or is skipped
 
     Raises:
         typer.Exit: On module validation failure, execution failure, or interrupt
 
     Design:
-        - Executes modules sequentially in pipeline order
+        - Orders modules by produces/requires and resource claims (see
+          common/dag.py); pipeline order breaks ties
+        - Runs independent modules concurrently when max_parallel > 1
+        - Checkpoints every completed module and the artifacts to run_state
+        - Skips modules whose declared inputs and outputs are unchanged
         - Validates each module before execution (fail fast)
-        - Tracks timing for each module and total pipeline
+        - Tracks timing and subprocess resource usage (common/rusage.py) for
+          each module and writes a JSON run report next to the build log
         - Sends notifications at key lifecycle events
         - Handles interrupts (Ctrl+C) gracefully with cleanup
     """
@@ -174,41 +216,175 @@ def execute_pipeline(
     notify_pipeline_start(pipeline_name, pipeline)
 
     try:
-        for module_name in pipeline:
-            log_info(f"\n{'='*70}")
-            log_info(f"🔧 Running module: {module_name}")
-            log_info(f"{'='*70}")
-
-            # Instantiate module
-            module_class = available_modules[module_name]
-            module = module_class()
+        all_nodes = build_module_graph(pipeline, available_modules, ctx)
+        nodes = slice_graph(all_nodes, from_module, until_module)
+    except ValueError as e:
+        log_error(str(e))
+        notify_pipeline_error(pipeline_name, str(e))
+        raise typer.Exit(1)
+    if max_parallel > 1:
+        describe_graph(nodes)
+
+    if run_state is not None and (resume or len(nodes) < len(all_nodes)):
+        run_state.restore_artifacts(ctx)
+    executed: set[str] = set()
+    executed_lock = threading.Lock()
+    report = RunReport(pipeline_name)
+
+    def run_module(node: ModuleNode) -> None:
+        module_name = node.name
+        module = node.module
+
+        # Declared inputs (see common/action_cache.py), as they are now
+        inputs = None
+        input_fingerprint = None
+        if action_cache is not None:
+            try:
+                inputs = module.inputs(ctx)
+                if inputs is not None:
+                    input_fingerprint = action_cache.fingerprint(ctx, module, inputs)
+            except Exception as e:
+                log_warning(f"Could not determine inputs of {module_name}: {e}")
+                inputs = None
+
+        with executed_lock:
+            ran_deps = sorted(node.deps & executed, key=lambda k: nodes[k].order)
+        resume_reason = ""
+        if resume and run_state is not None:
+            fingerprint = module_fingerprint(
+                run_state.identity,
+                node,
+                input_fingerprint.digest if input_fingerprint else None,
+            )
+            if ran_deps:
+                resume_reason = f"dependency ran again ({', '.join(ran_deps)})"
+            elif not run_state.is_complete(node.key, fingerprint):
+                resume_reason = "not completed with these inputs in previous run"
+            else:
+                log_info(f"⏭️  Skipping {node.key}: completed in previous run")
+                instant("skipped", "module", reason="completed in previous run")
+                report.skipped(node.key, "completed in previous run")
+                return
+
+        # Action cache: skip while declared inputs and outputs are unchanged
+        if action_cache is None or input_fingerprint is None:
+            reason = "no declared inputs"
+        elif force:
+            reason = "--force"
+        else:
+            up_to_date, reason = action_cache.check(node.key, input_fingerprint)
+            if up_to_date:
+                action_cache.restore_artifacts(node.key, ctx)
+                detail = f" ({reason})" if explain else ""
+                log_info(f"⏭️  Skipping {node.key}: up to date{detail}")
+                instant("skipped", "module", reason=reason)
+                report.skipped(node.key, reason)
+                if run_state is not None:
+                    run_state.record_completion(
+                        node.key,
+                        module_fingerprint(
+                            run_state.identity, node, input_fingerprint.digest
+                        ),
+                        0.0,
+                        ctx,
+                    )
+                return
+        if explain:
+            if resume_reason:
+                reason = f"{resume_reason}; {reason}"
+            log_info(f"🔎 Running {node.key}: {reason}")
+
+        with executed_lock:
+            executed.add(node.key)
+        if run_state is not None:
+            # Outputs of this module and everything downstream become stale
+            run_state.invalidate({node.key} | dependents(all_nodes, node.key))
+        if action_cache is not None:
+            action_cache.forget(node.key)
+
+        log_info(f"\n{'='*70}")
+        log_info(f"🔧 Running module: {module_name}")
+        log_info(f"{'='*70}")
+
+        # Notify module start and track timing (only for key modules)
+        if module_name in NOTIFY_MODULES:
+            notify_module_start(module_name)
+        module_start = time.time()
+
+        # Validate right before executing (fail fast)
+        try:
+            module.validate(ctx)
+        except ValidationError as e:
+            log_error(f"Validation failed for {module_name}: {e}")
+            notify_pipeline_error(
+                pipeline_name, f"{module_name} validation failed: {e}"
+            )
+            raise typer.Exit(1)
 
-            # Notify module start and track timing (only for key modules)
+        # Execute module
+        # Artifacts are recorded per thread, so concurrent modules' artifacts
+        # aren't attributed to this one
+        usage = UsageCollector()
+        try:
+            with (
+                collect_usage(usage),
+                ctx.artifact_registry.recording() as added_artifacts,
+                ctx.artifacts.recording() as added_legacy,
+            ):
+                module.execute(ctx)
+            module_duration = time.time() - module_start
+            report.finished(node.key, "completed", module_duration, usage)
+            if usage.total.count:
+                ctx.summary[f"{node.key} subprocesses"] = usage.describe()
             if module_name in NOTIFY_MODULES:
-                notify_module_start(module_name)
-            module_start = time.time()
+                notify_module_completion(module_name, module_duration)
+            log_success(f"Module {module_name} completed in {module_duration:.1f}s")
+        except Exception as e:
+            report.finished(node.key, "failed", time.time() - module_start, usage)
+            log_error(f"Module {module_name} failed: {e}")
+            if run_state is not None:
+                log_info("   Rerun with --resume to continue from this module")
+            notify_pipeline_error(pipeline_name, f"{module_name} failed: {e}")
+            raise typer.Exit(1)
 
-            # Validate right before executing (fail fast)
+        # Fingerprint the state the module left behind (and re-ask for inputs,
+        # which may depend on what it just did)
+        input_fingerprint = None
+        if action_cache is not None and inputs is not None:
             try:
-                module.validate(ctx)
-            except ValidationError as e:
-                log_error(f"Validation failed for {module_name}: {e}")
-                notify_pipeline_error(
-                    pipeline_name, f"{module_name} validation failed: {e}"
-                )
-                raise typer.Exit(1)
-
-            # Execute module
-            try:
-                module.execute(ctx)
-                module_duration = time.time() - module_start
-                if module_name in NOTIFY_MODULES:
-                    notify_module_completion(module_name, module_duration)
-                log_success(f"Module {module_name} completed in {module_duration:.1f}s")
+                inputs = module.inputs(ctx)
+                if inputs is not None:
+                    input_fingerprint = action_cache.fingerprint(ctx, module, inputs)
             except Exception as e:
-                log_error(f"Module {module_name} failed: {e}")
-                notify_pipeline_error(pipeline_name, f"{module_name} failed: {e}")
-                raise typer.Exit(1)
+                log_warning(f"Could not determine inputs of {module_name}: {e}")
+
+        if run_state is not None:
+            run_state.record_completion(
+                node.key,
+                module_fingerprint(
+                    run_state.identity,
+                    node,
+                    input_fingerprint.digest if input_fingerprint else None,
+                ),
+                module_duration,
+                ctx,
+            )
+        if action_cache is not None and input_fingerprint is not None:
+            action_cache.record(
+                node.key, input_fingerprint, added_artifacts, added_legacy
+            )
+
+    def run_traced(node: ModuleNode) -> None:
+        with span(node.key, "module"):
+            run_module(node)
+
+    status = "failed"
+    try:
+        with span(f"pipeline {pipeline_name}", "pipeline", modules=len(nodes)):
+            run_module_graph(nodes, run_traced, max_parallel)
+        status = "success"
+        if run_state is not None and len(nodes) == len(all_nodes):
+            run_state.finish()
 
         # Pipeline completed successfully
         duration = time.time() - start_time
@@ -217,11 +393,14 @@ def execute_pipeline(
 
         log_info("\n" + "=" * 70)
         log_success(f"✅ Pipeline completed successfully in {mins}m {secs}s")
+        for name, value in ctx.summary.items():
+            log_info(f"  {name}: {value}")
         log_info("=" * 70)
 
-        notify_pipeline_end(pipeline_name, duration)
+        notify_pipeline_end(pipeline_name, duration, ctx.summary)
 
     except KeyboardInterrupt:
+        status = "interrupted"
         log_error("\n❌ Pipeline interrupted")
         notify_pipeline_error(pipeline_name, "Interrupted by user")
         raise typer.Exit(130)
@@ -232,6 +411,8 @@ def execute_pipeline(
         log_error(f"\n❌ Pipeline failed: {e}")
         notify_pipeline_error(pipeline_name, str(e))
         raise typer.Exit(1)
+    finally:
+        report.write(status, ctx.summary)
 
 
 def main(
@@ -304,6 +485,45 @@ def main(
         "-S",
         help="Path to Chromium source directory",
     ),
+    max_parallel: int = typer.Option(
+        1,
+        "--max-parallel",
+        min=1,
+        help="Run up to N independent modules concurrently (default: 1)",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help=(
+            "Continue an unfinished run: skip modules it completed (modules "
+            "with declared inputs only if those are unchanged)"
+        ),
+    ),
+    from_module: Optional[str] = typer.Option(
+        None,
+        "--from",
+        help="Start the pipeline at this module",
+    ),
+    until_module: Optional[str] = typer.Option(
+        None,
+        "--until",
+        help="Stop the pipeline after this module",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Run modules even if their declared inputs are unchanged",
+    ),
+    explain: bool = typer.Option(
+        False,
+        "--explain",
+        help="Print why each module runs or is skipped",
+    ),
+    trace: bool = typer.Option(
+        False,
+        "--trace",
+        help="Write a Chrome trace (Perfetto) of the run next to the build log",
+    ),
 ):
     """BrowserOS Build System - Modular pipeline executor
 
@@ -323,6 +543,21 @@ def main(
     Config Files (CI/CD):
       browseros build --config release.yaml --arch arm64
 
+    \b
+    Parallel Modules:
+      browseros build --config release.linux.yaml --max-parallel 3
+
+    \b
+    Resume / Slice:
+      browseros build --config release.linux.yaml --resume
+      browseros build --config release.linux.yaml --from package_linux
+      browseros build --config release.linux.yaml --until compile
+      browseros build --config release.linux.yaml --explain
+
+    \b
+    Timing Trace (open in ui.perfetto.dev):
+      browseros build --config release.linux.yaml --trace
+
     \b
     List Available:
       browseros build --list                   # Show all modules and phases
@@ -378,6 +613,9 @@ def main(
     log_info("🚀 BrowserOS Build System")
     log_info("=" * 70)
 
+    if trace or EnvConfig().trace:
+        enable_tracing("browseros build")
+
     # Load YAML config if provided
     config_data = load_config(config) if config else None
 
@@ -461,11 +699,36 @@ def main(
     log_info(f"📍 Chromium version: {ctx.chromium_version}")
     log_info(f"📍 Build offset: {ctx.browseros_build_offset}")
     log_info(f"📍 Pipeline: {' → '.join(pipeline)}")
+    if max_parallel > 1:
+        log_info(f"📍 Max parallel modules: {max_parallel}")
+    if from_module or until_module:
+        log_info(f"📍 Range: {from_module or pipeline[0]} → {until_module or pipeline[-1]}")
     log_info("=" * 70)
 
+    # Load the checkpoint of the previous run (kept only for the same build)
+    run_state = RunState.for_context(ctx)
+    if not run_state.begin(run_identity(ctx, config_data), warn=resume) and resume:
+        log_info("No unfinished run recorded for this build - running everything")
+        resume = False
+    action_cache = ActionCache.for_context(ctx)
+
     # Set notification context for OS and architecture
     os_name = "macOS" if IS_MACOS() else "Windows" if IS_WINDOWS() else "Linux"
     set_build_context(os_name, ctx.architecture)
 
     # Execute pipeline
-    execute_pipeline(ctx, pipeline, AVAILABLE_MODULES, pipeline_name="build")
+    ctx.max_parallel = max_parallel
+    execute_pipeline(
+        ctx,
+        pipeline,
+        AVAILABLE_MODULES,
+        pipeline_name="build",
+        max_parallel=max_parallel,
+        run_state=run_state,
+        resume=resume,
+        from_module=from_module,
+        until_module=until_module,
+        action_cache=action_cache,
+        force=force,
+        explain=explain,
+    )
@@ -6,7 +6,6 @@ A git-like patch management system for maintaining patches against Chromium.
 Enables extracting, applying, and managing patches across Chromium upgrades.
 """
 
-import yaml
 from pathlib import Path
 from typing import Optional
 
@@ -15,6 +14,8 @@ from typer import Typer, Option, Argument
 
 # Import from common and utils
 from ..common.context import Context
+from ..common.env import EnvConfig
+from ..common.trace import enable_tracing
 from ..common.utils import log_info, log_error, log_success, log_warning
 
 
@@ -67,6 +68,7 @@ state = State()
 
 @app.callback()
 def main(
+    typer_ctx: typer.Context,
     chromium_src: Optional[Path] = Option(
         None,
         "--chromium-src",
@@ -76,6 +78,9 @@ def main(
     ),
     verbose: bool = Option(False, "--verbose", "-v", help="Enable verbose output"),
     quiet: bool = Option(False, "--quiet", "-q", help="Suppress non-essential output"),
+    trace: bool = Option(
+        False, "--trace", help="Write a Chrome trace of the command next to the log"
+    ),
 ):
     """
     Dev CLI - Chromium patch management tool
@@ -99,6 +104,10 @@ def main(
     state.verbose = verbose
     state.quiet = quiet
 
+    if trace or EnvConfig().trace:
+        command = typer_ctx.invoked_subcommand
+        enable_tracing(f"browseros dev {command}" if command else "browseros dev")
+
 
 @app.command()
 def status():
@@ -119,12 +128,12 @@ def status():
             log_warning("No patches directory found")
 
         # Check for features.yaml
-        features_file = build_ctx.root_dir / "features.yaml"
+        features_file = build_ctx.get_features_yaml_path()
         if features_file.exists():
-            with open(features_file) as f:
-                features = yaml.safe_load(f)
-                feature_count = len(features.get("features", {}))
-                log_info(f"Features defined: {feature_count}")
+            from ..modules.feature.store import get_feature_store
+
+            feature_count = len(get_feature_store(features_file).features)
+            log_info(f"Features defined: {feature_count}")
         else:
             log_warning("No features.yaml found")
     else:
@@ -253,6 +262,16 @@ def extract_range(
     feature: bool = Option(
         False, "--feature", help="Add extracted files to a feature in features.yaml"
     ),
+    all_commits: bool = Option(
+        False,
+        "--all-commits",
+        help="Keep every commit's patch per file, stacked in order (default: last commit's only)",
+    ),
+    prune: bool = Option(
+        False,
+        "--prune",
+        help="Remove patch files of paths this range touched but no longer changes",
+    ),
 ):
     """Extract patches from a range of commits"""
     ctx = create_build_context(state.chromium_src)
@@ -276,6 +295,8 @@ def extract_range(
             squash=squash,
             base=base,
             feature=feature,
+            all_commits=all_commits,
+            prune=prune,
         )
     except Exception as e:
         log_error(f"Failed to extract range: {e}")
@@ -294,6 +315,23 @@ def apply_all(
     annotate: bool = Option(
         False, "--annotate", "-a", help="Create git commits per feature after applying"
     ),
+    batch: bool = Option(
+        False,
+        "--batch",
+        "-b",
+        help="Apply all patches in one git apply invocation (non-interactive only)",
+    ),
+    incremental: bool = Option(
+        False,
+        "--incremental/--full",
+        help="Skip patches already applied per the applied-state manifest (non-interactive only)",
+    ),
+    strategy: str = Option(
+        "python",
+        "--strategy",
+        "-s",
+        help="Per-patch apply strategy: python (in-process) or git; both fall back to git --3way",
+    ),
 ):
     """Apply all patches from chromium_patches/"""
     ctx = create_build_context(state.chromium_src)
@@ -301,11 +339,24 @@ def apply_all(
         raise typer.Exit(1)
 
     from ..modules.apply import ApplyAllModule
+    from ..modules.apply.common import APPLY_STRATEGIES
+
+    if strategy not in APPLY_STRATEGIES:
+        log_error(f"Unknown strategy '{strategy}' (choose from: {', '.join(APPLY_STRATEGIES)})")
+        raise typer.Exit(1)
 
     module = ApplyAllModule()
     try:
         module.validate(ctx)
-        module.execute(ctx, interactive=interactive, reset_to=reset_to, annotate=annotate)
+        module.execute(
+            ctx,
+            interactive=interactive,
+            reset_to=reset_to,
+            annotate=annotate,
+            batch=batch,
+            incremental=incremental,
+            strategy=strategy,
+        )
     except Exception as e:
         log_error(f"Failed to apply patches: {e}")
         raise typer.Exit(1)
@@ -364,6 +415,48 @@ def apply_patch_cmd(
     log_success(f"Successfully applied patch for: {chromium_path}")
 
 
+@apply_app.command(name="check")
+def apply_check(
+    jobs: Optional[int] = Option(
+        None, "--jobs", "-j", help="Concurrent patch checks (default: CPU count)"
+    ),
+    report: Optional[Path] = Option(
+        None, "--report", "-o", help="Write a JSON report of the results"
+    ),
+    series: bool = Option(
+        True, "--series/--no-series", help="Also check series patches"
+    ),
+    strategy: str = Option(
+        "python",
+        "--strategy",
+        "-s",
+        help="Apply strategy to check with: python (in-process) or git",
+    ),
+):
+    """Check whether all patches apply cleanly, without modifying the tree"""
+    ctx = create_build_context(state.chromium_src)
+    if not ctx:
+        raise typer.Exit(1)
+
+    from ..modules.apply import check_all_patches
+    from ..modules.apply.common import APPLY_STRATEGIES
+
+    if strategy not in APPLY_STRATEGIES:
+        log_error(f"Unknown strategy '{strategy}' (choose from: {', '.join(APPLY_STRATEGIES)})")
+        raise typer.Exit(1)
+
+    _, failed = check_all_patches(
+        ctx,
+        jobs=jobs,
+        report_path=report,
+        include_series=series,
+        strategy=strategy,
+    )
+    if failed:
+        raise typer.Exit(1)
+    log_success("All patches apply cleanly")
+
+
 # Feature commands
 @feature_app.command(name="list")
 def feature_list():
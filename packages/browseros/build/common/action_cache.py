@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Action cache - Skip pipeline modules whose inputs are unchanged
+
+Modules declare their inputs and outputs (CommandModule.inputs). After a
+module succeeds, the executor fingerprints them and records the result in
+the build state dir, together with the artifacts the module registered.
+The next run computes the fingerprint again before the module starts: if
+it matches and every output is still in place, the module is skipped and
+its artifacts are restored, like an action-cache hit in a build system.
+
+The fingerprint covers file contents (globs expanded), env values (hashed,
+never stored), context fields, extra values and the module's own source
+file. File hashes are cached by size and mtime, so unchanged multi-GB
+outputs are not re-read on every run.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+
+from .context import Context
+from .dag import resolve_claim
+from .module import CommandModule, ModuleInputs
+from .run_state import decode_artifact, encode_artifact
+from .utils import file_sha256, log_warning, write_json_atomic
+
+CACHE_FILENAME = "action_cache.json"
+CACHE_VERSION = 1
+
+GLOB_CHARS = "*?["
+# Changed inputs/outputs listed when explaining a rerun
+EXPLAIN_LIMIT = 5
+
+
+@dataclass
+class Fingerprint:
+    """Content fingerprint of a module's declared inputs and outputs"""
+
+    digest: str
+    # Input label (e.g. "file:root/resources/BROWSEROS_VERSION") -> hash
+    inputs: Dict[str, str] = field(default_factory=dict)
+    # Output path -> hash (None when missing)
+    outputs: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+def expand_files(ctx: Context, patterns: List[str]) -> Tuple[List[Path], List[str]]:
+    """Resolve declared file patterns.
+
+    Returns:
+        Tuple of (existing files, plain paths that don't exist)
+    """
+    files = set()
+    missing = []
+    for pattern in patterns:
+        resolved = (
+            Path(pattern).as_posix()
+            if Path(pattern).is_absolute()
+            else resolve_claim(pattern, ctx)
+        )
+        parts = PurePosixPath(resolved).parts
+        glob_at = next(
+            (i for i, part in enumerate(parts) if any(c in part for c in GLOB_CHARS)),
+            None,
+        )
+        if glob_at is None:
+            if Path(resolved).is_file():
+                files.add(Path(resolved))
+            else:
+                missing.append(resolved)
+            continue
+        base = Path(*parts[:glob_at])
+        files.update(
+            path for path in base.glob("/".join(parts[glob_at:])) if path.is_file()
+        )
+    return sorted(files), missing
+
+
+def _value_hash(value: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _label(ctx: Context, path: Path) -> str:
+    """Short, stable name for a path (relative to chromium_src or root)"""
+    for root, prefix in ((ctx.chromium_src, "chromium_src"), (ctx.root_dir, "root")):
+        try:
+            return f"{prefix}/{Path(path).relative_to(root).as_posix()}"
+        except ValueError:
+            continue
+    return Path(path).as_posix()
+
+
+class ActionCache:
+    """Fingerprints of the last successful run of each pipeline module"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Module key -> {"fingerprint", "inputs", "outputs", "artifacts",
+        # "legacy_artifacts", "recorded_at"}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Absolute path -> [size, mtime_ns, sha256]
+        self.file_hashes: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_context(cls, ctx: Context) -> "ActionCache":
+        """Load the action cache for a build context"""
+        cache = cls(ctx.get_state_dir() / CACHE_FILENAME)
+        cache.load()
+        return cache
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log_warning(f"Ignoring unreadable action cache {self.path}: {e}")
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.entries = data.get("entries", {})
+            self.file_hashes = data.get("file_hashes", {})
+
+    def save(self) -> None:
+        """Write the cache atomically (call with the lock held)"""
+        # Forget hashes of files that are gone
+        self.file_hashes = {
+            path: entry
+            for path, entry in self.file_hashes.items()
+            if os.path.exists(path)
+        }
+        data = {
+            "version": CACHE_VERSION,
+            "entries": self.entries,
+            "file_hashes": self.file_hashes,
+        }
+        try:
+            write_json_atomic(self.path, data)
+        except OSError as e:
+            log_warning(f"Could not save action cache: {e}")
+
+    def hash_file(self, path: Path) -> Optional[str]:
+        """File content hash, reusing the cached one while size/mtime match"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = str(path)
+        cached = self.file_hashes.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = file_sha256(path)
+        if digest is not None:
+            with self._lock:
+                self.file_hashes[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def fingerprint(
+        self, ctx: Context, module: CommandModule, spec: ModuleInputs
+    ) -> Fingerprint:
+        """Hash the current state of a module's inputs and outputs"""
+        inputs: Dict[str, str] = {}
+
+        source = inspect.getsourcefile(type(module))
+        if source:
+            digest = self.hash_file(Path(source))
+            inputs[f"source:{_label(ctx, Path(source))}"] = digest or "missing"
+
+        files, missing = expand_files(ctx, spec.files)
+        for path in files:
+            inputs[f"file:{_label(ctx, path)}"] = self.hash_file(path) or "missing"
+        for path in missing:
+            inputs[f"file:{_label(ctx, Path(path))}"] = "missing"
+        for name in spec.env:
+            value = os.environ.get(name)
+            inputs[f"env:{name}"] = "unset" if value is None else _value_hash(value)
+        for name in spec.context:
+            inputs[f"context:{name}"] = _value_hash(getattr(ctx, name, None))
+        for name, value in spec.values.items():
+            inputs[f"value:{name}"] = _value_hash(value)
+
+        outputs: Dict[str, Optional[str]] = {}
+        output_files, missing_outputs = expand_files(ctx, spec.outputs)
+        for path in output_files:
+            outputs[str(path)] = self.hash_file(path)
+        for path in missing_outputs:
+            outputs[path] = None
+
+        return Fingerprint(_value_hash(inputs), inputs, outputs)
+
+    def check(self, key: str, fingerprint: Fingerprint) -> Tuple[bool, str]:
+        """Whether a module is up to date, and why (not)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, "no previous successful run"
+
+        if entry.get("fingerprint") != fingerprint.digest:
+            previous = entry.get("inputs", {})
+            changes = []
+            for label in sorted(set(previous) | set(fingerprint.inputs)):
+                if label not in previous:
+                    changes.append(f"{label} (new)")
+                elif label not in fingerprint.inputs:
+                    changes.append(f"{label} (removed)")
+                elif previous[label] != fingerprint.inputs[label]:
+                    changes.append(label)
+            if not changes:
+                return False, "inputs changed"
+            shown = ", ".join(changes[:EXPLAIN_LIMIT])
+            if len(changes) > EXPLAIN_LIMIT:
+                shown += f" and {len(changes) - EXPLAIN_LIMIT} more"
+            return False, f"inputs changed: {shown}"
+
+        recorded = entry.get("outputs", {})
+        missing = [path for path, digest in fingerprint.outputs.items() if digest is None]
+        if missing:
+            return False, f"outputs missing: {', '.join(missing[:EXPLAIN_LIMIT])}"
+        modified = [
+            path
+            for path, digest in fingerprint.outputs.items()
+            if recorded.get(path) != digest
+        ]
+        if modified:
+            return False, f"outputs modified: {', '.join(modified[:EXPLAIN_LIMIT])}"
+        return True, "inputs and outputs unchanged"
+
+    def record(
+        self,
+        key: str,
+        fingerprint: Fingerprint,
+        artifacts: Dict[str, Path],
+        legacy_artifacts: Dict[str, Any],
+    ) -> None:
+        """Record a successful run and the artifacts it registered"""
+        encoded = {}
+        for name, value in legacy_artifacts.items():
+            try:
+                encoded[name] = encode_artifact(value)
+            except TypeError as e:
+                log_warning(f"Not caching artifact {name}: {e}")
+        with self._lock:
+            self.entries[key] = {
+                "fingerprint": fingerprint.digest,
+                "inputs": fingerprint.inputs,
+                "outputs": fingerprint.outputs,
+                "artifacts": {name: str(path) for name, path in artifacts.items()},
+                "legacy_artifacts": encoded,
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self.save()
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self.save()
+
+    def restore_artifacts(self, key: str, ctx: Context) -> None:
+        """Register the artifacts recorded with a module's last run"""
+        entry = self.entries.get(key, {})
+        for name, path in entry.get("artifacts", {}).items():
+            ctx.artifact_registry.add(name, Path(path))
+        for name, value in entry.get("legacy_artifacts", {}).items():
+            ctx.artifacts[name] = decode_artifact(value)
@@ -7,10 +7,12 @@ BuildConfig, ArtifactRegistry, EnvConfig) to avoid god object anti-pattern.
 The old interface is maintained for backward compatibility during the migration.
 """
 
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, Optional
 from .utils import (
     get_platform,
     get_platform_arch,
@@ -47,6 +49,7 @@ class ArtifactRegistry:
 
     def __init__(self):
         self._artifacts: Dict[str, Path] = {}
+        self._local = threading.local()
 
     def add(self, name: str, path: Path) -> None:
         """
@@ -60,6 +63,9 @@ class ArtifactRegistry:
             If an artifact with the same name already exists, it will be overwritten.
         """
         self._artifacts[name] = path
+        added = getattr(self._local, "added", None)
+        if added is not None:
+            added[name] = path
 
     def get(self, name: str) -> Path:
         """
@@ -92,6 +98,59 @@ class ArtifactRegistry:
         """Get all artifacts as a dictionary"""
         return self._artifacts.copy()
 
+    @contextmanager
+    def recording(self) -> Iterator[Dict[str, Path]]:
+        """
+        Collect the artifacts the current thread adds inside the block
+
+        Modules may run concurrently (--max-parallel), so this is how the
+        artifacts of one module are told apart from everyone else's.
+        """
+        previous = getattr(self._local, "added", None)
+        self._local.added = added = {}
+        try:
+            yield added
+        finally:
+            self._local.added = previous
+
+
+class LegacyArtifacts(dict):
+    """
+    The legacy ctx.artifacts dict, with ArtifactRegistry.recording() support
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    def _record(self, name: str, value: Any) -> None:
+        added = getattr(self._local, "added", None)
+        if added is not None:
+            added[name] = value
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        super().__setitem__(name, value)
+        self._record(name, value)
+
+    def setdefault(self, name: str, default: Any = None) -> Any:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs) -> None:
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    @contextmanager
+    def recording(self) -> Iterator[Dict[str, Any]]:
+        """Collect the entries the current thread sets inside the block"""
+        previous = getattr(self._local, "added", None)
+        self._local.added = added = {}
+        try:
+            yield added
+        finally:
+            self._local.added = previous
+
 
 class PathConfig:
     """
@@ -196,6 +255,15 @@ class Context:
     github_repo: str = ""  # GitHub repo for release operations (owner/repo)
     start_time: float = 0.0
 
+    # `compile:` section of the build config (see modules/compile/scheduler.py)
+    compile_config: Dict[str, Any] = field(default_factory=dict)
+
+    # Headline results modules report for the end-of-pipeline summary
+    summary: Dict[str, str] = field(default_factory=dict)
+
+    # Modules/tasks that may run concurrently (--max-parallel)
+    max_parallel: int = 1
+
     # App names - will be set based on platform
     CHROMIUM_APP_NAME: str = ""
     BROWSEROS_APP_NAME: str = ""
@@ -206,7 +274,7 @@ class Context:
 
     # Legacy artifacts dict - kept for backward compatibility
     # New code should use ctx.artifacts (ArtifactRegistry) instead
-    artifacts: Dict[str, List[Path]] = field(default_factory=dict)
+    artifacts: LegacyArtifacts = field(default_factory=LegacyArtifacts)
 
     # Fixed app path - used by UniversalBuildModule to prevent auto-detection
     # When set, get_app_path() returns this directly instead of auto-detecting
@@ -224,6 +292,8 @@ class Context:
         self.paths = PathConfig(self.root_dir, self.chromium_src)
         self.build = BuildConfig(self.architecture, self.build_type)
         self.artifact_registry = ArtifactRegistry()  # New artifact system
+        if not isinstance(self.artifacts, LegacyArtifacts):
+            self.artifacts = LegacyArtifacts(self.artifacts)
         self.env = EnvConfig()
 
         # Set default gn_flags_file if not provided
@@ -572,3 +642,14 @@ class Context:
     def get_series_patches_dir(self) -> Path:
         """Get series patches directory (GNU Quilt format)"""
         return join_paths(self.root_dir, "series_patches")
+
+    def get_state_dir(self) -> Path:
+        """Get directory for build state kept alongside the Chromium checkout
+
+        Lives inside .git when it is a directory so it never shows up in
+        git status; falls back to out/.browseros (ignored by Chromium).
+        """
+        git_dir = join_paths(self.chromium_src, ".git")
+        if git_dir.is_dir():
+            return join_paths(git_dir, "browseros")
+        return join_paths(self.chromium_src, "out", ".browseros")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+DAG - Dependency-aware pipeline scheduling
+
+Builds a dependency graph over the modules of a pipeline:
+
+- artifact edges: a module that `requires` an artifact runs after every
+  pipeline module that `produces` it (even if listed later)
+- conflict edges: modules whose resource claims overlap (see
+  CommandModule.claims) keep their pipeline order
+
+Modules without an edge between them may run concurrently. With
+max_parallel=1 the graph only decides the order, which is the pipeline
+order unless an artifact dependency says otherwise, so phase ordering
+(EXECUTION_ORDER) stays the fallback rather than the only ordering.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .context import Context
+from .module import EXCLUSIVE_CLAIM, CommandModule
+from .utils import log_info, log_prefix, log_warning
+
+
+@dataclass
+class ModuleNode:
+    """One pipeline entry in the graph"""
+
+    key: str  # Module name, with "#n" appended to repeated entries
+    name: str
+    module: CommandModule
+    order: int
+    reads: List[str] = field(default_factory=list)
+    writes: List[str] = field(default_factory=list)
+    deps: Set[str] = field(default_factory=set)
+
+
+def resolve_claim(claim: str, ctx: Context) -> str:
+    """Turn a claim into an absolute POSIX path (EXCLUSIVE_CLAIM unchanged)"""
+    if claim == EXCLUSIVE_CLAIM:
+        return claim
+    root, _, rest = claim.partition("/")
+    roots = {
+        "chromium_src": ctx.chromium_src,
+        "out_dir": ctx.chromium_src / ctx.out_dir,
+        "dist": ctx.get_dist_dir(),
+        "state": ctx.get_state_dir(),
+        "root": ctx.root_dir,
+    }
+    if root not in roots:
+        raise ValueError(f"Unknown claim root in {claim!r}")
+    path = PurePosixPath(roots[root].as_posix())
+    return str(path / rest) if rest else str(path)
+
+
+def claims_overlap(a: str, b: str) -> bool:
+    """Whether two resolved claims cover a common path"""
+    if EXCLUSIVE_CLAIM in (a, b):
+        return True
+    return a == b or a.startswith(b.rstrip("/") + "/") or b.startswith(a.rstrip("/") + "/")
+
+
+def _conflicts(first: ModuleNode, second: ModuleNode) -> bool:
+    for written in first.writes:
+        if any(claims_overlap(written, other) for other in second.reads + second.writes):
+            return True
+    for written in second.writes:
+        if any(claims_overlap(written, other) for other in first.reads):
+            return True
+    return False
+
+
+def build_module_graph(
+    pipeline: List[str], available_modules: Dict[str, type], ctx: Context
+) -> Dict[str, ModuleNode]:
+    """Instantiate the pipeline's modules and compute their dependencies.
+
+    Returns:
+        Nodes keyed by ModuleNode.key, in pipeline order
+
+    Raises:
+        ValueError: If artifact dependencies form a cycle
+    """
+    nodes: Dict[str, ModuleNode] = {}
+    seen: Dict[str, int] = {}
+    for order, name in enumerate(pipeline):
+        seen[name] = seen.get(name, 0) + 1
+        key = name if seen[name] == 1 else f"{name}#{seen[name]}"
+        module = available_modules[name]()
+        try:
+            reads, writes = module.claims(ctx)
+            reads = [resolve_claim(claim, ctx) for claim in reads]
+            writes = [resolve_claim(claim, ctx) for claim in writes]
+        except Exception as e:
+            log_warning(f"Could not determine claims of {name} ({e}); running it alone")
+            reads, writes = [], [EXCLUSIVE_CLAIM]
+        nodes[key] = ModuleNode(key, name, module, order, reads, writes)
+
+    ordered = list(nodes.values())
+    for index, node in enumerate(ordered):
+        for earlier in ordered[:index]:
+            if _conflicts(earlier, node):
+                node.deps.add(earlier.key)
+
+    for node in ordered:
+        for artifact in node.module.requires:
+            for producer in ordered:
+                if producer is node or artifact not in producer.module.produces:
+                    continue
+                node.deps.add(producer.key)
+                # A reordered producer must not also wait on its consumer
+                producer.deps.discard(node.key)
+
+    topological_order(nodes)  # Raises on cycles
+    return nodes
+
+
+def topological_order(nodes: Dict[str, ModuleNode]) -> List[str]:
+    """Dependency order, ties broken by pipeline order (deterministic)"""
+    remaining = {key: set(node.deps) for key, node in nodes.items()}
+    result: List[str] = []
+    while remaining:
+        ready = [key for key, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(
+                f"Dependency cycle between modules: {', '.join(sorted(remaining))}"
+            )
+        key = min(ready, key=lambda k: nodes[k].order)
+        result.append(key)
+        del remaining[key]
+        for deps in remaining.values():
+            deps.discard(key)
+    return result
+
+
+def describe_graph(nodes: Dict[str, ModuleNode]) -> None:
+    """Log each module with the modules it directly waits for"""
+    log_info("\n🕸️  Module graph:")
+    ancestors: Dict[str, Set[str]] = {}
+    for key in topological_order(nodes):
+        deps = nodes[key].deps
+        ancestors[key] = set(deps).union(*(ancestors[dep] for dep in deps))
+        # Drop dependencies already implied by another dependency
+        direct = [
+            dep
+            for dep in sorted(deps, key=lambda k: nodes[k].order)
+            if not any(dep in ancestors[other] for other in deps if other != dep)
+        ]
+        after = f" (after {', '.join(direct)})" if direct else ""
+        log_info(f"  {key}{after}")
+
+
+def run_module_graph(
+    nodes: Dict[str, ModuleNode],
+    run_module: Callable[[ModuleNode], None],
+    max_parallel: int = 1,
+) -> None:
+    """Run every node once its dependencies have finished.
+
+    With max_parallel > 1 independent modules run in worker threads, and
+    each module's output is prefixed with "[name] ". The first failure
+    stops new modules from starting; running ones are allowed to finish
+    and the failure is re-raised.
+    """
+    order = topological_order(nodes)
+    if max_parallel <= 1:
+        for key in order:
+            run_module(nodes[key])
+        return
+
+    def run_prefixed(node: ModuleNode) -> None:
+        with log_prefix(f"[{node.key}] "):
+            run_module(node)
+
+    done: Set[str] = set()
+    running: Dict[Future, str] = {}
+    pending = list(order)
+    failure: Optional[Tuple[str, BaseException]] = None
+
+    executor = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="module")
+    try:
+        while pending or running:
+            if failure is None:
+                for key in list(pending):
+                    if len(running) >= max_parallel:
+                        break
+                    if nodes[key].deps <= done:
+                        pending.remove(key)
+                        running[executor.submit(run_prefixed, nodes[key])] = key
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    done.add(key)
+                elif failure is None:
+                    failure = (key, error)
+    except BaseException:
+        # Interrupted: don't wait for running modules
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    if failure is not None:
+        raise failure[1]
@@ -69,6 +69,16 @@ class EnvConfig:
         """Python path for build scripts"""
         return os.environ.get("PYTHONPATH")
 
+    @property
+    def gn_args_diff(self) -> bool:
+        """Log effective GN arg changes (via `gn args --list`) on regen"""
+        return os.environ.get("BROWSEROS_GN_ARGS_DIFF", "").lower() in ("1", "true", "yes")
+
+    @property
+    def trace(self) -> bool:
+        """Write a Chrome trace of the run next to the build log"""
+        return os.environ.get("BROWSEROS_TRACE", "").lower() in ("1", "true", "yes")
+
     @property
     def depot_tools_win_toolchain(self) -> str:
         """Windows depot_tools toolchain setting (0 = use system toolchain)"""
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Shared git access layer for the build system
+
+Provides run_git_command for one-shot git invocations and a pool of
+long-lived `git cat-file --batch` / `--batch-check` coprocesses, one pair per
+repository. Object lookups (file existence, commit validation, blob and
+commit reads) are multiplexed over those coprocesses instead of starting a
+new git process per query.
+"""
+
+import atexit
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .trace import span
+from .utils import log_error
+
+
+class GitError(Exception):
+    """Custom exception for git operations"""
+
+    pass
+
+
+def run_git_command(
+    cmd: List[str],
+    cwd: Path,
+    capture: bool = True,
+    check: bool = False,
+    timeout: Optional[int] = None,
+    binary_output: bool = False,
+    input: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """Run a git command and return the result
+
+    Args:
+        cmd: Command to run
+        cwd: Working directory
+        capture: Whether to capture output
+        check: Whether to raise on non-zero return
+        timeout: Command timeout in seconds
+        binary_output: If True, handle binary output (don't decode as text)
+        input: Text to feed to the command's stdin
+
+    Returns:
+        CompletedProcess result
+
+    Raises:
+        GitError: If command fails and check=True
+    """
+    with span(" ".join(cmd[:2]), "git", cmd=" ".join(cmd)) as s:
+        result = _run_git_command(
+            cmd, cwd, capture, check, timeout, binary_output, input
+        )
+        s.set(exit_code=result.returncode)
+        return result
+
+
+def _run_git_command(
+    cmd: List[str],
+    cwd: Path,
+    capture: bool,
+    check: bool,
+    timeout: Optional[int],
+    binary_output: bool,
+    input: Optional[str],
+) -> subprocess.CompletedProcess:
+    try:
+        # For commands that might output binary data (like git diff with binary files),
+        # we need to handle them specially
+        if binary_output or ("diff" in cmd and "--binary" not in cmd):
+            # First try with text mode
+            try:
+                result = subprocess.run(
+                    cmd,
+                    cwd=cwd,
+                    capture_output=capture,
+                    text=True,
+                    check=False,
+                    timeout=timeout or 60,
+                    errors="replace",  # Replace invalid UTF-8 sequences
+                    input=input,
+                )
+            except UnicodeDecodeError:
+                # Fall back to binary mode
+                raw = subprocess.run(
+                    cmd,
+                    cwd=cwd,
+                    capture_output=capture,
+                    text=False,
+                    check=False,
+                    timeout=timeout or 60,
+                    input=input.encode() if input is not None else None,
+                )
+                # Convert to text with error handling
+                result = subprocess.CompletedProcess(
+                    raw.args,
+                    raw.returncode,
+                    stdout=(
+                        None
+                        if raw.stdout is None
+                        else raw.stdout.decode("utf-8", errors="replace")
+                    ),
+                    stderr=(
+                        None
+                        if raw.stderr is None
+                        else raw.stderr.decode("utf-8", errors="replace")
+                    ),
+                )
+        else:
+            result = subprocess.run(
+                cmd,
+                cwd=cwd,
+                capture_output=capture,
+                text=True,
+                check=False,
+                timeout=timeout or 60,
+                input=input,
+            )
+
+        if check and result.returncode != 0:
+            error_msg = result.stderr or result.stdout or "Unknown error"
+            raise GitError(f"Git command failed: {' '.join(cmd)}\nError: {error_msg}")
+
+        return result
+    except subprocess.TimeoutExpired:
+        log_error(f"Git command timed out after {timeout} seconds: {' '.join(cmd)}")
+        raise GitError(f"Command timed out: {' '.join(cmd)}")
+    except Exception as e:
+        log_error(f"Failed to run git command: {' '.join(cmd)}")
+        raise GitError(f"Command failed: {e}")
+
+
+# Last word of a cat-file reply for an object that can't be resolved
+_NOT_FOUND = (b"missing", b"ambiguous")
+
+
+class _CatFileProcess:
+    """One long-lived `git cat-file --batch[-check]` coprocess.
+
+    Requests are serialized with a lock, so a single process can be shared
+    between threads. A process that died (e.g. repository repacked) is
+    restarted once on the next request.
+    """
+
+    def __init__(self, repo: Path, mode: str):
+        self.repo = repo
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+
+    def _start(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", self.mode],
+                cwd=self.repo,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def _request(self, spec: str) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """Send one request; the header is None if the object wasn't found"""
+        proc = self._start()
+        stdin, stdout = proc.stdin, proc.stdout
+        assert stdin is not None and stdout is not None  # Both are pipes
+        stdin.write(spec.encode("utf-8") + b"\n")
+        stdin.flush()
+        header = stdout.readline()
+        if not header:
+            raise BrokenPipeError("git cat-file exited")
+
+        # "<spec> missing" / "<spec> ambiguous" - the spec may contain spaces,
+        # so look at the last word rather than the field count
+        if header.rstrip(b"\n").rsplit(b" ", 1)[-1] in _NOT_FOUND:
+            return None, None
+
+        content = None
+        parts = header.split()
+        if len(parts) != 3 or not parts[2].isdigit():
+            raise ValueError(f"Unexpected git cat-file reply: {header!r}")
+        if self.mode == "--batch":
+            size = int(parts[2])
+            content = stdout.read(size)
+            stdout.read(1)  # Trailing newline
+        return header, content
+
+    def query(self, spec: str) -> Tuple[List[str], Optional[bytes]]:
+        """Look up one object.
+
+        Returns:
+            (header fields, content) - header is [sha, type, size] for found
+            objects and [spec, "missing"] otherwise; content is only set for
+            --batch
+        """
+        if "\n" in spec:
+            return [spec, "missing"], None
+
+        with self._lock:
+            try:
+                header, content = self._request(spec)
+            except (BrokenPipeError, OSError):
+                self.close()
+                header, content = self._request(spec)
+        if header is None:
+            return [spec, "missing"], None
+        return header.decode("utf-8", errors="replace").split(), content
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        try:
+            if self._proc.stdin is not None:
+                self._proc.stdin.close()
+            self._proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+        self._proc = None
+
+
+class GitObjectStore:
+    """Object lookups for one repository over persistent cat-file coprocesses"""
+
+    def __init__(self, repo: Path):
+        self.repo = repo
+        self._check = _CatFileProcess(repo, "--batch-check")
+        self._batch = _CatFileProcess(repo, "--batch")
+
+    def object_info(self, spec: str) -> Optional[Tuple[str, str, int]]:
+        """Resolve an object name (e.g. "HEAD:path", "abc123^{commit}").
+
+        Returns:
+            (sha, type, size), or None if it doesn't exist
+        """
+        fields, _ = self._check.query(spec)
+        if fields[-1] == "missing":
+            return None
+        return fields[0], fields[1], int(fields[2])
+
+    def exists(self, spec: str) -> bool:
+        return self.object_info(spec) is not None
+
+    def read(self, spec: str) -> Optional[Tuple[str, bytes]]:
+        """Read an object's content.
+
+        Returns:
+            (type, content), or None if it doesn't exist
+        """
+        fields, content = self._batch.query(spec)
+        if fields[-1] == "missing" or content is None:
+            return None
+        return fields[1], content
+
+    def close(self) -> None:
+        self._check.close()
+        self._batch.close()
+
+
+_stores: Dict[Path, GitObjectStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_object_store(repo: Path) -> GitObjectStore:
+    """Get the shared object store for a repository"""
+    key = Path(repo).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = GitObjectStore(key)
+            _stores[key] = store
+        return store
+
+
+@atexit.register
+def close_object_stores() -> None:
+    """Stop all cat-file coprocesses"""
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
+
+
+def file_exists_in_commit(file_path: str, commit: str, repo: Path) -> bool:
+    """Check if file exists in a commit."""
+    return get_object_store(repo).exists(f"{commit}:{file_path}")
+
+
+def resolve_commit(commit: str, repo: Path) -> Optional[str]:
+    """Resolve a commit-ish to a full commit SHA, or None if not found"""
+    info = get_object_store(repo).object_info(f"{commit}^{{commit}}")
+    return info[0] if info and info[1] == "commit" else None
+
+
+def read_commit_info(commit: str, repo: Path) -> Optional[Dict[str, str]]:
+    """Read and parse a commit object.
+
+    Returns:
+        Dict with hash, author_name, author_email, timestamp, subject and
+        body (as `git show --format=%H%n%an%n%ae%n%at%n%s%n%b`), or None
+    """
+    store = get_object_store(repo)
+    info = store.object_info(f"{commit}^{{commit}}")
+    if not info or info[1] != "commit":
+        return None
+    obj = store.read(info[0])
+    if not obj:
+        return None
+
+    text = obj[1].decode("utf-8", errors="replace")
+    headers, _, message = text.partition("\n\n")
+
+    author_name = author_email = timestamp = ""
+    for line in headers.split("\n"):
+        if line.startswith("author "):
+            ident = line[len("author ") :]
+            name, _, rest = ident.partition(" <")
+            author_email, _, date = rest.partition("> ")
+            author_name = name
+            timestamp = date.split(" ")[0] if date else ""
+            break
+
+    # %s is the first paragraph joined into one line, %b is the rest
+    paragraphs = message.strip("\n").split("\n\n", 1)
+    subject = " ".join(paragraphs[0].split("\n")) if paragraphs[0] else ""
+    body = paragraphs[1].strip("\n") if len(paragraphs) > 1 else ""
+
+    return {
+        "hash": info[0],
+        "author_name": author_name,
+        "author_email": author_email,
+        "timestamp": timestamp,
+        "subject": subject,
+        "body": body,
+    }
@@ -4,17 +4,50 @@ Logging utilities for the build system
 Provides consistent logging with Typer output and file logging
 """
 
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
 import typer
 from pathlib import Path
 from datetime import datetime
 
 # Global log file handle
 _log_file = None
+_log_file_path: Optional[Path] = None
+_log_file_lock = threading.Lock()
+
+# Per-thread line prefix, set while modules run in parallel
+_thread_state = threading.local()
+
+
+def get_log_prefix() -> str:
+    """Line prefix of the current thread ("" outside parallel modules)"""
+    return getattr(_thread_state, "prefix", "")
+
+
+@contextmanager
+def log_prefix(prefix: str) -> Iterator[None]:
+    """Prefix every console and log file line written by this thread"""
+    previous = get_log_prefix()
+    _thread_state.prefix = prefix
+    try:
+        yield
+    finally:
+        _thread_state.prefix = previous
+
+
+def with_log_prefix(message: str) -> str:
+    """Apply the current thread's prefix to each non-empty line"""
+    prefix = get_log_prefix()
+    if not prefix:
+        return message
+    return "\n".join(prefix + line if line else line for line in message.split("\n"))
 
 
 def _ensure_log_file():
     """Ensure log file is created with timestamp"""
-    global _log_file
+    global _log_file, _log_file_path
     if _log_file is None:
         from .paths import get_package_root
 
@@ -24,9 +57,9 @@ def _ensure_log_file():
 
         # Create log file with timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        log_file_path = log_dir / f"build_{timestamp}.log"
+        _log_file_path = log_dir / f"build_{timestamp}.log"
         # Open with UTF-8 encoding to handle any characters
-        _log_file = open(log_file_path, "w", encoding="utf-8")
+        _log_file = open(_log_file_path, "w", encoding="utf-8")
         _log_file.write(
             f"BrowserOS Build Log - Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
         )
@@ -34,42 +67,54 @@ def _ensure_log_file():
     return _log_file
 
 
+def get_log_file_path() -> Path:
+    """Path of this run's log file (created on first use)"""
+    with _log_file_lock:
+        _ensure_log_file()
+        path = _log_file_path
+    if path is None:
+        raise RuntimeError("Build log file was not created")
+    return path
+
+
 def _log_to_file(message: str):
     """Write message to log file with timestamp"""
-    log_file = _ensure_log_file()
+    prefix = get_log_prefix()
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_file.write(f"[{timestamp}] {message}\n")
-    log_file.flush()
+    with _log_file_lock:
+        log_file = _ensure_log_file()
+        log_file.write(f"[{timestamp}] {prefix}{message}\n")
+        log_file.flush()
 
 
 def log_info(message: str):
     """Print info message using Typer"""
-    typer.echo(message)
+    typer.echo(with_log_prefix(message))
     _log_to_file(f"INFO: {message}")
 
 
 def log_warning(message: str):
     """Print warning message with color"""
-    typer.secho(f"⚠️  {message}", fg=typer.colors.YELLOW)
+    typer.secho(with_log_prefix(f"⚠️  {message}"), fg=typer.colors.YELLOW)
     _log_to_file(f"WARNING: {message}")
 
 
 def log_error(message: str):
     """Print error message to stderr with color"""
-    typer.secho(f"❌ {message}", fg=typer.colors.RED, err=True)
+    typer.secho(with_log_prefix(f"❌ {message}"), fg=typer.colors.RED, err=True)
     _log_to_file(f"ERROR: {message}")
 
 
 def log_success(message: str):
     """Print success message with color"""
-    typer.secho(f"✅ {message}", fg=typer.colors.GREEN)
+    typer.secho(with_log_prefix(f"✅ {message}"), fg=typer.colors.GREEN)
     _log_to_file(f"SUCCESS: {message}")
 
 
 def log_debug(message: str, enabled: bool = False):
     """Print debug message if enabled"""
     if enabled:
-        typer.secho(f"🔍 {message}", fg=typer.colors.BLUE, dim=True)
+        typer.secho(with_log_prefix(f"🔍 {message}"), fg=typer.colors.BLUE, dim=True)
         _log_to_file(f"DEBUG: {message}")
 
 
@@ -89,5 +134,9 @@ __all__ = [
     'log_success',
     'log_debug',
     'close_log_file',
+    'get_log_file_path',
+    'log_prefix',
+    'get_log_prefix',
+    'with_log_prefix',
     '_log_to_file',  # Internal use by utils.run_command
 ]
\ No newline at end of file
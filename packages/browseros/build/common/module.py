@@ -6,7 +6,31 @@ This module defines the base class for all build modules and the validation fram
 All build modules should inherit from BuildModule and implement validate() and execute().
 """
 
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Claim that conflicts with every other claim (see CommandModule.claims)
+EXCLUSIVE_CLAIM = "*"
+
+
+@dataclass
+class ModuleInputs:
+    """
+    What a module's result depends on, for the action cache
+
+    Paths use the claim roots (see CommandModule.claims) or are absolute,
+    and may contain glob patterns, e.g. "out_dir/locales/*.pak" or
+    "root/resources/**/*".
+    """
+
+    files: List[str] = field(default_factory=list)
+    env: List[str] = field(default_factory=list)
+    # Context attribute names (e.g. "architecture")
+    context: List[str] = field(default_factory=list)
+    # Any other JSON-serializable values (e.g. a replacement table)
+    values: Dict[str, Any] = field(default_factory=dict)
+    # Files the module creates; missing or modified outputs force a rerun
+    outputs: List[str] = field(default_factory=list)
 
 
 class ValidationError(Exception):
@@ -31,10 +55,16 @@ class CommandModule:
         produces: List of artifact names this module creates (e.g., ["signed_app", "notarization_zip"])
         requires: List of artifact names this module needs (e.g., ["built_app"])
         description: Human-readable description for --list output
+        reads: Resources this module reads (see claims())
+        writes: Resources this module modifies (see claims())
+        input_files, input_env, input_context, outputs: Declared inputs and
+            outputs for the action cache (see inputs())
 
     Methods:
         validate(context): Check if module can run, raise ValidationError if not
         execute(context): Execute the module's main task
+        claims(context): Resources read and written, for parallel scheduling
+        inputs(context): Declared inputs/outputs, for skipping up-to-date modules
 
     Example:
         class CleanModule(BuildModule):
@@ -56,6 +86,12 @@ class CommandModule:
     produces: List[str] = []
     requires: List[str] = []
     description: str = "No description provided"
+    reads: List[str] = []
+    writes: List[str] = []
+    input_files: List[str] = []
+    input_env: List[str] = []
+    input_context: List[str] = []
+    outputs: List[str] = []
 
     def validate(self, context) -> None:
         """
@@ -103,3 +139,57 @@ class CommandModule:
         raise NotImplementedError(
             f"{self.__class__.__name__} must implement execute()"
         )
+
+    def claims(self, context) -> Tuple[List[str], List[str]]:
+        """
+        Resources this module reads and writes
+
+        Claims are paths rooted at "chromium_src", "out_dir", "dist",
+        "state" (build state dir) or "root" (package root), e.g.
+        "chromium_src/chrome/app". Two modules conflict when one writes a
+        path the other reads or writes, or a parent/child of it; the
+        pipeline executor never runs conflicting modules concurrently.
+
+        The default returns the reads/writes class attributes. A module
+        that declares neither is exclusive: it runs alone. Override this
+        when the claims depend on configuration.
+
+        Args:
+            context: BuildContext object with all build state
+
+        Returns:
+            Tuple of (reads, writes)
+        """
+        if not self.reads and not self.writes:
+            return [], [EXCLUSIVE_CLAIM]
+        return list(self.reads), list(self.writes)
+
+    def inputs(self, context) -> Optional[ModuleInputs]:
+        """
+        Inputs and outputs that determine this module's result
+
+        The pipeline executor fingerprints them (file contents, env values,
+        context fields, the module's own source) after every successful
+        run, and skips the module while the fingerprint is unchanged and
+        the outputs are still in place. Modules that modify their inputs
+        in place are fine: the fingerprint describes the state the module
+        left behind.
+
+        The default builds them from the input_* / outputs class
+        attributes. Modules that declare nothing return None and always
+        run. Override this when the inputs depend on configuration.
+
+        Args:
+            context: BuildContext object with all build state
+
+        Returns:
+            ModuleInputs, or None if the module can't be skipped
+        """
+        if not (self.input_files or self.input_env or self.input_context):
+            return None
+        return ModuleInputs(
+            files=list(self.input_files),
+            env=list(self.input_env),
+            context=list(self.input_context),
+            outputs=list(self.outputs),
+        )
@@ -116,7 +116,9 @@ def notify_pipeline_start(pipeline_name: str, modules: list) -> None:
     )
 
 
-def notify_pipeline_end(pipeline_name: str, duration: float) -> None:
+def notify_pipeline_end(
+    pipeline_name: str, duration: float, summary: Optional[Dict[str, str]] = None
+) -> None:
     """Notify that pipeline completed successfully"""
     notifier = get_notifier()
     mins = int(duration / 60)
@@ -124,7 +126,7 @@ def notify_pipeline_end(pipeline_name: str, duration: float) -> None:
     notifier.notify(
         "🏁 Pipeline Completed",
         "Build pipeline completed successfully",
-        {"Duration": f"{mins}m {secs}s"},
+        {"Duration": f"{mins}m {secs}s", **(summary or {})},
         color=COLOR_GREEN
     )
 
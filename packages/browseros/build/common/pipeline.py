@@ -36,7 +36,7 @@ def show_available_modules(available_modules: Dict[str, Type[CommandModule]]) ->
     # Group modules by prefix
     groups = {
         "Setup & Environment": ["clean", "git_setup", "sparkle_setup", "configure"],
-        "Patches & Resources": ["patches", "chromium_replace", "string_replaces", "resources"],
+        "Patches & Resources": ["patches", "chromium_replace", "chromium_restore", "string_replaces", "resources"],
         "Build": ["compile"],
         "Code Signing": ["sign_macos", "sign_windows", "sign_linux"],
         "Packaging": ["package_macos", "package_windows", "package_linux"],
@@ -118,6 +118,7 @@ def _resolve_config_mode(
         chromium_src=chromium_src,
         architecture=architecture,
         build_type=build_type,
+        compile_config=yaml_config.get("compile") or {},
     )
 
 
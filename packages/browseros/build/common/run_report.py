@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Run report - JSON record of a pipeline run
+
+Written next to the build log (`<log>.report.json`) when a pipeline ends,
+whether it succeeded or not: per-module status and duration, the resource
+usage of the commands each module ran (see rusage.py) and the summary.
+"""
+
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .logger import get_log_file_path, log_info, log_warning
+from .rusage import UsageCollector
+from .utils import write_json_atomic
+
+REPORT_SUFFIX = ".report.json"
+
+
+class RunReport:
+    """Collects per-module results while a pipeline runs"""
+
+    def __init__(self, pipeline_name: str):
+        self.pipeline_name = pipeline_name
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.start = time.time()
+        # Module key -> {"status", "duration", "reason", "usage"}
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def skipped(self, key: str, reason: str) -> None:
+        with self._lock:
+            self.modules[key] = {"status": "skipped", "reason": reason}
+
+    def finished(
+        self,
+        key: str,
+        status: str,
+        duration: float,
+        usage: Optional[UsageCollector] = None,
+    ) -> None:
+        """Record a module that ran ("completed" or "failed")"""
+        entry: Dict[str, Any] = {"status": status, "duration": round(duration, 3)}
+        if usage is not None and usage.total.count:
+            entry["usage"] = usage.to_dict()
+        with self._lock:
+            self.modules[key] = entry
+
+    def write(
+        self, status: str, summary: Dict[str, Any], path: Optional[Path] = None
+    ) -> Optional[Path]:
+        """Write the report (default: next to the build log)
+
+        Args:
+            status: Outcome of the pipeline ("success", "failed", "interrupted")
+            summary: ctx.summary
+            path: Output file
+        """
+        if path is None:
+            log_path = get_log_file_path()
+            path = log_path.with_name(log_path.stem + REPORT_SUFFIX)
+        with self._lock:
+            report = {
+                "pipeline": self.pipeline_name,
+                "status": status,
+                "started_at": self.started_at,
+                "duration": round(time.time() - self.start, 3),
+                "modules": dict(self.modules),
+                "summary": {name: str(value) for name, value in summary.items()},
+            }
+        try:
+            write_json_atomic(path, report)
+        except OSError as e:
+            log_warning(f"Could not write run report: {e}")
+            return None
+        log_info(f"📄 Run report written to: {path}")
+        return path
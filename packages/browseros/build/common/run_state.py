@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Run state - Checkpoint/resume for build pipelines
+
+After every module the executor records in the build state dir:
+
+- completed modules with their input fingerprint
+- the ArtifactRegistry and the legacy ctx.artifacts dict (e.g.
+  sparkle_signatures), so modules after a skipped one still find them
+
+`--resume` continues a run that did not finish (it failed, was
+interrupted or stopped at `--until`): it skips modules that completed in
+that run of the same build (architecture, build type, versions, config)
+whose fingerprint is unchanged and none of whose dependencies ran again.
+For modules that declare inputs (CommandModule.inputs) the fingerprint
+includes their content, so editing e.g. a flags file reruns the module;
+modules without declared inputs are only checked against the build
+identity. After a complete run there is nothing to resume.
+
+`--from`/`--until` slice the pipeline; modules outside the slice keep
+their recorded state. Both restore the recorded artifacts before the
+first module runs.
+
+A module that runs invalidates the recorded completion of every module
+that depends on it, so a later resume can't skip over stale outputs.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from .context import Context
+from .dag import ModuleNode
+from .utils import log_info, log_warning, write_json_atomic
+
+STATE_FILENAME = "run_state.json"
+STATE_VERSION = 1
+
+# Config sections that select modules rather than configure them
+_PIPELINE_CONFIG_KEYS = ("modules", "required_envs")
+
+
+def slice_graph(
+    nodes: Dict[str, ModuleNode],
+    from_module: Optional[str] = None,
+    until_module: Optional[str] = None,
+) -> Dict[str, ModuleNode]:
+    """Pipeline entries from `from_module` through `until_module` (inclusive)
+
+    Dependencies on entries outside the slice are dropped: those modules
+    are not run, their recorded outputs are used as they are.
+
+    Raises:
+        ValueError: If a bound is not in the pipeline or the range is empty
+    """
+    names = [node.name for node in nodes.values()]
+    start, end = 0, len(names)
+    if from_module is not None:
+        if from_module not in names:
+            raise ValueError(f"--from module not in pipeline: {from_module}")
+        start = names.index(from_module)
+    if until_module is not None:
+        if until_module not in names:
+            raise ValueError(f"--until module not in pipeline: {until_module}")
+        end = len(names) - names[::-1].index(until_module)
+    if start >= end:
+        raise ValueError(f"--from {from_module} comes after --until {until_module}")
+
+    selected = {node.key: node for node in nodes.values() if start <= node.order < end}
+    return {
+        key: replace(node, deps={dep for dep in node.deps if dep in selected})
+        for key, node in selected.items()
+    }
+
+
+def run_identity(ctx: Context, config_data: Optional[Dict] = None) -> Dict[str, Any]:
+    """What makes two runs the same build"""
+    config = {
+        key: value
+        for key, value in (config_data or {}).items()
+        if key not in _PIPELINE_CONFIG_KEYS
+    }
+    return {
+        "chromium_src": str(ctx.chromium_src),
+        "architecture": ctx.architecture,
+        "build_type": ctx.build_type,
+        "out_dir": str(ctx.out_dir),
+        "chromium_version": ctx.chromium_version,
+        "browseros_chromium_version": ctx.browseros_chromium_version,
+        "semantic_version": ctx.semantic_version,
+        "release_version": ctx.release_version,
+        "config_sha256": hashlib.sha256(
+            json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest(),
+    }
+
+
+def module_fingerprint(
+    identity: Dict[str, Any], node: ModuleNode, inputs_digest: Optional[str] = None
+) -> str:
+    """Input fingerprint of one pipeline entry
+
+    Args:
+        identity: run_identity() of the run
+        node: Pipeline entry
+        inputs_digest: Digest of the module's declared inputs, if it has any
+            (see action_cache.Fingerprint)
+    """
+    payload = {
+        "identity": identity,
+        "key": node.key,
+        "module": f"{type(node.module).__module__}.{type(node.module).__name__}",
+        "inputs": inputs_digest,
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def dependents(nodes: Dict[str, ModuleNode], key: str) -> Set[str]:
+    """Every node that (transitively) depends on `key`"""
+    result: Set[str] = set()
+    frontier = [key]
+    while frontier:
+        current = frontier.pop()
+        for node in nodes.values():
+            if current in node.deps and node.key not in result:
+                result.add(node.key)
+                frontier.append(node.key)
+    return result
+
+
+def encode_artifact(value: Any) -> Any:
+    """JSON form of an artifact value (Paths and tuples are tagged)"""
+    if isinstance(value, Path):
+        return {"__path__": str(value)}
+    if isinstance(value, tuple):
+        return {"__tuple__": [encode_artifact(item) for item in value]}
+    if isinstance(value, list):
+        return [encode_artifact(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): encode_artifact(item) for key, item in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"cannot record {type(value).__name__}")
+
+
+def decode_artifact(value: Any) -> Any:
+    """Inverse of encode_artifact"""
+    if isinstance(value, list):
+        return [decode_artifact(item) for item in value]
+    if isinstance(value, dict):
+        if set(value) == {"__path__"}:
+            return Path(value["__path__"])
+        if set(value) == {"__tuple__"}:
+            return tuple(decode_artifact(item) for item in value["__tuple__"])
+        return {key: decode_artifact(item) for key, item in value.items()}
+    return value
+
+
+class RunState:
+    """Persisted progress of the last pipeline run for a Chromium checkout"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.identity: Dict[str, Any] = {}
+        # Module key -> {"fingerprint", "completed_at", "duration"}
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        self.artifacts: Dict[str, str] = {}
+        self.legacy_artifacts: Dict[str, Any] = {}
+        # Whether the last run went through the whole pipeline
+        self.finished = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_context(cls, ctx: Context) -> "RunState":
+        """Load the run state for a build context"""
+        state = cls(ctx.get_state_dir() / STATE_FILENAME)
+        state.load()
+        return state
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log_warning(f"Ignoring unreadable run state {self.path}: {e}")
+            return
+        if data.get("version") != STATE_VERSION:
+            return
+        self.identity = data.get("identity", {})
+        self.modules = data.get("modules", {})
+        self.artifacts = data.get("artifacts", {})
+        self.legacy_artifacts = data.get("legacy_artifacts", {})
+        self.finished = data.get("finished", False)
+
+    def save(self) -> None:
+        """Write the state atomically"""
+        data = {
+            "version": STATE_VERSION,
+            "identity": self.identity,
+            "modules": self.modules,
+            "artifacts": self.artifacts,
+            "legacy_artifacts": self.legacy_artifacts,
+            "finished": self.finished,
+        }
+        try:
+            write_json_atomic(self.path, data)
+        except OSError as e:
+            log_warning(f"Could not save run state: {e}")
+
+    def begin(self, identity: Dict[str, Any], warn: bool = False) -> bool:
+        """Start a run, discarding progress recorded for a different build.
+
+        Args:
+            identity: run_identity() of this run
+            warn: Explain why recorded progress is discarded (--resume)
+
+        Returns:
+            True if there is an unfinished run to resume
+        """
+        with self._lock:
+            kept = self.identity == identity
+            resumable = kept and bool(self.modules) and not self.finished
+            if kept and self.finished and self.modules and warn:
+                log_info("Previous run of this build finished - nothing to resume")
+            if not kept and self.modules:
+                if warn:
+                    changed = sorted(
+                        name
+                        for name in set(identity) | set(self.identity)
+                        if identity.get(name) != self.identity.get(name)
+                    )
+                    log_warning(
+                        "Recorded run state is for a different build "
+                        f"({', '.join(changed)} changed) - starting fresh"
+                    )
+                self.modules = {}
+                self.artifacts = {}
+                self.legacy_artifacts = {}
+            self.identity = identity
+            self.finished = False
+            self.save()
+        return resumable
+
+    def finish(self) -> None:
+        """Mark the run as complete (a later --resume starts over)"""
+        with self._lock:
+            self.finished = True
+            self.save()
+
+    def restore_artifacts(self, ctx: Context) -> None:
+        """Load recorded artifacts into the context"""
+        for name, path in self.artifacts.items():
+            if not ctx.artifact_registry.has(name):
+                ctx.artifact_registry.add(name, Path(path))
+        for name, value in self.legacy_artifacts.items():
+            ctx.artifacts.setdefault(name, decode_artifact(value))
+        if self.artifacts or self.legacy_artifacts:
+            log_info(
+                f"📦 Restored {len(self.artifacts) + len(self.legacy_artifacts)} "
+                "artifact(s) from the previous run"
+            )
+
+    def is_complete(self, key: str, fingerprint: str) -> bool:
+        entry = self.modules.get(key)
+        return entry is not None and entry.get("fingerprint") == fingerprint
+
+    def invalidate(self, keys: Set[str]) -> None:
+        """Forget completions that are about to become stale"""
+        with self._lock:
+            if any(key in self.modules for key in keys):
+                for key in keys:
+                    self.modules.pop(key, None)
+                self.save()
+
+    def record_completion(
+        self, key: str, fingerprint: str, duration: float, ctx: Context
+    ) -> None:
+        """Checkpoint a finished module together with the current artifacts"""
+        with self._lock:
+            self.modules[key] = {
+                "fingerprint": fingerprint,
+                "completed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "duration": round(duration, 1),
+            }
+            self.artifacts = {
+                name: str(path) for name, path in ctx.artifact_registry.all().items()
+            }
+            for name, value in ctx.artifacts.items():
+                try:
+                    self.legacy_artifacts[name] = encode_artifact(value)
+                except TypeError as e:
+                    log_warning(f"Not recording artifact {name}: {e}")
+            self.save()
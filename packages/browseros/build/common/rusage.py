@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Rusage - Resource accounting for subprocesses
+
+run_command waits for its child with os.wait4, which reports the CPU time,
+peak RSS and block I/O of the child and every descendant it waited for
+(e.g. autoninja → ninja → clang/lld). Children running longer than a
+sampling interval are also watched through /proc (Linux), to catch the
+peak RSS of the whole process tree, i.e. the memory of all concurrent
+compiles rather than only the largest single process.
+
+Stats are attached to the returned CompletedProcess (`.stats`) and added
+to the active UsageCollector of the calling thread; the pipeline executor
+runs one per module for the summary and the JSON run report.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+SAMPLE_INTERVAL_SECONDS = 2.0
+
+_GB = 1024 * 1024 * 1024
+
+
+@dataclass
+class ProcessStats:
+    """Resource usage of one command (or a sum of commands)"""
+
+    wall_seconds: float = 0.0
+    user_seconds: float = 0.0
+    sys_seconds: float = 0.0
+    # Largest single process in the tree (from rusage)
+    max_rss_bytes: int = 0
+    # Largest sampled sum over the process tree (Linux, long-running only)
+    peak_tree_rss_bytes: int = 0
+    # Block I/O (from rusage; page-cache hits are not counted)
+    read_bytes: int = 0
+    write_bytes: int = 0
+    count: int = 1
+
+    @property
+    def cpu_seconds(self) -> float:
+        return self.user_seconds + self.sys_seconds
+
+    def add(self, other: "ProcessStats") -> None:
+        """Accumulate another command: times and I/O add up, memory peaks"""
+        self.wall_seconds += other.wall_seconds
+        self.user_seconds += other.user_seconds
+        self.sys_seconds += other.sys_seconds
+        self.max_rss_bytes = max(self.max_rss_bytes, other.max_rss_bytes)
+        self.peak_tree_rss_bytes = max(
+            self.peak_tree_rss_bytes, other.peak_tree_rss_bytes
+        )
+        self.read_bytes += other.read_bytes
+        self.write_bytes += other.write_bytes
+        self.count += other.count
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for name in ("wall_seconds", "user_seconds", "sys_seconds"):
+            data[name] = round(data[name], 3)
+        return data
+
+
+def stats_from_rusage(usage: Any, wall_seconds: float) -> ProcessStats:
+    """ProcessStats from an os.wait4/getrusage result"""
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    max_rss = usage.ru_maxrss
+    if sys.platform != "darwin":
+        max_rss *= 1024
+    return ProcessStats(
+        wall_seconds=wall_seconds,
+        user_seconds=usage.ru_utime,
+        sys_seconds=usage.ru_stime,
+        max_rss_bytes=max_rss,
+        read_bytes=usage.ru_inblock * 512,
+        write_bytes=usage.ru_oublock * 512,
+    )
+
+
+def _read_proc_stat(pid: str) -> Optional[tuple]:
+    """(ppid, rss pages) of a process from /proc/<pid>/stat"""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces; fields resume after its ")"
+    fields = data[data.rfind(b")") + 2 :].split()
+    return int(fields[1]), int(fields[21])
+
+
+def tree_rss_bytes(root_pid: int) -> int:
+    """Sum of RSS over a process and its descendants (Linux /proc)"""
+    children: Dict[int, List[int]] = {}
+    rss: Dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        info = _read_proc_stat(entry)
+        if info is None:
+            continue
+        pid = int(entry)
+        children.setdefault(info[0], []).append(pid)
+        rss[pid] = info[1]
+
+    total = 0
+    frontier = [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        total += rss.get(pid, 0)
+        frontier.extend(children.get(pid, []))
+    return total * os.sysconf("SC_PAGE_SIZE")
+
+
+class TreeSampler:
+    """Samples a child's process tree in a background thread (Linux only)"""
+
+    def __init__(self, pid: int, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "TreeSampler":
+        if Path("/proc/self/stat").exists():
+            self._thread = threading.Thread(
+                target=self._run, name="rusage-sampler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        # The first sample waits one interval: short commands are never sampled
+        while not self._stop.wait(self.interval):
+            try:
+                self.peak_rss = max(self.peak_rss, tree_rss_bytes(self.pid))
+            except (OSError, ValueError, IndexError):
+                return
+
+
+def wait_with_stats(process, start: float) -> Optional[ProcessStats]:
+    """Wait for a Popen child, collecting its resource usage when possible
+
+    Sets process.returncode like Popen.wait(). Where os.wait4 is
+    unavailable (Windows) only the wall time is known.
+    """
+    if not hasattr(os, "wait4"):
+        process.wait()
+        return ProcessStats(wall_seconds=time.monotonic() - start)
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        # Already reaped elsewhere
+        process.wait()
+        return None
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return stats_from_rusage(usage, time.monotonic() - start)
+
+
+class UsageCollector:
+    """Sums the stats of the commands run while it is active"""
+
+    def __init__(self):
+        self.total = ProcessStats(count=0)
+        # Program name (e.g. "appimagetool") -> summed stats
+        self.by_command: Dict[str, ProcessStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, command: str, stats: ProcessStats) -> None:
+        with self._lock:
+            self.total.add(stats)
+            self.by_command.setdefault(command, ProcessStats(count=0)).add(stats)
+
+    def describe(self) -> str:
+        """One-line summary, e.g. for the pipeline summary"""
+        total = self.total
+        if not self.by_command:
+            return "no commands"
+        top = max(self.by_command.items(), key=lambda item: item[1].cpu_seconds)
+        peak_rss = max(total.max_rss_bytes, total.peak_tree_rss_bytes)
+        text = (
+            f"{_format_seconds(total.cpu_seconds)} CPU in {total.count} command(s), "
+            f"peak RSS {peak_rss / _GB:.1f} GB"
+        )
+        if total.cpu_seconds and len(self.by_command) > 1:
+            share = top[1].cpu_seconds / total.cpu_seconds
+            text += f", {share:.0%} of CPU in {top[0]}"
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total.to_dict(),
+            "by_command": {
+                name: stats.to_dict()
+                for name, stats in sorted(
+                    self.by_command.items(), key=lambda item: -item[1].wall_seconds
+                )
+            },
+        }
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {secs}s"
+    return f"{seconds:.1f}s"
+
+
+# Collectors of the current thread, innermost last
+_thread_state = threading.local()
+
+
+def get_usage_collectors() -> List[UsageCollector]:
+    """Collectors active in the current thread (to hand to worker threads)"""
+    return list(getattr(_thread_state, "collectors", []))
+
+
+@contextmanager
+def collect_usage(*collectors: UsageCollector) -> Iterator[None]:
+    """Add commands run by this thread to the given collectors"""
+    previous = get_usage_collectors()
+    _thread_state.collectors = previous + [
+        collector for collector in collectors if collector not in previous
+    ]
+    try:
+        yield
+    finally:
+        _thread_state.collectors = previous
+
+
+def record_usage(command: str, stats: ProcessStats) -> None:
+    """Add one command's stats to the current thread's collectors"""
+    for collector in getattr(_thread_state, "collectors", []):
+        collector.record(command, stats)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Trace - Chrome trace-event export of build timing
+
+Records nested spans (pipeline → module → subprocess → sub-steps such as
+single patches, uploads and copies) and writes them as a Chrome
+trace-event JSON file next to the build log, to open in Perfetto
+(ui.perfetto.dev) or chrome://tracing.
+
+Enabled with --trace on the build/dev CLIs or BROWSEROS_TRACE=1. While
+disabled, span() returns a shared no-op object, so instrumented code only
+pays for one function call:
+
+    with span("apply", "patch", patch=name) as s:
+        ...
+        s.set(result="conflict")
+"""
+
+import atexit
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .logger import get_log_file_path, log_info
+
+TRACE_SUFFIX = ".trace.json"
+
+_tracer: Optional["Tracer"] = None
+
+
+def now_us() -> int:
+    """Monotonic clock used for trace timestamps, in microseconds"""
+    return time.perf_counter_ns() // 1000
+
+
+class Tracer:
+    """Collects trace events in memory until the process exits"""
+
+    def __init__(self, path: Path, name: str):
+        self.path = path
+        self.name = name
+        self.start = now_us()
+        self.events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 0, "args": {"name": name}}
+        ]
+        self._pids = 1
+        self._tids: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._tid()  # The enabling (main) thread is tid 0, under the root span
+
+    def _tid(self) -> int:
+        """Small thread id, with a thread_name entry for each new thread"""
+        ident = threading.get_ident()
+        tid = self._tids.get(ident)
+        if tid is None:
+            with self._lock:
+                tid = self._tids.setdefault(ident, len(self._tids))
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 0,
+                        "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+        return tid
+
+    def complete(
+        self, name: str, cat: str, start: int, end: int, args: Dict[str, Any]
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start - self.start,
+            "dur": max(0, end - start),
+            "pid": 0,
+            "tid": self._tid(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def instant(self, name: str, cat: str, args: Dict[str, Any]) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "t",
+            "ts": now_us() - self.start,
+            "pid": 0,
+            "tid": self._tid(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def add_process(self, process_name: str, events: List[Dict], start: int) -> None:
+        """Add events recorded elsewhere (e.g. ninja steps) as their own process
+
+        Args:
+            process_name: Name shown for the process track
+            events: Trace events with timestamps relative to `start`
+            start: now_us() at the time the events' clock was zero
+        """
+        with self._lock:
+            pid = self._pids
+            self._pids += 1
+            offset = start - self.start
+            self.events.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "args": {"name": process_name},
+                }
+            )
+            for event in events:
+                self.events.append(
+                    {**event, "pid": pid, "ts": event.get("ts", 0) + offset}
+                )
+
+    def write(self) -> None:
+        """Write the trace with a span covering the whole process"""
+        with self._lock:
+            events = list(self.events)
+        events.append(
+            {
+                "name": self.name,
+                "cat": "process",
+                "ph": "X",
+                "ts": 0,
+                "dur": now_us() - self.start,
+                "pid": 0,
+                "tid": 0,
+            }
+        )
+        # Imported here: utils imports this module
+        from .utils import write_json_atomic
+
+        try:
+            write_json_atomic(
+                self.path,
+                {"traceEvents": events, "displayTimeUnit": "ms"},
+                indent=None,
+            )
+        except OSError as e:
+            # Runs at exit, possibly after the log file was closed
+            print(f"Could not write trace {self.path}: {e}", file=sys.stderr)
+
+
+class Span:
+    """A timed region; recorded as a trace event when it ends"""
+
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name: str, cat: str, args: Dict[str, Any]):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def set(self, **args: Any) -> None:
+        """Attach more arguments (e.g. a result) to the event"""
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self.start = now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        tracer = _tracer
+        if tracer is not None:
+            tracer.complete(self.name, self.cat, self.start, now_us(), self.args)
+        return False
+
+
+class _NullSpan:
+    """Returned by span() while tracing is disabled"""
+
+    __slots__ = ()
+
+    def set(self, **args: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, cat: str = "build", **args: Any):
+    """Time a block as a trace event (no-op while tracing is disabled)
+
+    Args:
+        name: Event name (e.g. module name, command, patch path)
+        cat: Category, used for filtering/colouring in the trace viewer
+        **args: Values shown with the event
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(name, cat, args)
+
+
+def instant(name: str, cat: str = "build", **args: Any) -> None:
+    """Record a point-in-time event (e.g. a skipped module)"""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.instant(name, cat, args)
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def enable_tracing(name: str, path: Optional[Path] = None) -> Tracer:
+    """Start recording; the trace is written when the process exits
+
+    Args:
+        name: Name of the root span (e.g. "browseros build")
+        path: Output file (default: next to the build log)
+    """
+    global _tracer
+    if _tracer is None:
+        if path is None:
+            log_path = get_log_file_path()
+            path = log_path.with_name(log_path.stem + TRACE_SUFFIX)
+        _tracer = Tracer(path, name)
+        atexit.register(_tracer.write)
+        log_info(f"🧭 Tracing to {path} (open in ui.perfetto.dev)")
+    return _tracer
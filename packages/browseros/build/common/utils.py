@@ -3,13 +3,17 @@
 Shared utilities for the build system
 """
 
+import hashlib
+import json
 import os
 import sys
 import subprocess
+import tempfile
+import time
 import yaml
 import shutil
 from pathlib import Path
-from typing import Optional, List, Dict, Union
+from typing import Any, Optional, List, Dict, Union
 
 # Import logging functions from logger module - re-exported for other modules
 from .logger import (  # noqa: F401
@@ -17,8 +21,13 @@ from .logger import (  # noqa: F401
     log_error,
     log_warning,
     log_success,
+    log_prefix,
+    get_log_prefix,
+    with_log_prefix,
     _log_to_file,
 )
+from .rusage import ProcessStats, TreeSampler, record_usage, wait_with_stats
+from .trace import span
 
 
 # Platform detection functions
@@ -37,19 +46,63 @@ def IS_LINUX() -> bool:
     return sys.platform.startswith("linux")
 
 
+class CommandResult(subprocess.CompletedProcess):
+    """CompletedProcess with the command's resource usage (see rusage.py)"""
+
+    def __init__(
+        self,
+        args: List[str],
+        returncode: int,
+        stdout: str = "",
+        stderr: str = "",
+        stats: Optional[ProcessStats] = None,
+    ):
+        super().__init__(args, returncode, stdout, stderr)
+        # None if the usage couldn't be measured
+        self.stats: Optional[ProcessStats] = stats
+
+
+class CommandError(subprocess.CalledProcessError):
+    """CalledProcessError raised by run_command, with the resource usage"""
+
+    def __init__(self, result: CommandResult):
+        super().__init__(result.returncode, result.args, result.stdout, result.stderr)
+        self.stats: Optional[ProcessStats] = result.stats
+
+
 def run_command(
     cmd: List[str],
     cwd: Optional[Path] = None,
     env: Optional[Dict] = None,
     check: bool = True,
-) -> subprocess.CompletedProcess:
-    """Run a command with real-time streaming output and full capture"""
-    cmd_str = " ".join(cmd)
+) -> CommandResult:
+    """Run a command with real-time streaming output and full capture
+
+    Raises:
+        CommandError: If check is set and the command fails
+    """
+    cmd_str = " ".join(str(part) for part in cmd)
+    with span(Path(str(cmd[0])).name, "subprocess", cmd=cmd_str) as s:
+        result = _run_command(cmd, cmd_str, cwd, env, check)
+        s.set(exit_code=result.returncode)
+        if result.stats is not None:
+            s.set(**result.stats.to_dict())
+        return result
+
+
+def _run_command(
+    cmd: List[str],
+    cmd_str: str,
+    cwd: Optional[Path],
+    env: Optional[Dict],
+    check: bool,
+) -> CommandResult:
     _log_to_file(f"RUN_COMMAND: 🔧 Running: {cmd_str}")
     log_info(f"🔧 Running: {cmd_str}")
 
     try:
         # Always use Popen for real-time streaming and capturing
+        start = time.monotonic()
         process = subprocess.Popen(
             cmd,
             cwd=cwd,
@@ -62,34 +115,39 @@ def run_command(
         )
 
         stdout_lines = []
-
-        # Stream output line by line
-        for line in iter(process.stdout.readline, ""):
-            line = line.rstrip()
-            if line:
-                print(line)  # Print to console in real-time
-                _log_to_file(f"RUN_COMMAND: STDOUT: {line}")  # Log to file
-                stdout_lines.append(line)
-
-        # Wait for process to complete
-        process.wait()
+        assert process.stdout is not None  # stdout=PIPE
+
+        with TreeSampler(process.pid) as sampler:
+            # Stream output line by line
+            for line in iter(process.stdout.readline, ""):
+                line = line.rstrip()
+                if line:
+                    print(with_log_prefix(line))  # Print to console in real-time
+                    _log_to_file(f"RUN_COMMAND: STDOUT: {line}")  # Log to file
+                    stdout_lines.append(line)
+
+            # Wait for process to complete (and collect its resource usage)
+            stats = wait_with_stats(process, start)
+        process.stdout.close()
+        if stats is not None:
+            stats.peak_tree_rss_bytes = sampler.peak_rss
+            record_usage(Path(str(cmd[0])).name, stats)
 
         _log_to_file(
             f"RUN_COMMAND: ✅ Command completed with exit code: {process.returncode}"
         )
 
         # Create a CompletedProcess object with captured output
-        result = subprocess.CompletedProcess(
+        result = CommandResult(
             cmd,
             process.returncode,
             stdout="\n".join(stdout_lines) if stdout_lines else "",
             stderr="",
+            stats=stats,
         )
 
         if check and process.returncode != 0:
-            raise subprocess.CalledProcessError(
-                process.returncode, cmd, result.stdout, result.stderr
-            )
+            raise CommandError(result)
 
         return result
 
@@ -112,7 +170,13 @@ def run_command(
             if e.stderr:
                 log_error(f"Error: {e.stderr}")
             raise
-        return e
+        return CommandResult(
+            cmd,
+            e.returncode,
+            stdout=e.stdout or "",
+            stderr=e.stderr or "",
+            stats=getattr(e, "stats", None),
+        )
     except Exception as e:
         _log_to_file(f"RUN_COMMAND: ❌ Unexpected error: {str(e)}")
         if check:
@@ -234,3 +298,86 @@ def safe_rmtree(path: Union[str, Path]) -> None:
     else:
         # On Unix-like systems, regular rmtree works fine
         shutil.rmtree(path)
+
+
+def _read_umask() -> int:
+    """Current process umask (mkstemp creates files as 0600)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import: os.umask() is process-wide and not safe to toggle
+# while other threads create files
+_UMASK = _read_umask()
+
+
+def file_sha256(path: Union[str, Path]) -> Optional[str]:
+    """Hash a file's content, or return None if it doesn't exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def write_bytes_atomic(path: Union[str, Path], data: bytes) -> None:
+    """Write a file via a temp file in the same directory and rename"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        else:
+            os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_json_atomic(
+    path: Union[str, Path],
+    data: Any,
+    indent: Optional[int] = 2,
+    sort_keys: bool = False,
+) -> None:
+    """Write JSON via a unique temp file in the same directory and rename
+
+    Concurrent writers never share a temp file, and readers see either the
+    old or the new file. Raises OSError if the file can't be written.
+    """
+    text = json.dumps(data, indent=indent, sort_keys=sort_keys) + "\n"
+    write_bytes_atomic(path, text.encode("utf-8"))
+
+
+def write_text_if_changed(
+    path: Union[str, Path], content: str, encoding: str = "utf-8"
+) -> bool:
+    """Write a text file atomically, skipping the write if content is unchanged
+
+    Leaving unchanged files alone keeps their mtimes stable for editors,
+    caches and rsync.
+
+    Returns:
+        True if the file was written, False if it already had this content
+    """
+    data = content.encode(encoding)
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data):
+            if file_sha256(path) == hashlib.sha256(data).hexdigest():
+                return False
+    except FileNotFoundError:
+        pass
+
+    write_bytes_atomic(path, data)
+    return True
+
@@ -2,57 +2,72 @@
 Annotate - Create git commits organized by features from features.yaml
 
 For each feature, checks which files have modifications and creates a commit
-with the feature name and description.
+with the feature name and description. The working tree is scanned once per
+run (see status.py) and each changed path is matched to its features through
+the features.yaml index.
 """
 
-import yaml
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Set
 
 from ..apply.utils import run_git_command
 from ...common.context import Context
+from ...common.git import GitError
 from ...common.module import CommandModule, ValidationError
 from ...common.utils import log_info, log_error, log_success, log_warning
+from ..feature.index import FeatureIndex, load_feature_index
+from ..feature.store import get_feature_store
+from .status import WorktreeStatus, stage_files
 
 
 def load_features(features_file: Path) -> Dict:
     """Load features from YAML file."""
     try:
-        with open(features_file, "r") as f:
-            data = yaml.safe_load(f)
-            return data.get("features", {})
+        return get_feature_store(features_file).features
     except Exception as e:
         log_error(f"Failed to load features file: {e}")
         return {}
 
 
-def get_modified_files(chromium_src: Path, files: List[str]) -> List[str]:
+def get_modified_files(
+    chromium_src: Path,
+    files: List[str],
+    status: Optional[WorktreeStatus] = None,
+) -> List[str]:
     """Get list of files that have modifications or are untracked.
 
     Args:
         chromium_src: Chromium source directory
-        files: List of file paths to check
+        files: List of file paths (or directory entries ending in /) to check
+        status: Working tree snapshot to query (taken if not given)
 
     Returns:
         List of file paths that have modifications
     """
-    modified = []
+    if status is None:
+        status = WorktreeStatus.snapshot(chromium_src)
+    return status.modified_files(files)
 
-    for file_path in files:
-        full_path = chromium_src / file_path
 
-        if not full_path.exists():
-            continue
-
-        result = run_git_command(
-            ["git", "status", "--porcelain", str(file_path)],
-            cwd=chromium_src,
-        )
+def group_modified_files(
+    chromium_src: Path, status: WorktreeStatus, index: FeatureIndex
+) -> Dict[str, List[str]]:
+    """Map each feature to the changed paths it owns.
 
-        if result.returncode == 0 and result.stdout.strip():
-            modified.append(file_path)
+    Every changed path is looked up once in the feature index, so directory
+    entries cover the files below them.
 
-    return modified
+    Returns:
+        Dict of feature name -> changed paths that exist on disk
+    """
+    result: Dict[str, List[str]] = {}
+    for path in status.paths:
+        owners = index.owners(path)
+        if not owners or not (chromium_src / path).exists():
+            continue
+        for feature_name in owners:
+            result.setdefault(feature_name, []).append(path)
+    return result
 
 
 def git_add_and_commit(
@@ -68,15 +83,9 @@ def git_add_and_commit(
     Returns:
         True if commit was created successfully
     """
-    # Add all specified files
-    for file_path in files:
-        result = run_git_command(
-            ["git", "add", str(file_path)],
-            cwd=chromium_src,
-        )
-        if result.returncode != 0:
-            log_error(f"Failed to add file: {file_path}")
-            return False
+    # Add all specified files in one git invocation
+    if not stage_files(chromium_src, files):
+        return False
 
     # Create commit
     result = run_git_command(
@@ -116,7 +125,8 @@ def annotate_features(
         log_error(f"Features file not found: {features_file}")
         return 0, 0
 
-    features = load_features(features_file)
+    index = load_feature_index(features_file)
+    features = index.features
     if not features:
         log_error("No features found in features.yaml")
         return 0, 0
@@ -128,11 +138,22 @@ def annotate_features(
             return 0, 0
         features = {feature_filter: features[feature_filter]}
 
+    # One status snapshot answers every feature's query
+    try:
+        status = WorktreeStatus.snapshot(ctx.chromium_src)
+    except GitError as e:
+        log_error(str(e))
+        return 0, 0
+
+    modified_by_feature = group_modified_files(ctx.chromium_src, status, index)
+
     log_info(f"📋 Processing {len(features)} feature(s)")
+    log_info(f"   {len(status)} changed path(s) in working tree")
     log_info("=" * 60)
 
     commits_created = 0
     features_skipped = 0
+    committed: Set[str] = set()
 
     for feature_name, feature_data in features.items():
         description = feature_data.get("description", feature_name)
@@ -146,8 +167,13 @@ def annotate_features(
             features_skipped += 1
             continue
 
-        # Find files with modifications
-        modified_files = get_modified_files(ctx.chromium_src, files)
+        # Find files with modifications (not already committed by an
+        # earlier feature sharing them)
+        modified_files = [
+            path
+            for path in modified_by_feature.get(feature_name, [])
+            if path not in committed
+        ]
 
         if not modified_files:
             log_warning(f"   No modified files ({len(files)} files checked)")
@@ -162,6 +188,7 @@ def annotate_features(
         if git_add_and_commit(ctx.chromium_src, modified_files, commit_message):
             log_success(f"   ✓ Committed {len(modified_files)} file(s)")
             commits_created += 1
+            committed.update(modified_files)
         else:
             log_warning("   No changes staged, skipping commit")
             features_skipped += 1
@@ -0,0 +1,127 @@
+"""
+Status - One-shot working tree snapshot for annotate
+
+Takes a single `git status --porcelain=v2 -z` snapshot of the Chromium
+checkout and answers every feature's "which of my files are modified" query
+from memory, instead of running `git status` once per file. Staging goes
+through one `git add --pathspec-from-file` per feature.
+"""
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, List, Set
+
+from ...common.git import GitError, run_git_command
+from ...common.utils import log_error
+
+
+# Fields before the path in each porcelain v2 record type
+_V2_PATH_FIELD = {"1": 8, "2": 9, "u": 10}
+
+
+def parse_porcelain_v2(output: str) -> Set[str]:
+    """Parse `git status --porcelain=v2 -z` output into changed paths.
+
+    Renamed/copied entries contribute both the new and the original path.
+    Ignored entries ("!") are skipped.
+    """
+    paths: Set[str] = set()
+    records = iter(output.split("\0"))
+    for record in records:
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "?":
+            paths.add(record[2:])
+        elif kind in _V2_PATH_FIELD:
+            paths.add(record.split(" ", _V2_PATH_FIELD[kind])[-1])
+            if kind == "2":
+                # Original path follows as its own NUL-terminated record
+                paths.add(next(records, ""))
+    paths.discard("")
+    return paths
+
+
+class WorktreeStatus:
+    """In-memory view of the changed (modified, staged or untracked) paths"""
+
+    def __init__(self, chromium_src: Path, changed: Iterable[str]):
+        self.chromium_src = chromium_src
+        self._changed = sorted(set(changed))
+
+    @classmethod
+    def snapshot(cls, chromium_src: Path) -> "WorktreeStatus":
+        """Take a status snapshot of the checkout.
+
+        Raises:
+            GitError: If git status fails
+        """
+        result = run_git_command(
+            ["git", "status", "--porcelain=v2", "-z", "--untracked-files=all"],
+            cwd=chromium_src,
+            timeout=600,
+        )
+        if result.returncode != 0:
+            raise GitError(f"git status failed: {result.stderr.strip()}")
+        return cls(chromium_src, parse_porcelain_v2(result.stdout))
+
+    def __len__(self) -> int:
+        return len(self._changed)
+
+    @property
+    def paths(self) -> List[str]:
+        """Changed paths, sorted"""
+        return list(self._changed)
+
+    def is_changed(self, path: str) -> bool:
+        """Check a file path, or a directory entry (anything changed below it)."""
+        path = path.rstrip("/")
+        index = bisect_left(self._changed, path)
+        if index < len(self._changed) and self._changed[index] == path:
+            return True
+        return self._has_prefix(path + "/")
+
+    def _has_prefix(self, prefix: str) -> bool:
+        index = bisect_left(self._changed, prefix)
+        return index < len(self._changed) and self._changed[index].startswith(prefix)
+
+    def modified_files(self, files: List[str]) -> List[str]:
+        """Filter feature file entries to those with changes that exist on disk."""
+        return [
+            file_path
+            for file_path in files
+            if self.is_changed(file_path) and (self.chromium_src / file_path).exists()
+        ]
+
+    def discard(self, files: Iterable[str]) -> None:
+        """Forget paths (and directory entries' contents) after committing them."""
+        prefixes = [path.rstrip("/") for path in files]
+        dirs = tuple(prefix + "/" for prefix in prefixes)
+        exact = set(prefixes)
+        self._changed = [
+            path
+            for path in self._changed
+            if path not in exact and not path.startswith(dirs)
+        ]
+
+
+def stage_files(chromium_src: Path, files: List[str]) -> bool:
+    """Stage files with a single `git add`, paths passed on stdin."""
+    if not files:
+        return True
+
+    result = run_git_command(
+        [
+            "git",
+            "--literal-pathspecs",
+            "add",
+            "--pathspec-from-file=-",
+            "--pathspec-file-nul",
+        ],
+        cwd=chromium_src,
+        input="".join(f"{path}\0" for path in files),
+        timeout=600,
+    )
+    if result.returncode != 0:
+        log_error(f"Failed to add files: {result.stderr.strip()}")
+    return result.returncode == 0
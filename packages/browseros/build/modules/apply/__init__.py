@@ -5,11 +5,13 @@ Provides commands for applying patches:
 - apply_all: Apply all patches from patches directory
 - apply_feature: Apply patches for a specific feature
 - apply_patch: Apply patch for a single file
+- check: Parallel dry-run check of all patches
 """
 
 from .apply_all import apply_all_patches, ApplyAllModule
 from .apply_feature import apply_feature_patches, ApplyFeatureModule
 from .apply_patch import apply_single_file_patch
+from .check import check_all_patches
 
 __all__ = [
     "apply_all_patches",
@@ -17,4 +19,5 @@ __all__ = [
     "apply_feature_patches",
     "ApplyFeatureModule",
     "apply_single_file_patch",
+    "check_all_patches",
 ]
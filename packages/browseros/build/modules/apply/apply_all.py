@@ -2,12 +2,17 @@
 Apply All - Apply all patches from patches directory.
 """
 
+import time
+from pathlib import Path
 from typing import List, Tuple, Optional
 
 from ...common.context import Context
 from ...common.module import CommandModule, ValidationError
 from ...common.utils import log_info, log_error, log_warning, log_success
-from .common import find_patch_files, process_patch_list
+from .common import find_patch_files, process_patch_list, DEFAULT_APPLY_STRATEGY
+from .batch import apply_patches_batched
+from .check import check_patches, log_check_results, write_check_report
+from .manifest import ApplyManifest, blob_sha
 
 
 def apply_all_patches(
@@ -15,6 +20,11 @@ def apply_all_patches(
     dry_run: bool = False,
     interactive: bool = False,
     reset_to: Optional[str] = None,
+    batch: bool = False,
+    jobs: Optional[int] = None,
+    report_path: Optional[Path] = None,
+    incremental: bool = False,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
 ) -> Tuple[int, List[str]]:
     """Apply all patches from patches directory.
 
@@ -23,6 +33,13 @@ def apply_all_patches(
         dry_run: Only check if patches would apply
         interactive: Ask for confirmation before each patch
         reset_to: Commit to reset files to before applying (optional)
+        batch: Apply the whole set in one git apply invocation, bisecting
+            to isolate failures (ignored for dry runs and interactive mode)
+        jobs: Concurrent checks for dry runs (default: CPU count)
+        report_path: Write a JSON check report here (dry runs only)
+        incremental: Skip patches the applied-state manifest shows as already
+            applied, and record what gets applied (non-interactive only)
+        strategy: Per-patch apply strategy, "python" or "git"
 
     Returns:
         Tuple of (applied_count, failed_list)
@@ -46,17 +63,65 @@ def apply_all_patches(
         log_info("DRY RUN - No changes will be made")
 
     # Create patch list with display names
-    patch_list = [(p, p.relative_to(patches_dir)) for p in patch_files]
+    patch_list = [(p, str(p.relative_to(patches_dir))) for p in patch_files]
+
+    manifest = None
+    skipped = []
+    pre_images = {}
+    if incremental and not dry_run and not interactive:
+        manifest = ApplyManifest.for_context(build_ctx)
+        if reset_to:
+            log_info("Resetting to a base commit - manifest skip disabled")
+        else:
+            patch_list, skipped = manifest.partition(patch_list)
+        pre_images = {
+            str(name): blob_sha(build_ctx.chromium_src / name)
+            for _, name in patch_list
+        }
 
     # Process patches
-    applied, failed = process_patch_list(
-        patch_list,
-        build_ctx.chromium_src,
-        patches_dir,
-        dry_run,
-        interactive,
-        reset_to=reset_to,
-    )
+    if dry_run:
+        start_time = time.time()
+        results = check_patches(
+            patch_list, build_ctx.chromium_src, jobs=jobs, strategy=strategy
+        )
+        log_check_results(results)
+        if report_path:
+            write_check_report(report_path, results, jobs, time.time() - start_time)
+        applied = sum(1 for r in results if r.ok)
+        failed = [r.patch for r in results if not r.ok]
+    elif batch and not interactive:
+        applied, failed = apply_patches_batched(
+            patch_list,
+            build_ctx.chromium_src,
+            patches_dir,
+            reset_to=reset_to,
+            strategy=strategy,
+        )
+    else:
+        if batch:
+            log_warning("Batch mode is not available in interactive mode")
+        applied, failed = process_patch_list(
+            patch_list,
+            build_ctx.chromium_src,
+            patches_dir,
+            dry_run,
+            interactive,
+            reset_to=reset_to,
+            strategy=strategy,
+        )
+
+    if manifest:
+        failed_names = {str(p) for p in failed}
+        for patch_path, name in patch_list:
+            name = str(name)
+            if name in failed_names:
+                manifest.forget(name)
+            else:
+                manifest.record(patch_path, name, name, pre_images.get(name))
+        manifest.prune([str(p.relative_to(patches_dir)) for p in patch_files])
+        manifest.save()
+        applied += len(skipped)
 
     # Summary
     log_info(f"\nSummary: {applied} applied, {len(failed)} failed")
@@ -91,6 +156,9 @@ class ApplyAllModule(CommandModule):
         interactive: bool = True,
         reset_to: Optional[str] = None,
         annotate: bool = False,
+        batch: bool = False,
+        incremental: bool = False,
+        strategy: str = DEFAULT_APPLY_STRATEGY,
         **kwargs,
     ) -> None:
         """Execute apply all patches
@@ -99,12 +167,18 @@ class ApplyAllModule(CommandModule):
             interactive: Interactive mode (ask before each patch)
             reset_to: Commit to reset files to before applying (optional)
             annotate: Create git commits per feature after applying
+            batch: Apply all patches in a single git apply invocation
+            incremental: Skip patches already applied per the manifest
+            strategy: Per-patch apply strategy, "python" or "git"
         """
         applied, failed = apply_all_patches(
             ctx,
             dry_run=False,
             interactive=interactive,
             reset_to=reset_to,
+            batch=batch,
+            incremental=incremental,
+            strategy=strategy,
         )
         if failed:
             raise RuntimeError(f"Failed to apply {len(failed)} patches")
@@ -2,13 +2,14 @@
 Apply Feature - Apply patches for a specific feature.
 """
 
-import yaml
 from typing import List, Tuple, Optional
 
 from ...common.context import Context
 from ...common.module import CommandModule, ValidationError
 from ...common.utils import log_info, log_error, log_warning, log_success
-from .common import process_patch_list
+from ..extract.utils import PATCH_MARKER_SUFFIXES
+from ..feature.index import load_feature_index
+from .common import find_patch_files, process_patch_list
 
 
 def apply_feature_patches(
@@ -28,37 +29,53 @@ def apply_feature_patches(
     Returns:
         Tuple of (applied_count, failed_list)
     """
-    # Load features.yaml
+    # Look up the feature in the compiled features.yaml index
     features_path = build_ctx.get_features_yaml_path()
     if not features_path.exists():
         log_error("No features.yaml found")
         return 0, []
 
-    with open(features_path) as f:
-        data = yaml.safe_load(f)
+    index = load_feature_index(features_path)
 
-    features = data.get("features", {})
-
-    if feature_name not in features:
+    if feature_name not in index.features:
         log_error(f"Feature '{feature_name}' not found")
         log_info("Available features:")
-        for name in features:
+        for name in index.features:
             log_info(f"  - {name}")
         return 0, []
 
-    file_list = features[feature_name].get("files", [])
+    # Directory entries expand to the patches below them
+    patches_dir = build_ctx.get_patches_dir()
+    patch_files = {
+        p.relative_to(patches_dir).as_posix() for p in find_patch_files(patches_dir)
+    }
+    file_list = index.resolve(feature_name, patch_files)
 
     if not file_list:
         log_warning(f"Feature '{feature_name}' has no files")
         return 0, []
 
+    # Files covered by a .deleted/.binary/.rename marker have no diff to
+    # apply (apply_all skips markers too)
+    markers = [
+        file_path
+        for file_path in file_list
+        if file_path not in patch_files
+        and any(
+            build_ctx.get_patch_path_for_file(file_path + suffix).exists()
+            for suffix in PATCH_MARKER_SUFFIXES
+        )
+    ]
+    if markers:
+        log_info(f"Skipping {len(markers)} file(s) with marker patches only")
+        file_list = [f for f in file_list if f not in markers]
+
     log_info(f"Applying patches for feature '{feature_name}' ({len(file_list)} files)")
 
     if dry_run:
         log_info("DRY RUN - No changes will be made")
 
     # Create patch list
-    patches_dir = build_ctx.get_patches_dir()
     patch_list = []
     for file_path in file_list:
         patch_path = build_ctx.get_patch_path_for_file(file_path)
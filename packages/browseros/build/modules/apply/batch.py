@@ -0,0 +1,178 @@
+"""
+Batch Apply - Apply a whole patch set with a single git apply invocation.
+
+The patches are concatenated and streamed to a single git apply on stdin. That
+makes the batch all-or-nothing (separate patch file arguments are applied one
+by one, leaving a partial tree on failure). When a batch fails it is split in
+half and each half retried, which isolates the failing patches in O(k log n)
+invocations. Only the isolated patches go through the per-patch path
+(including its --3way fallback).
+"""
+
+import time
+from pathlib import Path
+from typing import List, Tuple, Optional
+
+from .utils import run_git_command
+from .common import apply_single_patch, reset_patch_targets, DEFAULT_APPLY_STRATEGY
+from ...common.utils import log_info, log_success, log_warning
+
+# Patches per git apply: bounds how much a failing chunk has to bisect
+BATCH_CHUNK_SIZE = 100
+
+GIT_APPLY_CMD = ["git", "apply", "--ignore-whitespace", "--whitespace=nowarn", "-p1"]
+
+
+class BatchStats:
+    """Timing bookkeeping for a batched apply run"""
+
+    def __init__(self):
+        self.invocations = 0
+        self.single_timings: List[float] = []
+        self.fallbacks = 0
+
+    def record(self, patch_count: int, duration: float) -> None:
+        self.invocations += 1
+        if patch_count == 1:
+            self.single_timings.append(duration)
+
+
+def _git_apply(
+    patch_paths: List[Path], chromium_src: Path, stats: BatchStats
+) -> Tuple[bool, str]:
+    """Run one git apply over all given patches (all-or-nothing)."""
+    parts = []
+    for patch_path in patch_paths:
+        content = patch_path.read_text(encoding="utf-8")
+        parts.append(content if content.endswith("\n") else content + "\n")
+
+    start = time.time()
+    result = run_git_command(
+        GIT_APPLY_CMD + ["-"], cwd=chromium_src, input="".join(parts)
+    )
+    stats.record(len(patch_paths), time.time() - start)
+    return result.returncode == 0, result.stderr
+
+
+def _apply_bisect(
+    patches: List[Tuple[Path, str]],
+    chromium_src: Path,
+    patches_dir: Path,
+    stats: BatchStats,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
+) -> Tuple[List[str], List[str]]:
+    """Apply patches in one invocation, bisecting on failure.
+
+    Returns:
+        Tuple of (applied display names, failed display names)
+    """
+    if not patches:
+        return [], []
+
+    success, _ = _git_apply([p for p, _ in patches], chromium_src, stats)
+    if success:
+        for _, display_name in patches:
+            log_success(f"  ✓ Applied: {display_name}")
+        return [name for _, name in patches], []
+
+    if len(patches) == 1:
+        # Isolated a failing patch - hand it to the per-patch path (--3way)
+        patch_path, display_name = patches[0]
+        stats.fallbacks += 1
+        ok, _ = apply_single_patch(
+            patch_path, chromium_src, False, patches_dir, strategy=strategy
+        )
+        return ([display_name], []) if ok else ([], [display_name])
+
+    mid = len(patches) // 2
+    applied_left, failed_left = _apply_bisect(
+        patches[:mid], chromium_src, patches_dir, stats, strategy
+    )
+    applied_right, failed_right = _apply_bisect(
+        patches[mid:], chromium_src, patches_dir, stats, strategy
+    )
+    return applied_left + applied_right, failed_left + failed_right
+
+
+def _measure_single_invocation(patch_path: Path, chromium_src: Path) -> float:
+    """Time one single-patch git apply without modifying the tree.
+
+    An applied patch reverse-applies cleanly, so --check --reverse exercises
+    the same fork/exec and index load as the per-file path does.
+    """
+    start = time.time()
+    run_git_command(
+        GIT_APPLY_CMD + ["--check", "--reverse", str(patch_path)], cwd=chromium_src
+    )
+    return time.time() - start
+
+
+def apply_patches_batched(
+    patch_list: List[Tuple[Path, str]],
+    chromium_src: Path,
+    patches_dir: Path,
+    reset_to: Optional[str] = None,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
+) -> Tuple[int, List[str]]:
+    """Apply a list of patches using batched git apply invocations.
+
+    Args:
+        patch_list: List of (patch_path, display_name) tuples
+        chromium_src: Chromium source directory
+        patches_dir: Base directory for relative path display
+        reset_to: Commit to reset files to before applying (optional)
+        strategy: Apply strategy for patches isolated by bisection
+
+    Returns:
+        Tuple of (applied_count, failed_list)
+    """
+    start_time = time.time()
+    stats = BatchStats()
+    failed: List[str] = []
+    pending: List[Tuple[Path, str]] = []
+
+    for patch_path, display_name in patch_list:
+        if not patch_path.exists():
+            log_warning(f"  Patch not found: {display_name}")
+            failed.append(str(display_name))
+            continue
+        pending.append((patch_path, str(display_name)))
+
+    if reset_to:
+        reset_patch_targets([name for _, name in pending], reset_to, chromium_src)
+
+    applied: List[str] = []
+    for i in range(0, len(pending), BATCH_CHUNK_SIZE):
+        chunk = pending[i : i + BATCH_CHUNK_SIZE]
+        chunk_applied, chunk_failed = _apply_bisect(
+            chunk, chromium_src, patches_dir, stats, strategy
+        )
+        applied.extend(chunk_applied)
+        failed.extend(chunk_failed)
+
+    elapsed = time.time() - start_time
+
+    # Estimate the per-file path: one git invocation per patch, plus the
+    # --3way retry for every patch that needed the fallback
+    if pending:
+        if stats.single_timings:
+            per_invocation = min(stats.single_timings)
+        else:
+            per_invocation = _measure_single_invocation(pending[0][0], chromium_src)
+        estimated = per_invocation * (len(pending) + stats.fallbacks)
+        log_info(
+            f"\n⏱️  Batched apply: {elapsed:.1f}s over {stats.invocations} git "
+            f"invocation(s) ({stats.fallbacks} per-patch fallback(s))"
+        )
+        if estimated > elapsed:
+            log_info(
+                f"   Per-file apply estimated at {estimated:.1f}s "
+                f"(~{per_invocation:.2f}s per invocation) - "
+                f"saved ~{estimated - elapsed:.1f}s"
+            )
+        else:
+            log_info(
+                f"   Per-file apply estimated at {estimated:.1f}s - no time saved"
+            )
+
+    return len(applied), failed
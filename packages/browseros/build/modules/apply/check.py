@@ -0,0 +1,281 @@
+"""
+Check - Parallel dry-run engine for patch sets.
+
+Nearly every patch touches a different file, so dry-run checks are independent
+and can run concurrently. Patches that share a target path are grouped and
+checked in order, each one on top of the earlier patches of its group, so the
+result matches a sequential apply. Checks use the engine and settings of the
+apply itself (see common.check_patch_file), so check and apply agree.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .common import DEFAULT_APPLY_STRATEGY, check_patch_file, check_patch_text
+from .utils import get_patch_targets
+from ...common.context import Context
+from ...common.utils import log_info, log_error, log_success
+
+
+@dataclass
+class PatchCheckResult:
+    """Outcome of checking a single patch"""
+
+    patch: str
+    patch_set: str
+    targets: List[str] = field(default_factory=list)
+    status: str = "ok"  # ok | failed | missing
+    stderr: str = ""
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def group_by_target(entries: List[Tuple[Path, str]]) -> List[List[int]]:
+    """Group patch indices so patches sharing any target path stay together.
+
+    Args:
+        entries: List of (patch_path, display_name) tuples
+
+    Returns:
+        List of groups, each a list of indices in original order
+    """
+    parent = list(range(len(entries)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[str, int] = {}
+    for i, (patch_path, _) in enumerate(entries):
+        for target in get_patch_targets(patch_path):
+            if target in owner:
+                parent[find(i)] = find(owner[target])
+            else:
+                owner[target] = i
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(entries)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _read_patch(patch_path: Path) -> str:
+    content = patch_path.read_text(encoding="utf-8")
+    return content if content.endswith("\n") else content + "\n"
+
+
+def _check_group(
+    group: List[Tuple[Path, str]],
+    chromium_src: Path,
+    strategy: str,
+    patch_set: str,
+) -> List[PatchCheckResult]:
+    """Check one group of patches.
+
+    A single patch is checked directly. For larger groups each patch is
+    checked stacked on the earlier patches that passed, as one patch text,
+    so nothing is written to the tree.
+    """
+    results = []
+    passed: List[str] = []
+
+    for patch_path, display_name in group:
+        result = PatchCheckResult(
+            patch=display_name,
+            patch_set=patch_set,
+            targets=get_patch_targets(patch_path),
+        )
+        start = time.time()
+
+        if not patch_path.exists():
+            result.status = "missing"
+            result.stderr = f"Patch file not found: {patch_path}"
+        elif len(group) == 1:
+            ok, error = check_patch_file(patch_path, chromium_src, strategy)
+            if not ok:
+                result.status = "failed"
+                result.stderr = error or ""
+        else:
+            content = _read_patch(patch_path)
+            ok, error = check_patch_text(
+                "".join(passed) + content, chromium_src, strategy
+            )
+            if ok:
+                passed.append(content)
+            else:
+                result.status = "failed"
+                result.stderr = error or ""
+
+        result.duration = time.time() - start
+        results.append(result)
+
+    return results
+
+
+def check_patches(
+    entries: List[Tuple[Path, str]],
+    chromium_src: Path,
+    jobs: Optional[int] = None,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
+    patch_set: str = "chromium_patches",
+) -> List[PatchCheckResult]:
+    """Check patches concurrently, the way they would be applied.
+
+    Args:
+        entries: List of (patch_path, display_name) tuples, in apply order
+        chromium_src: Chromium source directory
+        jobs: Number of concurrent checks (default: CPU count)
+        strategy: Apply strategy the patches will be applied with
+        patch_set: Label recorded in each result
+
+    Returns:
+        List of PatchCheckResult in the same order as entries
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    entries = [(path, str(name)) for path, name in entries]
+
+    groups = group_by_target(entries)
+    results: List[Optional[PatchCheckResult]] = [None] * len(entries)
+
+    log_info(
+        f"Checking {len(entries)} patches in {len(groups)} group(s) "
+        f"with {jobs} worker(s)"
+    )
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                _check_group,
+                [entries[i] for i in group],
+                chromium_src,
+                strategy,
+                patch_set,
+            ): group
+            for group in groups
+        }
+        for future, group in futures.items():
+            for i, result in zip(group, future.result(), strict=True):
+                results[i] = result
+
+    return [r for r in results if r is not None]
+
+
+def log_check_results(results: List[PatchCheckResult]) -> None:
+    """Log check results in apply order"""
+    total = len(results)
+    for i, result in enumerate(results, 1):
+        if result.ok:
+            log_success(f"  [{i}/{total}] ✓ Would apply: {result.patch}")
+        elif result.status == "missing":
+            log_error(f"  [{i}/{total}] ✗ Patch file not found: {result.patch}")
+        else:
+            log_error(f"  [{i}/{total}] ✗ Would fail: {result.patch}")
+
+
+def write_check_report(
+    report_path: Path,
+    results: List[PatchCheckResult],
+    jobs: Optional[int],
+    duration: float,
+) -> None:
+    """Write a JSON report of check results.
+
+    Args:
+        report_path: Output file
+        results: Results from one or more check_patches() calls
+        jobs: Worker count used
+        duration: Wall-clock duration of the checks in seconds
+    """
+    failed = [r for r in results if not r.ok]
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "workers": max(1, jobs or os.cpu_count() or 1),
+        "duration": round(duration, 3),
+        "total": len(results),
+        "passed": len(results) - len(failed),
+        "failed": len(failed),
+        "patches": [
+            {**asdict(r), "duration": round(r.duration, 3)} for r in results
+        ],
+    }
+
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    log_info(f"📄 Check report written to: {report_path}")
+
+
+def check_all_patches(
+    build_ctx: Context,
+    jobs: Optional[int] = None,
+    report_path: Optional[Path] = None,
+    include_series: bool = True,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
+) -> Tuple[int, List[str]]:
+    """Check chromium_patches/ and series patches in one parallel dry run.
+
+    Args:
+        build_ctx: Build context
+        jobs: Number of concurrent checks (default: CPU count)
+        report_path: Write a combined JSON report here (optional)
+        include_series: Also check patches listed in series files
+        strategy: Apply strategy the patches will be applied with
+
+    Returns:
+        Tuple of (passed_count, failed_list)
+    """
+    from .common import find_patch_files
+    from ..patches.series_patches import get_series_patch_list
+
+    start_time = time.time()
+    results: List[PatchCheckResult] = []
+
+    patches_dir = build_ctx.get_patches_dir()
+    patch_files = find_patch_files(patches_dir)
+    if patch_files:
+        log_info(f"Found {len(patch_files)} patches in {patches_dir}")
+        results.extend(
+            check_patches(
+                [(p, str(p.relative_to(patches_dir))) for p in patch_files],
+                build_ctx.chromium_src,
+                jobs=jobs,
+                strategy=strategy,
+            )
+        )
+
+    if include_series:
+        series_dir = build_ctx.get_series_patches_dir()
+        series_patches = get_series_patch_list(series_dir)
+        if series_patches:
+            log_info(f"Found {len(series_patches)} series patches in {series_dir}")
+            results.extend(
+                check_patches(
+                    [(series_dir / rel, rel) for rel in series_patches],
+                    build_ctx.chromium_src,
+                    jobs=jobs,
+                    strategy=strategy,
+                    patch_set="series_patches",
+                )
+            )
+
+    log_check_results(results)
+    duration = time.time() - start_time
+    if report_path:
+        write_check_report(report_path, results, jobs, duration)
+
+    failed = [r.patch for r in results if not r.ok]
+    log_info(
+        f"\nSummary: {len(results) - len(failed)} would apply, "
+        f"{len(failed)} would fail ({duration:.1f}s)"
+    )
+    return len(results) - len(failed), failed
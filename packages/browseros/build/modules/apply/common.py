@@ -7,9 +7,29 @@ Contains core patch application logic used by apply_all, apply_feature, and appl
 from pathlib import Path
 from typing import List, Tuple, Optional
 
-from .utils import run_git_command, file_exists_in_commit, reset_file_to_commit
+from .utils import (
+    run_git_command,
+    file_exists_in_commit,
+    reset_file_to_commit,
+    files_existing_in_commit,
+    reset_files_to_commit,
+)
+from .unidiff import (
+    apply_patch_path,
+    apply_patch_text,
+    PatchApplyError,
+    UnsupportedPatchError,
+)
+from ...common.trace import span
 from ...common.utils import log_info, log_error, log_success, log_warning
 
+# "python" applies in-process (see unidiff.py), "git" shells out to git apply.
+# Both fall back to git apply --3way.
+APPLY_STRATEGIES = ("python", "git")
+DEFAULT_APPLY_STRATEGY = "python"
+
+GIT_APPLY_ARGS = ["--ignore-whitespace", "--whitespace=nowarn", "-p1"]
+
 
 def find_patch_files(patches_dir: Path) -> List[Path]:
     """Find all valid patch files in a directory.
@@ -36,12 +56,191 @@ def find_patch_files(patches_dir: Path) -> List[Path]:
     )
 
 
+def reset_patch_target(file_path: str, reset_to: str, chromium_src: Path) -> None:
+    """Reset a patch's target file to its state in a base commit.
+
+    Files that don't exist in the commit are deleted so the patch can
+    create them fresh.
+
+    Args:
+        file_path: Target file path (relative to chromium_src)
+        reset_to: Commit to reset the file to
+        chromium_src: Chromium source directory
+    """
+    if file_exists_in_commit(file_path, reset_to, chromium_src):
+        log_info(f"  Resetting to {reset_to[:8]}: {file_path}")
+        reset_file_to_commit(file_path, reset_to, chromium_src)
+    else:
+        target_file = chromium_src / file_path
+        if target_file.exists():
+            log_info(f"  Deleting (not in {reset_to[:8]}): {file_path}")
+            target_file.unlink()
+
+
+def reset_patch_targets(
+    file_paths: List[str], reset_to: str, chromium_src: Path
+) -> None:
+    """Reset many patch targets to a base commit in bulk.
+
+    Existence is resolved for all paths with one cat-file call, existing
+    files are restored with one checkout, and the rest are deleted.
+
+    Args:
+        file_paths: Target file paths (relative to chromium_src)
+        reset_to: Commit to reset the files to
+        chromium_src: Chromium source directory
+    """
+    if not file_paths:
+        return
+
+    existing = files_existing_in_commit(file_paths, reset_to, chromium_src)
+    to_reset = [p for p in file_paths if p in existing]
+    to_delete = [
+        p for p in file_paths if p not in existing and (chromium_src / p).exists()
+    ]
+
+    if to_reset:
+        log_info(f"  Resetting {len(to_reset)} files to {reset_to[:8]}")
+        if not reset_files_to_commit(to_reset, reset_to, chromium_src):
+            raise RuntimeError(f"Failed to reset files to {reset_to}")
+
+    if to_delete:
+        log_info(f"  Deleting {len(to_delete)} files not in {reset_to[:8]}")
+        for file_path in to_delete:
+            (chromium_src / file_path).unlink()
+
+
+def apply_patch_file(
+    patch_path: Path,
+    chromium_src: Path,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
+) -> Tuple[bool, Optional[str]]:
+    """Apply a patch file to the tree without logging.
+
+    This is the shared apply path for chromium_patches/ and series patches.
+    The selected strategy is tried first; git apply --3way is the final
+    fallback. Patches the in-process applier doesn't support (binary,
+    renames) go through git apply.
+
+    Args:
+        patch_path: Path to the patch file
+        chromium_src: Chromium source directory
+        strategy: "python" (in-process) or "git"
+
+    Returns:
+        Tuple of (success: bool, error_message: Optional[str])
+    """
+    if strategy not in APPLY_STRATEGIES:
+        raise ValueError(f"Unknown apply strategy: {strategy}")
+
+    with span(patch_path.name, "patch", patch=str(patch_path)) as s:
+        success, error, method = _apply_patch_file(patch_path, chromium_src, strategy)
+        s.set(applied=success, method=method)
+        return success, error
+
+
+def _apply_patch_file(
+    patch_path: Path, chromium_src: Path, strategy: str
+) -> Tuple[bool, Optional[str], str]:
+    """apply_patch_file, also returning how the patch was applied"""
+    error = None
+    use_git = strategy == "git"
+
+    if not use_git:
+        try:
+            apply_patch_path(patch_path, chromium_src)
+            return True, None, "python"
+        except UnsupportedPatchError:
+            use_git = True
+        except (PatchApplyError, OSError) as e:
+            error = str(e)
+
+    if use_git:
+        result = run_git_command(
+            ["git", "apply"] + GIT_APPLY_ARGS + [str(patch_path)], cwd=chromium_src
+        )
+        if result.returncode == 0:
+            return True, None, "git"
+        error = result.stderr
+
+    # Final fallback: 3-way merge
+    result = run_git_command(
+        ["git", "apply"] + GIT_APPLY_ARGS + ["--3way", str(patch_path)],
+        cwd=chromium_src,
+    )
+    if result.returncode == 0:
+        return True, None, "3way"
+    return False, result.stderr or error, "3way"
+
+
+def check_patch_file(
+    patch_path: Path, chromium_src: Path, strategy: str = DEFAULT_APPLY_STRATEGY
+) -> Tuple[bool, Optional[str]]:
+    """Check whether a patch applies, with the same engine and settings
+    apply_patch_file uses first (no --3way fallback).
+
+    Returns:
+        Tuple of (applies: bool, error_message: Optional[str])
+    """
+    if strategy not in APPLY_STRATEGIES:
+        raise ValueError(f"Unknown apply strategy: {strategy}")
+
+    if strategy == "python":
+        try:
+            apply_patch_path(patch_path, chromium_src, dry_run=True)
+            return True, None
+        except UnsupportedPatchError:
+            pass
+        except (PatchApplyError, OSError) as e:
+            return False, str(e)
+
+    result = run_git_command(
+        ["git", "apply", "--check"] + GIT_APPLY_ARGS + [str(patch_path)],
+        cwd=chromium_src,
+    )
+    if result.returncode == 0:
+        return True, None
+    return False, result.stderr
+
+
+def check_patch_text(
+    text: str, chromium_src: Path, strategy: str = DEFAULT_APPLY_STRATEGY
+) -> Tuple[bool, Optional[str]]:
+    """check_patch_file for patch content, e.g. several patches stacked in
+    apply order (later diffs of a file apply on top of the earlier ones).
+
+    Returns:
+        Tuple of (applies: bool, error_message: Optional[str])
+    """
+    if strategy not in APPLY_STRATEGIES:
+        raise ValueError(f"Unknown apply strategy: {strategy}")
+
+    if strategy == "python":
+        try:
+            apply_patch_text(text, chromium_src, dry_run=True)
+            return True, None
+        except UnsupportedPatchError:
+            pass
+        except (PatchApplyError, OSError) as e:
+            return False, str(e)
+
+    result = run_git_command(
+        ["git", "apply", "--check"] + GIT_APPLY_ARGS + ["-"],
+        cwd=chromium_src,
+        input=text,
+    )
+    if result.returncode == 0:
+        return True, None
+    return False, result.stderr
+
+
 def apply_single_patch(
     patch_path: Path,
     chromium_src: Path,
     dry_run: bool = False,
     relative_to: Optional[Path] = None,
     reset_to: Optional[str] = None,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
 ) -> Tuple[bool, Optional[str]]:
     """Apply a single patch file.
 
@@ -51,6 +250,7 @@ def apply_single_patch(
         dry_run: If True, only check if patch would apply
         relative_to: Base path for displaying relative paths (optional)
         reset_to: Commit to reset file to before applying (optional)
+        strategy: Apply strategy, "python" or "git" (see apply_patch_file)
 
     Returns:
         Tuple of (success: bool, error_message: Optional[str])
@@ -59,65 +259,27 @@ def apply_single_patch(
 
     # Reset file to base commit if requested
     if reset_to and not dry_run:
-        file_path = str(display_path)
-        if file_exists_in_commit(file_path, reset_to, chromium_src):
-            log_info(f"  Resetting to {reset_to[:8]}: {file_path}")
-            reset_file_to_commit(file_path, reset_to, chromium_src)
-        else:
-            # File doesn't exist in target commit - delete it so patch can create fresh
-            target_file = chromium_src / file_path
-            if target_file.exists():
-                log_info(f"  Deleting (not in {reset_to[:8]}): {file_path}")
-                target_file.unlink()
+        reset_patch_target(str(display_path), reset_to, chromium_src)
 
     if dry_run:
         # Just check if patch would apply
-        result = run_git_command(
-            ["git", "apply", "--check", "-p1", str(patch_path)], cwd=chromium_src
-        )
-        if result.returncode == 0:
+        success, error = check_patch_file(patch_path, chromium_src, strategy)
+        if success:
             log_success(f"  ✓ Would apply: {display_path}")
             return True, None
         else:
             log_error(f"  ✗ Would fail: {display_path}")
-            return False, result.stderr
+            return False, error
     else:
-        # Try standard apply first
-        result = run_git_command(
-            [
-                "git",
-                "apply",
-                "--ignore-whitespace",
-                "--whitespace=nowarn",
-                "-p1",
-                str(patch_path),
-            ],
-            cwd=chromium_src,
-        )
-
-        if result.returncode != 0:
-            # Try with 3-way merge
-            result = run_git_command(
-                [
-                    "git",
-                    "apply",
-                    "--ignore-whitespace",
-                    "--whitespace=nowarn",
-                    "-p1",
-                    "--3way",
-                    str(patch_path),
-                ],
-                cwd=chromium_src,
-            )
-
-        if result.returncode == 0:
+        success, error = apply_patch_file(patch_path, chromium_src, strategy)
+        if success:
             log_success(f"  ✓ Applied: {display_path}")
             return True, None
         else:
             log_error(f"  ✗ Failed: {display_path}")
-            if result.stderr:
-                log_error(f"    {result.stderr}")
-            return False, result.stderr
+            if error:
+                log_error(f"    {error}")
+            return False, error
 
 
 def create_patch_commit(
@@ -162,6 +324,7 @@ def process_patch_list(
     dry_run: bool = False,
     interactive: bool = False,
     reset_to: Optional[str] = None,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
 ) -> Tuple[int, List[str]]:
     """Process a list of patches.
 
@@ -172,6 +335,7 @@ def process_patch_list(
         dry_run: Only check if patches would apply
         interactive: Ask for confirmation before each patch
         reset_to: Commit to reset files to before applying (optional)
+        strategy: Apply strategy, "python" or "git"
 
     Returns:
         Tuple of (applied_count, failed_list)
@@ -182,6 +346,16 @@ def process_patch_list(
 
     total = len(patch_list)
 
+    # Outside interactive mode every patch is applied, so reset all targets
+    # up front instead of once per patch
+    if reset_to and not dry_run and not interactive:
+        reset_patch_targets(
+            [str(name) for path, name in patch_list if path.exists()],
+            reset_to,
+            chromium_src,
+        )
+        reset_to = None
+
     for i, (patch_path, display_name) in enumerate(patch_list, 1):
         if interactive and not dry_run:
             # Show patch info and ask for confirmation
@@ -215,7 +389,7 @@ def process_patch_list(
 
         # Apply the patch
         success, error = apply_single_patch(
-            patch_path, chromium_src, dry_run, patches_dir, reset_to
+            patch_path, chromium_src, dry_run, patches_dir, reset_to, strategy
         )
 
         if success:
@@ -0,0 +1,133 @@
+"""
+Manifest - Applied-state record for incremental patch application.
+
+For every applied patch the manifest records the target path, the patch's own
+hash, and the git blob SHAs of the target before and after applying. On the
+next run a patch is skipped when it is unchanged and its target still hashes
+to the recorded post-image, so re-applying onto an already patched tree only
+touches patches that changed.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ...common.context import Context
+from ...common.utils import log_info, log_warning, write_json_atomic
+
+MANIFEST_FILENAME = "applied_patches.json"
+MANIFEST_VERSION = 1
+
+
+def blob_sha(path: Path) -> Optional[str]:
+    """Compute the git blob SHA of a file (same as `git hash-object`).
+
+    Returns:
+        Hex SHA-1, or None if the file does not exist
+    """
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    header = f"blob {len(content)}\0".encode()
+    return hashlib.sha1(header + content).hexdigest()
+
+
+class ApplyManifest:
+    """Applied-state manifest keyed by patch display name"""
+
+    def __init__(self, path: Path, chromium_src: Path):
+        self.path = path
+        self.chromium_src = chromium_src
+        self.entries: Dict[str, Dict[str, Optional[str]]] = {}
+
+    @classmethod
+    def for_context(cls, ctx: Context) -> "ApplyManifest":
+        """Load the manifest for a build context"""
+        manifest = cls(ctx.get_state_dir() / MANIFEST_FILENAME, ctx.chromium_src)
+        manifest.load()
+        return manifest
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log_warning(f"Ignoring unreadable apply manifest {self.path}: {e}")
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.entries = data.get("patches", {})
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        data = {"version": MANIFEST_VERSION, "patches": self.entries}
+        try:
+            write_json_atomic(self.path, data, sort_keys=True)
+        except OSError as e:
+            log_warning(f"Could not save apply manifest {self.path}: {e}")
+
+    def is_applied(self, patch_path: Path, name: str) -> bool:
+        """Check if a patch is already applied to its target.
+
+        Args:
+            patch_path: Path to the patch file
+            name: Patch display name (the target path for chromium_patches/)
+        """
+        entry = self.entries.get(name)
+        if not entry or entry.get("patch") != blob_sha(patch_path):
+            return False
+        target = entry.get("target")
+        if not target:
+            return False
+        return blob_sha(self.chromium_src / target) == entry.get("post")
+
+    def record(
+        self, patch_path: Path, name: str, target: str, pre: Optional[str]
+    ) -> None:
+        """Record a successfully applied patch.
+
+        Args:
+            patch_path: Path to the patch file
+            name: Patch display name
+            target: Target path relative to chromium_src
+            pre: Blob SHA of the target before applying (None if absent)
+        """
+        self.entries[name] = {
+            "target": target,
+            "patch": blob_sha(patch_path),
+            "pre": pre,
+            "post": blob_sha(self.chromium_src / target),
+        }
+
+    def forget(self, name: str) -> None:
+        self.entries.pop(name, None)
+
+    def prune(self, names: List[str]) -> None:
+        """Drop entries for patches that no longer exist"""
+        keep = set(names)
+        self.entries = {k: v for k, v in self.entries.items() if k in keep}
+
+    def partition(
+        self, patch_list: List[Tuple[Path, str]]
+    ) -> Tuple[List[Tuple[Path, str]], List[Tuple[Path, str]]]:
+        """Split patches into (pending, already applied).
+
+        Returns:
+            Tuple of (patches to apply, patches to skip)
+        """
+        pending = []
+        skipped = []
+        for patch_path, name in patch_list:
+            if patch_path.exists() and self.is_applied(patch_path, str(name)):
+                skipped.append((patch_path, name))
+            else:
+                pending.append((patch_path, name))
+
+        if skipped:
+            log_info(
+                f"⏭️  {len(skipped)} patches already applied (manifest match), "
+                f"{len(pending)} to apply"
+            )
+        return pending, skipped
@@ -0,0 +1,477 @@
+"""
+Unidiff - In-process unified diff applier.
+
+Applies git-style unified diffs without spawning git. Hunks are parsed once,
+located with a bounded offset search (and optional fuzz, dropping outer
+context lines like GNU patch; off by default, as in git apply), and each
+target file is written atomically. Hunks that land at an offset or with fuzz
+are logged. New and deleted files are supported (new files get the umask's
+permissions, plus the exec bit for mode 100755); binary patches, renames,
+copies and mode changes raise UnsupportedPatchError so callers can fall back
+to git apply.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ...common.utils import log_info, write_bytes_atomic
+
+HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+DEV_NULL = "/dev/null"
+
+# Maximum number of outer context lines dropped from each end of a hunk
+# (0 = context must match exactly, like git apply)
+DEFAULT_FUZZ = 0
+
+# Maximum distance (in lines) a hunk is searched away from its expected
+# position, which follows the drift of the previous hunks
+DEFAULT_MAX_OFFSET = 1000
+
+
+class PatchApplyError(Exception):
+    """Patch does not apply to the current tree"""
+
+
+class UnsupportedPatchError(PatchApplyError):
+    """Patch uses features the in-process applier doesn't handle"""
+
+
+@dataclass
+class Hunk:
+    """A single @@ hunk"""
+
+    old_start: int
+    old_len: int
+    new_start: int
+    new_len: int
+    # (tag, text) pairs where tag is ' ', '-' or '+' and text keeps its EOL
+    lines: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class FileDiff:
+    """All hunks for one file in a patch"""
+
+    old_path: Optional[str] = None
+    new_path: Optional[str] = None
+    new_mode: Optional[str] = None
+    hunks: List[Hunk] = field(default_factory=list)
+    unsupported: Optional[str] = None
+
+    @property
+    def is_new(self) -> bool:
+        return self.old_path is None and self.new_path is not None
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.new_path is None and self.old_path is not None
+
+    @property
+    def path(self) -> str:
+        return self.new_path or self.old_path or ""
+
+
+def split_lines(text: str) -> List[str]:
+    """Split text into lines, keeping line endings.
+
+    Unlike str.splitlines, only "\n" ends a line: form feeds, \x1c-\x1e,
+    \x85 and \u2028/\u2029 are ordinary characters in source files.
+    """
+    lines = text.split("\n")
+    last = lines.pop()
+    result = [line + "\n" for line in lines]
+    if last:
+        result.append(last)
+    return result
+
+
+def _strip_path(raw: str, strip: int) -> Optional[str]:
+    """Strip leading components from a header path (like patch -p)"""
+    raw = raw.rstrip("\r\n").split("\t")[0].strip()
+    if raw.startswith('"') and raw.endswith('"'):
+        raw = raw[1:-1]
+    if raw == DEV_NULL:
+        return None
+    parts = raw.split("/")
+    return "/".join(parts[strip:]) if len(parts) > strip else parts[-1]
+
+
+def _strip_last_eol(hunk: Hunk) -> None:
+    """Handle "\\ No newline at end of file" for the preceding line"""
+    if hunk.lines:
+        tag, text = hunk.lines[-1]
+        hunk.lines[-1] = (tag, text.rstrip("\r\n"))
+
+
+def parse_patch(text: str, strip: int = 1) -> List[FileDiff]:
+    """Parse a unified diff into per-file hunks.
+
+    Args:
+        text: Patch content
+        strip: Leading path components to strip from header paths
+
+    Returns:
+        List of FileDiff in patch order
+
+    Raises:
+        PatchApplyError: If a hunk is truncated or malformed
+    """
+    lines = split_lines(text)
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    i = 0
+
+    while i < len(lines):
+        line = lines[i]
+
+        if line.startswith("diff --git "):
+            current = FileDiff()
+            files.append(current)
+            parts = line.rstrip("\r\n").split(" ")
+            if len(parts) >= 4:
+                current.old_path = _strip_path(parts[2], strip)
+                current.new_path = _strip_path(parts[3], strip)
+            i += 1
+            continue
+
+        if line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            # Plain unified diffs (e.g. quilt series) have no diff --git line
+            if current is None or current.hunks:
+                current = FileDiff()
+                files.append(current)
+            current.old_path = _strip_path(line[4:], strip)
+            current.new_path = _strip_path(lines[i + 1][4:], strip)
+            i += 2
+            continue
+
+        if current is not None:
+            if line.startswith("new file mode "):
+                current.new_mode = line.split()[-1]
+                current.old_path = None
+            elif line.startswith("new mode "):
+                current.unsupported = "mode change"
+            elif line.startswith("deleted file mode "):
+                current.new_path = None
+            elif line.startswith(("rename from ", "copy from ")):
+                current.unsupported = "rename/copy"
+            elif line.startswith(("GIT binary patch", "Binary files ")):
+                current.unsupported = "binary"
+
+        match = HUNK_HEADER_RE.match(line)
+        if match and current is not None:
+            hunk = Hunk(
+                old_start=int(match.group(1)),
+                old_len=int(match.group(2) or 1),
+                new_start=int(match.group(3)),
+                new_len=int(match.group(4) or 1),
+            )
+            old_left, new_left = hunk.old_len, hunk.new_len
+            i += 1
+            while i < len(lines) and (old_left > 0 or new_left > 0):
+                body = lines[i]
+                tag = body[:1]
+                if tag == "\\":
+                    _strip_last_eol(hunk)
+                    i += 1
+                    continue
+                if body in ("\n", "\r\n"):
+                    # Context line whose trailing space was stripped
+                    tag, body = " ", " " + body
+                if tag == " ":
+                    old_left -= 1
+                    new_left -= 1
+                elif tag == "-":
+                    old_left -= 1
+                elif tag == "+":
+                    new_left -= 1
+                else:
+                    break
+                hunk.lines.append((tag, body[1:]))
+                i += 1
+
+            if old_left != 0 or new_left != 0:
+                raise PatchApplyError(f"Truncated hunk in {current.path}")
+
+            # "\ No newline at end of file" applies to the line before it
+            if i < len(lines) and lines[i].startswith("\\"):
+                _strip_last_eol(hunk)
+                i += 1
+            current.hunks.append(hunk)
+            continue
+
+        i += 1
+
+    return files
+
+
+def _normalize(line: str, ignore_whitespace: bool) -> str:
+    if ignore_whitespace:
+        return " ".join(line.split())
+    return line.rstrip("\r\n")
+
+
+def _matches(
+    lines: List[str], pos: int, expected: List[str], ignore_whitespace: bool
+) -> bool:
+    if pos < 0 or pos + len(expected) > len(lines):
+        return False
+    for offset, want in enumerate(expected):
+        if _normalize(lines[pos + offset], ignore_whitespace) != want:
+            return False
+    return True
+
+
+def _trim_context(
+    hunk_lines: List[Tuple[str, str]], fuzz: int
+) -> Optional[Tuple[List[Tuple[str, str]], int]]:
+    """Drop up to `fuzz` context lines from each end of a hunk.
+
+    Returns:
+        (trimmed lines, number of leading lines dropped), or None if the hunk
+        doesn't have that much outer context
+    """
+    if fuzz == 0:
+        return hunk_lines, 0
+    lead = 0
+    while lead < fuzz and lead < len(hunk_lines) and hunk_lines[lead][0] == " ":
+        lead += 1
+    trail = 0
+    while (
+        trail < fuzz
+        and trail < len(hunk_lines) - lead
+        and hunk_lines[-1 - trail][0] == " "
+    ):
+        trail += 1
+    if lead < fuzz and trail < fuzz:
+        return None
+    return hunk_lines[lead : len(hunk_lines) - trail], lead
+
+
+def _find_hunk(
+    lines: List[str],
+    expected: List[str],
+    start: int,
+    min_pos: int,
+    ignore_whitespace: bool,
+    max_offset: int = DEFAULT_MAX_OFFSET,
+) -> Optional[int]:
+    """Find expected lines closest to `start`, never before `min_pos` and
+    at most `max_offset` lines away"""
+    last = len(lines) - len(expected)
+    low = max(min_pos, start - max_offset)
+    high = min(last, start + max_offset)
+    start = max(low, min(start, high))
+    for distance in range(0, max(start - low, high - start) + 1):
+        for pos in (start - distance, start + distance):
+            if low <= pos <= high and _matches(
+                lines, pos, expected, ignore_whitespace
+            ):
+                return pos
+            if distance == 0:
+                break
+    return None
+
+
+def apply_hunks(
+    lines: List[str],
+    hunks: List[Hunk],
+    fuzz: int = DEFAULT_FUZZ,
+    ignore_whitespace: bool = True,
+    name: str = "",
+    max_offset: int = DEFAULT_MAX_OFFSET,
+) -> List[str]:
+    """Apply hunks to a file's lines.
+
+    Args:
+        lines: Original file lines (with line endings)
+        hunks: Hunks in file order
+        fuzz: Maximum outer context lines that may be ignored per hunk end
+        ignore_whitespace: Compare lines ignoring whitespace differences
+        name: File name used in messages
+        max_offset: Maximum lines a hunk may be found away from its
+            expected position
+
+    Returns:
+        New file lines
+
+    Raises:
+        PatchApplyError: If a hunk can't be located
+    """
+    result: List[str] = []
+    cursor = 0  # Next unconsumed line of the original
+    offset = 0  # Drift between header line numbers and actual positions
+
+    for number, hunk in enumerate(hunks, 1):
+        located = None
+        for level in range(0, fuzz + 1):
+            trimmed = _trim_context(hunk.lines, level)
+            if trimmed is None:
+                continue
+            hunk_lines, lead = trimmed
+            if level and not any(tag != "+" for tag, _ in hunk_lines):
+                # Nothing left to anchor the hunk on
+                continue
+            expected = [
+                _normalize(text, ignore_whitespace)
+                for tag, text in hunk_lines
+                if tag != "+"
+            ]
+            start = hunk.old_start - 1 + lead + offset
+            if hunk.old_len == 0:
+                start += 1
+            pos = _find_hunk(
+                lines, expected, start, cursor, ignore_whitespace, max_offset
+            )
+            if pos is not None:
+                located = (pos, hunk_lines, lead, level)
+                break
+
+        if located is None:
+            raise PatchApplyError(
+                f"Hunk #{number} (@@ -{hunk.old_start},{hunk.old_len} @@) "
+                f"does not apply to {name}"
+            )
+
+        pos, hunk_lines, lead, level = located
+        offset = pos - (hunk.old_start - 1 + lead) - (1 if hunk.old_len == 0 else 0)
+        if offset or level:
+            detail = f"offset {offset:+d} line(s)"
+            if level:
+                detail += f", fuzz {level}"
+            log_info(
+                f"    {name}: hunk #{number} applied at line {pos + 1} ({detail})"
+            )
+        result.extend(lines[cursor:pos])
+        cursor = pos
+        for tag, text in hunk_lines:
+            if tag == " ":
+                # Keep the file's own context line (whitespace may differ)
+                result.append(lines[cursor])
+                cursor += 1
+            elif tag == "-":
+                cursor += 1
+            else:
+                result.append(text)
+
+    result.extend(lines[cursor:])
+    return result
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="surrogateescape")
+
+
+def _make_executable(path: Path) -> None:
+    """Add execute permission wherever read permission is set (like git)"""
+    mode = path.stat().st_mode & 0o7777
+    os.chmod(path, mode | (mode & 0o444) >> 2)
+
+
+def apply_patch_text(
+    text: str,
+    root: Path,
+    strip: int = 1,
+    fuzz: int = DEFAULT_FUZZ,
+    ignore_whitespace: bool = True,
+    dry_run: bool = False,
+    max_offset: int = DEFAULT_MAX_OFFSET,
+) -> List[str]:
+    """Apply a unified diff to files under `root`.
+
+    Every file is computed before anything is written, so a patch that fails
+    to apply leaves the tree untouched.
+
+    Args:
+        text: Patch content
+        root: Directory the patch paths are relative to
+        strip: Leading path components to strip (like -p)
+        fuzz: Maximum outer context lines ignored per hunk end
+        ignore_whitespace: Compare lines ignoring whitespace differences
+        dry_run: Only check that the patch applies
+        max_offset: Maximum lines a hunk may be found away from its
+            expected position
+
+    Returns:
+        List of touched paths relative to root
+
+    Raises:
+        UnsupportedPatchError: For binary, rename, copy or mode change patches
+        PatchApplyError: If the patch doesn't apply
+    """
+    diffs = parse_patch(text, strip)
+    if not diffs:
+        raise PatchApplyError("No file changes found in patch")
+
+    # Pending state per target: path -> (new content or None to delete,
+    # whether a new file is executable). Existing files keep their mode.
+    # A file may appear more than once (stacked per-commit patches); later
+    # diffs apply on top of the pending content.
+    writes: Dict[Path, Tuple[Optional[str], bool]] = {}
+
+    def current(target: Path) -> Optional[Tuple[str, bool]]:
+        if target in writes:
+            content, executable = writes[target]
+            return None if content is None else (content, executable)
+        if not target.exists():
+            return None
+        return _decode(target.read_bytes()), False
+
+    for diff in diffs:
+        if diff.unsupported:
+            raise UnsupportedPatchError(f"{diff.unsupported} patch: {diff.path}")
+        if not diff.hunks and not (diff.is_new or diff.is_deleted):
+            raise UnsupportedPatchError(f"mode-only change: {diff.path}")
+        if diff.old_path and diff.new_path and diff.old_path != diff.new_path:
+            raise UnsupportedPatchError(f"rename patch: {diff.path}")
+
+        target = root / diff.path
+        state = current(target)
+
+        if diff.is_new:
+            if state is not None:
+                raise PatchApplyError(f"{diff.path}: already exists")
+            content = "".join(text for _, text in diff.hunks[0].lines) if diff.hunks else ""
+            writes[target] = (content, diff.new_mode == "100755")
+            continue
+
+        if state is None:
+            raise PatchApplyError(f"{diff.path}: No such file")
+        original, executable = state
+        patched = apply_hunks(
+            split_lines(original),
+            diff.hunks,
+            fuzz,
+            ignore_whitespace,
+            name=diff.path,
+            max_offset=max_offset,
+        )
+
+        if diff.is_deleted:
+            if patched and any(line.strip() for line in patched):
+                raise PatchApplyError(f"{diff.path}: deleted file still has content")
+            writes[target] = (None, False)
+        else:
+            writes[target] = ("".join(patched), executable)
+
+    if not dry_run:
+        for target, (content, executable) in writes.items():
+            if content is None:
+                if target.exists():
+                    target.unlink()
+                continue
+            write_bytes_atomic(
+                target, content.encode("utf-8", errors="surrogateescape")
+            )
+            if executable:
+                _make_executable(target)
+
+    return [str(target.relative_to(root)) for target in writes]
+
+
+def apply_patch_path(patch_path: Path, root: Path, **kwargs) -> List[str]:
+    """Apply a patch file to files under `root` (see apply_patch_text)"""
+    return apply_patch_text(_decode(patch_path.read_bytes()), root, **kwargs)
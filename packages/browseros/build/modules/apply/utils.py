@@ -5,14 +5,21 @@ This module provides robust utilities for git operations, diff parsing,
 and patch management with comprehensive error handling.
 """
 
-import subprocess
 import click
 import re
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from ...common.context import Context
+from ...common.git import (  # noqa: F401 - re-exported
+    GitError,
+    run_git_command,
+    file_exists_in_commit,
+    get_object_store,
+    resolve_commit,
+    read_commit_info,
+)
 from ...common.utils import log_error, log_success, log_warning
 
 
@@ -39,89 +46,6 @@ class FilePatch:
     similarity: Optional[int] = None  # For renames (percentage)
 
 
-class GitError(Exception):
-    """Custom exception for git operations"""
-
-    pass
-
-
-def run_git_command(
-    cmd: List[str],
-    cwd: Path,
-    capture: bool = True,
-    check: bool = False,
-    timeout: Optional[int] = None,
-    binary_output: bool = False,
-) -> subprocess.CompletedProcess:
-    """Run a git command and return the result
-
-    Args:
-        cmd: Command to run
-        cwd: Working directory
-        capture: Whether to capture output
-        check: Whether to raise on non-zero return
-        timeout: Command timeout in seconds
-        binary_output: If True, handle binary output (don't decode as text)
-
-    Returns:
-        CompletedProcess result
-
-    Raises:
-        GitError: If command fails and check=True
-    """
-    try:
-        # For commands that might output binary data (like git diff with binary files),
-        # we need to handle them specially
-        if binary_output or ("diff" in cmd and "--binary" not in cmd):
-            # First try with text mode
-            try:
-                result = subprocess.run(
-                    cmd,
-                    cwd=cwd,
-                    capture_output=capture,
-                    text=True,
-                    check=False,
-                    timeout=timeout or 60,
-                    errors="replace",  # Replace invalid UTF-8 sequences
-                )
-            except UnicodeDecodeError:
-                # Fall back to binary mode
-                result = subprocess.run(
-                    cmd,
-                    cwd=cwd,
-                    capture_output=capture,
-                    text=False,
-                    check=False,
-                    timeout=timeout or 60,
-                )
-                # Convert to text with error handling
-                if result.stdout:
-                    result.stdout = result.stdout.decode("utf-8", errors="replace")
-                if result.stderr:
-                    result.stderr = result.stderr.decode("utf-8", errors="replace")
-        else:
-            result = subprocess.run(
-                cmd,
-                cwd=cwd,
-                capture_output=capture,
-                text=True,
-                check=False,
-                timeout=timeout or 60,
-            )
-
-        if check and result.returncode != 0:
-            error_msg = result.stderr or result.stdout or "Unknown error"
-            raise GitError(f"Git command failed: {' '.join(cmd)}\nError: {error_msg}")
-
-        return result
-    except subprocess.TimeoutExpired:
-        log_error(f"Git command timed out after {timeout} seconds: {' '.join(cmd)}")
-        raise GitError(f"Command timed out: {' '.join(cmd)}")
-    except Exception as e:
-        log_error(f"Failed to run git command: {' '.join(cmd)}")
-        raise GitError(f"Command failed: {e}")
-
-
 def validate_git_repository(path: Path) -> bool:
     """Validate that a path is a git repository"""
     try:
@@ -136,35 +60,70 @@ def validate_git_repository(path: Path) -> bool:
 def validate_commit_exists(commit_hash: str, chromium_src: Path) -> bool:
     """Validate that a commit exists in the repository"""
     try:
-        result = run_git_command(
-            ["git", "rev-parse", "--verify", f"{commit_hash}^{{commit}}"],
-            cwd=chromium_src,
-        )
-
-        if result.returncode != 0:
+        if resolve_commit(commit_hash, chromium_src) is None:
             log_error(f"Commit '{commit_hash}' not found in repository")
             return False
         return True
-    except GitError as e:
+    except (OSError, ValueError) as e:
         log_error(f"Failed to validate commit: {e}")
         return False
 
 
-def file_exists_in_commit(file_path: str, commit: str, chromium_src: Path) -> bool:
-    """Check if file exists in a commit."""
+def reset_file_to_commit(file_path: str, commit: str, chromium_src: Path) -> bool:
+    """Reset a single file to a specific commit state."""
     result = run_git_command(
-        ["git", "cat-file", "-e", f"{commit}:{file_path}"],
+        ["git", "checkout", commit, "--", file_path],
         cwd=chromium_src,
     )
     return result.returncode == 0
 
 
-def reset_file_to_commit(file_path: str, commit: str, chromium_src: Path) -> bool:
-    """Reset a single file to a specific commit state."""
+def files_existing_in_commit(
+    file_paths: List[str], commit: str, chromium_src: Path
+) -> Set[str]:
+    """Check which files exist in a commit over the shared cat-file process.
+
+    Args:
+        file_paths: File paths relative to the repository root
+        commit: Commit to look the files up in
+        chromium_src: Chromium source directory
+
+    Returns:
+        Set of the given paths that exist in the commit
+    """
+    if not file_paths:
+        return set()
+
+    store = get_object_store(chromium_src)
+    return {path for path in file_paths if store.exists(f"{commit}:{path}")}
+
+
+def reset_files_to_commit(
+    file_paths: List[str], commit: str, chromium_src: Path
+) -> bool:
+    """Reset many files to a commit state with one checkout.
+
+    Paths are passed literally through --pathspec-from-file, so the command
+    line stays short however many files are reset.
+    """
+    if not file_paths:
+        return True
+
     result = run_git_command(
-        ["git", "checkout", commit, "--", file_path],
+        [
+            "git",
+            "--literal-pathspecs",
+            "checkout",
+            commit,
+            "--pathspec-from-file=-",
+            "--pathspec-file-nul",
+        ],
         cwd=chromium_src,
+        input="".join(f"{path}\0" for path in file_paths),
+        timeout=600,
     )
+    if result.returncode != 0:
+        log_error(f"Failed to reset files to {commit}: {result.stderr.strip()}")
     return result.returncode == 0
 
 
@@ -324,6 +283,53 @@ def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
     return patches
 
 
+def get_patch_targets(patch_path: Path, strip: int = 1) -> List[str]:
+    """Get the file paths a patch touches, in order of appearance.
+
+    Reads the ---/+++ header pairs (and diff --git lines for header-only
+    diffs such as pure renames), stripping `strip` leading path components
+    like git apply -p does.
+
+    Args:
+        patch_path: Path to the patch file
+        strip: Number of leading path components to remove
+
+    Returns:
+        List of target paths (deduplicated, order preserved)
+    """
+
+    def _strip(path: str) -> str:
+        path = path.split("\t")[0].strip()
+        parts = path.split("/")
+        return "/".join(parts[strip:]) if len(parts) > strip else path
+
+    targets: List[str] = []
+    old_path: Optional[str] = None
+
+    try:
+        content = patch_path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+
+    for line in content.splitlines():
+        if line.startswith("diff --git "):
+            match = re.match(r"diff --git a/(.*) b/(.*)", line)
+            if match:
+                targets.append(match.group(2))
+            old_path = None
+        elif line.startswith("--- "):
+            old_path = line[4:]
+        elif line.startswith("+++ ") and old_path is not None:
+            new_path = line[4:]
+            if new_path.startswith("/dev/null"):
+                targets.append(_strip(old_path))
+            else:
+                targets.append(_strip(new_path))
+            old_path = None
+
+    return list(dict.fromkeys(targets))
+
+
 def write_patch_file(ctx: Context, file_path: str, patch_content: str) -> bool:
     """
     Write a patch file to chromium_src directory structure.
@@ -419,10 +425,8 @@ def apply_single_patch(
     Apply a single patch file to chromium source with multiple strategies.
 
     Tries in order:
-    1. Standard git apply
-    2. Three-way merge
-    3. Patch command fallback
-    4. Interactive conflict resolution
+    1. Shared apply path (in-process apply, then git apply --3way)
+    2. Interactive conflict resolution
 
     Returns:
         Tuple of (success, message)
@@ -448,33 +452,17 @@ def apply_single_patch(
     if patch_path.suffix == ".binary":
         return False, f"Binary file patch not supported: {patch_path.name}"
 
-    # Try standard apply
-    result = run_git_command(["git", "apply", "-p1", str(patch_path)], cwd=chromium_src)
+    from .common import apply_patch_file
 
-    if result.returncode == 0:
+    success, error = apply_patch_file(patch_path, chromium_src)
+    if success:
         return True, f"Applied: {patch_path.name}"
 
-    # Try 3-way merge
-    result = run_git_command(
-        ["git", "apply", "-p1", "--3way", str(patch_path)], cwd=chromium_src
-    )
-
-    if result.returncode == 0:
-        return True, f"Applied (3-way): {patch_path.name}"
-
-    # Try with whitespace options
-    result = run_git_command(
-        ["git", "apply", "-p1", "--whitespace=fix", str(patch_path)], cwd=chromium_src
-    )
-
-    if result.returncode == 0:
-        return True, f"Applied (whitespace fixed): {patch_path.name}"
-
     # Handle conflict
     if interactive:
-        return handle_patch_conflict(patch_path, chromium_src, result.stderr)
+        return handle_patch_conflict(patch_path, chromium_src, error or "")
     else:
-        return False, f"Failed: {patch_path.name} - {result.stderr}"
+        return False, f"Failed: {patch_path.name} - {error}"
 
 
 def handle_patch_conflict(
@@ -569,33 +557,8 @@ def create_git_commit(chromium_src: Path, message: str) -> bool:
 def get_commit_info(commit_hash: str, chromium_src: Path) -> Optional[Dict[str, str]]:
     """Get detailed information about a commit"""
     try:
-        # Get commit info in a structured format
-        result = run_git_command(
-            [
-                "git",
-                "show",
-                "--format=%H%n%an%n%ae%n%at%n%s%n%b",
-                "--no-patch",
-                commit_hash,
-            ],
-            cwd=chromium_src,
-        )
-
-        if result.returncode != 0:
-            return None
-
-        lines = result.stdout.strip().split("\n")
-        if len(lines) >= 5:
-            return {
-                "hash": lines[0],
-                "author_name": lines[1],
-                "author_email": lines[2],
-                "timestamp": lines[3],
-                "subject": lines[4],
-                "body": "\n".join(lines[5:]) if len(lines) > 5 else "",
-            }
-        return None
-    except GitError:
+        return read_commit_info(commit_hash, chromium_src)
+    except OSError:
         return None
 
 
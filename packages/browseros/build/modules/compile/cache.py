@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Cache - Local compiler cache (ccache / sccache) support
+
+Enabled from the `cache:` entry of the build config's `compile:` section
+(per-host overrides apply, see scheduler.py):
+
+    compile:
+      cache:
+        tool: ccache                  # ccache, sccache or none
+        dir: ~/.cache/browseros/ccache
+        max_size: 50G
+
+configure adds `cc_wrapper` to args.gn. compile runs autoninja with the
+cache's environment, snapshots the cache statistics before and after the
+build, trims the cache to its size limit, and reports the hit rate and an
+estimate of the compile time saved in the pipeline summary.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ...common.context import Context
+from ...common.utils import log_info, log_warning
+from .profile import NinjaStep
+from .scheduler import host_compile_config
+
+CACHE_TOOLS = ("ccache", "sccache")
+DEFAULT_MAX_SIZE = "50G"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def __sub__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            max(0, self.hits - other.hits), max(0, self.misses - other.misses)
+        )
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+
+@dataclass
+class CompilerCache:
+    tool: str
+    directory: Path
+    max_size: str
+    chromium_src: Path
+
+    @property
+    def executable(self) -> str:
+        return shutil.which(self.tool) or self.tool
+
+    def env(self) -> Dict[str, str]:
+        """Environment for the build (and for stats/cleanup commands)"""
+        env = dict(os.environ)
+        if self.tool == "ccache":
+            env.update(
+                {
+                    "CCACHE_DIR": str(self.directory),
+                    "CCACHE_MAXSIZE": self.max_size,
+                    # Hits across checkouts: hash paths relative to the source
+                    "CCACHE_BASEDIR": str(self.chromium_src),
+                    "CCACHE_CPP2": "yes",
+                    "CCACHE_SLOPPINESS": "time_macros,include_file_mtime,include_file_ctime",
+                }
+            )
+        else:
+            env.update(
+                {
+                    "SCCACHE_DIR": str(self.directory),
+                    "SCCACHE_CACHE_SIZE": self.max_size,
+                }
+            )
+        return env
+
+    def _run(self, args: List[str]) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                [self.executable, *args],
+                env=self.env(),
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log_warning(f"{self.tool} {' '.join(args)} failed: {e}")
+            return None
+        if result.returncode != 0:
+            log_warning(f"{self.tool} {' '.join(args)} failed: {result.stderr.strip()}")
+            return None
+        return result.stdout
+
+    def prepare(self) -> None:
+        """Create the cache directory and start sccache's server"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.tool == "ccache":
+            self._run(["--max-size", self.max_size])
+        else:
+            # The server reads SCCACHE_DIR/SIZE only when it starts
+            self._run(["--stop-server"])
+            self._run(["--start-server"])
+
+    def stats(self) -> Optional[CacheStats]:
+        """Cumulative hit/miss counters"""
+        if self.tool == "ccache":
+            output = self._run(["--print-stats"])
+            if output is None:
+                return None
+            counters = {}
+            for line in output.splitlines():
+                name, _, value = line.partition("\t")
+                if value.strip().isdigit():
+                    counters[name] = int(value)
+            return CacheStats(
+                counters.get("direct_cache_hit", 0)
+                + counters.get("preprocessed_cache_hit", 0),
+                counters.get("cache_miss", 0),
+            )
+
+        output = self._run(["--show-stats", "--stats-format=json"])
+        if output is None:
+            return None
+        try:
+            stats = json.loads(output).get("stats", {})
+        except ValueError:
+            return None
+        return CacheStats(
+            sum(stats.get("cache_hits", {}).get("counts", {}).values()),
+            sum(stats.get("cache_misses", {}).get("counts", {}).values()),
+        )
+
+    def evict(self) -> None:
+        """Trim the cache to its size limit"""
+        if self.tool == "ccache":
+            self._run(["--cleanup"])
+        # sccache evicts least recently used entries as it writes
+
+
+def compiler_cache_from_config(ctx: Context) -> Optional[CompilerCache]:
+    """The configured compiler cache, if enabled and installed"""
+    config = host_compile_config(ctx).get("cache") or {}
+    if isinstance(config, str):
+        config = {"tool": config}
+    tool = config.get("tool", "none")
+    if not tool or tool == "none":
+        return None
+    if tool not in CACHE_TOOLS:
+        log_warning(f"Unknown compile.cache.tool: {tool!r} (expected ccache or sccache)")
+        return None
+    if shutil.which(tool) is None:
+        log_warning(f"{tool} not found on PATH - building without a compiler cache")
+        return None
+
+    directory = config.get("dir") or f"~/.cache/browseros/{tool}"
+    return CompilerCache(
+        tool=tool,
+        directory=Path(os.path.expanduser(str(directory))),
+        max_size=str(config.get("max_size", DEFAULT_MAX_SIZE)),
+        chromium_src=ctx.chromium_src,
+    )
+
+
+def estimate_time_saved(stats: CacheStats, steps: List[NinjaStep]) -> Optional[float]:
+    """Rough compile CPU seconds saved by cache hits.
+
+    Assumes the fastest compile steps of the build were the hits: saved
+    time is hits x (mean miss duration - mean hit duration).
+    """
+    if not stats.hits:
+        return None
+    durations = sorted(s.duration_ms for s in steps if s.kind == "compile")
+    if not durations:
+        return None
+    hits = min(stats.hits, len(durations))
+    hit_times, miss_times = durations[:hits], durations[hits:]
+    if not miss_times:
+        return None
+    mean_hit = sum(hit_times) / len(hit_times)
+    mean_miss = sum(miss_times) / len(miss_times)
+    return max(0.0, stats.hits * (mean_miss - mean_hit) / 1000)
+
+
+def format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {secs}s"
+    return f"{secs}s"
+
+
+def report_cache_usage(
+    ctx: Context,
+    cache: CompilerCache,
+    before: Optional[CacheStats],
+    after: Optional[CacheStats],
+    steps: List[NinjaStep],
+) -> None:
+    """Log this build's cache usage and add it to the pipeline summary"""
+    if before is None or after is None:
+        return
+    delta = after - before
+    if not delta.requests:
+        log_info(f"{cache.tool}: no cacheable compiles")
+        return
+
+    text = f"{delta.hit_rate:.1%} hits ({delta.hits}/{delta.requests})"
+    saved = estimate_time_saved(delta, steps)
+    if saved is not None:
+        text += f", ~{format_duration(saved)} CPU saved"
+    log_info(f"{cache.tool}: {text}")
+    ctx.summary[f"Compiler cache ({ctx.architecture})"] = f"{cache.tool} {text}"
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Prepare - No-op aware compile preparation
+
+Generated build inputs (chrome/VERSION, chrome/BROWSEROS_VERSION, ...) are
+written only when their content differs from what's already in the Chromium
+tree. Rewriting identical content still bumps the mtime, and with a header
+like chrome/VERSION that makes ninja rebuild and relink a large part of the
+browser.
+
+After the inputs are in place, `ninja -n` predicts how many edges the real
+build will run so the log shows whether a compile is a no-op, an
+incremental build or a full rebuild before it starts.
+"""
+
+import re
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from ...common.context import Context
+from ...common.utils import (
+    log_info,
+    log_warning,
+    join_paths,
+    write_text_if_changed,
+    IS_WINDOWS,
+)
+
+# "[12/3456] CXX obj/..." progress lines of a dry run
+_PROGRESS = re.compile(r"^\[(\d+)/(\d+)\]")
+
+
+@dataclass
+class GeneratedInput:
+    """A file in the Chromium tree whose content the build system generates"""
+
+    path: Path
+    content: str
+    description: str
+
+
+def generated_inputs(ctx: Context) -> List[GeneratedInput]:
+    """Files to generate before compiling, with their expected content"""
+    inputs = []
+
+    parts = ctx.browseros_chromium_version.split(".")
+    if len(parts) == 4:
+        inputs.append(
+            GeneratedInput(
+                join_paths(ctx.chromium_src, "chrome", "VERSION"),
+                f"MAJOR={parts[0]}\nMINOR={parts[1]}\nBUILD={parts[2]}\nPATCH={parts[3]}",
+                f"VERSION {ctx.browseros_chromium_version}",
+            )
+        )
+    else:
+        log_warning(f"Invalid version format: {ctx.browseros_chromium_version}")
+
+    browseros_version = join_paths(ctx.root_dir, "resources", "BROWSEROS_VERSION")
+    if browseros_version.exists():
+        inputs.append(
+            GeneratedInput(
+                join_paths(ctx.chromium_src, "chrome", "BROWSEROS_VERSION"),
+                browseros_version.read_text(),
+                "BROWSEROS_VERSION",
+            )
+        )
+
+    return inputs
+
+
+def write_generated_inputs(ctx: Context) -> List[GeneratedInput]:
+    """Write generated inputs whose content changed.
+
+    Returns:
+        Inputs that were (re)written
+    """
+    written = []
+    for generated in generated_inputs(ctx):
+        if write_text_if_changed(generated.path, generated.content):
+            log_info(f"Updated {generated.description}")
+            written.append(generated)
+        else:
+            log_info(f"{generated.description} unchanged")
+    return written
+
+
+def predict_ninja_work(ctx: Context, targets: List[str]) -> Optional[int]:
+    """Count the edges ninja would run for targets, using a dry run.
+
+    Returns:
+        Number of edges to run (0 for a no-op build), or None if the dry run
+        failed
+    """
+    ninja_cmd = "ninja.bat" if IS_WINDOWS() else "ninja"
+    try:
+        result = subprocess.run(
+            [ninja_cmd, "-C", ctx.out_dir, "-n", *targets],
+            cwd=ctx.chromium_src,
+            capture_output=True,
+            text=True,
+        )
+    except OSError as e:
+        log_warning(f"Could not run ninja dry run: {e}")
+        return None
+    if result.returncode != 0:
+        log_warning(f"ninja dry run failed: {result.stdout.strip()[-500:]}")
+        return None
+
+    total = 0
+    for line in result.stdout.splitlines():
+        match = _PROGRESS.match(line)
+        if match:
+            total = int(match.group(2))
+    return total
+
+
+def log_predicted_work(ctx: Context, targets: List[str]) -> Optional[int]:
+    """Run the dry run and log what the real build is expected to do"""
+    edges = predict_ninja_work(ctx, targets)
+    if edges is None:
+        return None
+    if edges == 0:
+        log_info("ninja: no work to do")
+    else:
+        log_info(f"ninja will run {edges} build steps")
+    return edges
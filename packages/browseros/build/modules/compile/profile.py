@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Profile - Build timing reports from .ninja_log
+
+Reads the entries ninja appended to <out_dir>/.ninja_log since the last
+profile (the read offset is kept in the build state dir) and keeps those of
+the latest build. From them it derives:
+
+- an estimated critical path: starting from the step that finished last,
+  repeatedly pick the step that finished last before the current one
+  started (the log has no dependency edges, so this is the chain of steps
+  that kept the build from finishing earlier)
+- the slowest compile and link steps
+- CPU time per source directory
+- parallelism over time
+
+The report is written as JSON and as a Chrome trace (chrome://tracing,
+Perfetto) next to the log. Object files that come from sources we patch
+(chromium_patches/) are flagged, so expensive-to-rebuild patches stand out.
+Chromium's toolchains put objects at obj/<target dir>/<target name>/<stem>.o
+(object_subdir = {{target_out_dir}}/{{label_name}}), so an object is matched
+to the patched source with its stem under the target's directory.
+"""
+
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Set, Tuple
+
+from ...common.context import Context
+from ...common.utils import log_info, log_warning, join_paths, write_json_atomic
+
+NINJA_LOG = ".ninja_log"
+OFFSETS_FILENAME = "ninja_log_offsets.json"
+REPORT_FILENAME = "browseros_build_profile.json"
+TRACE_FILENAME = "browseros_build_profile.trace.json"
+
+COMPILE_SUFFIXES = {".o", ".obj"}
+LINK_SUFFIXES = {"", ".so", ".dylib", ".dll", ".exe", ".lib", ".a"}
+SOURCE_SUFFIXES = {".c", ".cc", ".cpp", ".m", ".mm", ".h"}
+
+# Per-directory CPU time groups target directories by this many components
+DIRECTORY_DEPTH = 3
+UTILIZATION_BUCKETS = 60
+TOP_STEPS = 10
+
+
+@dataclass
+class NinjaStep:
+    """One build edge (multi-output edges are merged)"""
+
+    start_ms: int
+    end_ms: int
+    outputs: List[str]
+    cmdhash: str
+
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self.start_ms
+
+    @property
+    def name(self) -> str:
+        return self.outputs[0]
+
+    @property
+    def kind(self) -> str:
+        suffix = PurePosixPath(self.name).suffix
+        if suffix in COMPILE_SUFFIXES:
+            return "compile"
+        if suffix in LINK_SUFFIXES:
+            return "link"
+        return "other"
+
+    @property
+    def target_dir(self) -> Optional[str]:
+        """Directory of the GN target that compiled an object file.
+
+        The source is in this directory or one of its subdirectories.
+        """
+        path = PurePosixPath(self.name)
+        if (
+            path.suffix not in COMPILE_SUFFIXES
+            or path.parts[:1] != ("obj",)
+            or len(path.parts) < 3
+        ):
+            return None
+        return "/".join(path.parts[1:-2])
+
+
+def parse_ninja_log(text: str) -> List[NinjaStep]:
+    """Parse .ninja_log v5 lines into steps, in log order"""
+    steps: List[NinjaStep] = []
+    by_key: Dict[Tuple[int, int, str], NinjaStep] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        if len(fields) < 5:
+            continue
+        try:
+            start_ms, end_ms = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue
+        output, cmdhash = fields[3], fields[4]
+        key = (start_ms, end_ms, cmdhash)
+        step = by_key.get(key)
+        if step is not None:
+            step.outputs.append(output)
+            continue
+        step = by_key[key] = NinjaStep(start_ms, end_ms, [output], cmdhash)
+        steps.append(step)
+    return steps
+
+
+def latest_build(steps: List[NinjaStep]) -> List[NinjaStep]:
+    """Steps of the last build in the log.
+
+    Times are relative to each build's start and entries are appended as
+    steps finish, so a new build shows up as end times dropping back.
+    """
+    first = 0
+    for i in range(1, len(steps)):
+        if steps[i].end_ms < steps[i - 1].end_ms:
+            first = i
+    return steps[first:]
+
+
+class NinjaLogReader:
+    """Incremental .ninja_log reader; offsets live in the build state dir"""
+
+    def __init__(self, ctx: Context):
+        self.log_path = join_paths(ctx.chromium_src, ctx.out_dir, NINJA_LOG)
+        self.offsets_path = ctx.get_state_dir() / OFFSETS_FILENAME
+        self.key = str(ctx.out_dir)
+
+    def _load_offsets(self) -> Dict[str, int]:
+        try:
+            return json.loads(self.offsets_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_offset(self, offset: int) -> None:
+        offsets = self._load_offsets()
+        offsets[self.key] = offset
+        try:
+            write_json_atomic(self.offsets_path, offsets)
+        except OSError as e:
+            log_warning(f"Could not save ninja log offset {self.offsets_path}: {e}")
+
+    def mark(self) -> None:
+        """Skip everything logged so far (call right before a build)"""
+        if self.log_path.exists():
+            self._save_offset(self.log_path.stat().st_size)
+
+    def read_new(self) -> List[NinjaStep]:
+        """Steps of the latest build appended since the previous read"""
+        if not self.log_path.exists():
+            return []
+
+        offset = self._load_offsets().get(self.key, 0)
+        if offset > self.log_path.stat().st_size:
+            # ninja recompacted (rewrote) the log; the build split below
+            # still isolates the latest build
+            offset = 0
+
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        self._save_offset(offset + len(data))
+
+        return latest_build(parse_ninja_log(data.decode("utf-8", "replace")))
+
+
+def critical_path(steps: List[NinjaStep]) -> List[NinjaStep]:
+    """Estimate the critical path, in build order"""
+    if not steps:
+        return []
+    by_end = sorted(steps, key=lambda s: s.end_ms)
+    ends = [s.end_ms for s in by_end]
+
+    index = len(by_end) - 1
+    path = [by_end[index]]
+    while True:
+        # Strictly earlier in end order, so zero-length steps can't loop
+        index = min(index - 1, bisect_right(ends, path[-1].start_ms) - 1)
+        if index < 0:
+            break
+        path.append(by_end[index])
+    path.reverse()
+    return path
+
+
+def utilization(steps: List[NinjaStep], buckets: int) -> List[float]:
+    """Average number of running steps in each of `buckets` time slices"""
+    if not steps:
+        return []
+    wall_start = min(s.start_ms for s in steps)
+    wall_end = max(s.end_ms for s in steps)
+    width = max(1.0, (wall_end - wall_start) / buckets)
+    busy = [0.0] * buckets
+    for step in steps:
+        start = step.start_ms - wall_start
+        end = step.end_ms - wall_start
+        first = min(buckets - 1, int(start // width))
+        last = min(buckets - 1, int(end // width))
+        for bucket in range(first, last + 1):
+            lo = max(start, bucket * width)
+            hi = min(end, (bucket + 1) * width)
+            if hi > lo:
+                busy[bucket] += hi - lo
+    return [round(b / width, 2) for b in busy]
+
+
+def patched_sources(patches_dir: Path) -> Dict[str, List[str]]:
+    """Stem -> Chromium paths (shallowest first) of patched C/C++/ObjC sources"""
+    from ..feature.index import chromium_path_for_patch
+
+    sources: Dict[str, Set[str]] = {}
+    if not patches_dir.exists():
+        return {}
+    for path in patches_dir.rglob("*"):
+        if not path.is_file():
+            continue
+        chromium_path = PurePosixPath(
+            chromium_path_for_patch(path.relative_to(patches_dir).as_posix())
+        )
+        if chromium_path.suffix in SOURCE_SUFFIXES:
+            sources.setdefault(chromium_path.stem, set()).add(str(chromium_path))
+    return {
+        stem: sorted(paths, key=lambda p: (p.count("/"), p))
+        for stem, paths in sources.items()
+    }
+
+
+def patched_source_for(
+    step: NinjaStep, patched: Dict[str, List[str]]
+) -> Optional[str]:
+    """The patched source an object file was compiled from, if any.
+
+    GN rejects two sources with the same stem in one target; if patched
+    sources in different targets under the same directory share a stem,
+    the one closest to the target's directory is reported.
+    """
+    target_dir = step.target_dir
+    if target_dir is None:
+        return None
+    prefix = f"{target_dir}/" if target_dir else ""
+    for source in patched.get(PurePosixPath(step.name).stem, []):
+        if source.startswith(prefix):
+            return source
+    return None
+
+
+def _step_summary(step: NinjaStep, patched: Dict[str, List[str]]) -> Dict:
+    summary = {
+        "output": step.name,
+        "kind": step.kind,
+        "start_ms": step.start_ms,
+        "duration_ms": step.duration_ms,
+    }
+    patched_file = patched_source_for(step, patched)
+    if patched_file:
+        summary["patched_source"] = patched_file
+    return summary
+
+
+def build_report(steps: List[NinjaStep], patched: Dict[str, List[str]]) -> Dict:
+    """Aggregate timing report for one build"""
+    wall_ms = (
+        max(s.end_ms for s in steps) - min(s.start_ms for s in steps) if steps else 0
+    )
+    cpu_ms = sum(s.duration_ms for s in steps)
+
+    directories: Dict[str, int] = {}
+    for step in steps:
+        target_dir = step.target_dir
+        directory = (
+            "/".join(target_dir.split("/")[:DIRECTORY_DEPTH])
+            if target_dir is not None
+            else "(other)"
+        )
+        directories[directory] = directories.get(directory, 0) + step.duration_ms
+
+    def slowest(kind: str) -> List[Dict]:
+        matching = [s for s in steps if s.kind == kind]
+        matching.sort(key=lambda s: s.duration_ms, reverse=True)
+        return [_step_summary(s, patched) for s in matching[:TOP_STEPS]]
+
+    path = [_step_summary(s, patched) for s in critical_path(steps)]
+    return {
+        "steps": len(steps),
+        "wall_ms": wall_ms,
+        "cpu_ms": cpu_ms,
+        "average_parallelism": round(cpu_ms / wall_ms, 2) if wall_ms else 0,
+        "critical_path": path,
+        "patched_on_critical_path": sorted(
+            {s["patched_source"] for s in path if "patched_source" in s}
+        ),
+        "slowest_compile": slowest("compile"),
+        "slowest_link": slowest("link"),
+        "directory_cpu_ms": dict(
+            sorted(directories.items(), key=lambda item: item[1], reverse=True)
+        ),
+        "utilization": utilization(steps, UTILIZATION_BUCKETS),
+    }
+
+
+def trace_events(steps: List[NinjaStep], critical: Set[int]) -> List[Dict]:
+    """Chrome trace "complete" events, one lane (tid) per concurrent slot"""
+    events = []
+    lanes: List[int] = []  # end time of the last step in each lane
+    for step in sorted(steps, key=lambda s: (s.start_ms, s.end_ms)):
+        for tid, lane_end in enumerate(lanes):
+            if lane_end <= step.start_ms:
+                lanes[tid] = step.end_ms
+                break
+        else:
+            tid = len(lanes)
+            lanes.append(step.end_ms)
+        events.append(
+            {
+                "name": PurePosixPath(step.name).name,
+                "cat": "critical_path" if id(step) in critical else step.kind,
+                "ph": "X",
+                "ts": step.start_ms * 1000,
+                "dur": step.duration_ms * 1000,
+                "pid": 0,
+                "tid": tid,
+                "args": {"outputs": step.outputs},
+            }
+        )
+    return events
+
+
+def profile_build(
+    ctx: Context, steps: Optional[List[NinjaStep]] = None
+) -> Optional[Dict]:
+    """Profile the latest ninja build and write the JSON and trace reports.
+
+    Args:
+        ctx: Build context
+        steps: Steps of the build (default: read the new .ninja_log entries)
+
+    Returns:
+        The report, or None if the log has no new entries
+    """
+    if steps is None:
+        steps = NinjaLogReader(ctx).read_new()
+    if not steps:
+        log_info("No new .ninja_log entries to profile")
+        return None
+
+    report = build_report(steps, patched_sources(ctx.get_patches_dir()))
+    critical = {id(s) for s in critical_path(steps)}
+
+    out_path = join_paths(ctx.chromium_src, ctx.out_dir)
+    report_path = out_path / REPORT_FILENAME
+    trace_path = out_path / TRACE_FILENAME
+    try:
+        report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        trace_path.write_text(
+            json.dumps({"traceEvents": trace_events(steps, critical)}),
+            encoding="utf-8",
+        )
+    except OSError as e:
+        log_warning(f"Could not write build profile: {e}")
+
+    log_build_profile(report)
+    log_info(f"Build profile: {report_path}")
+    log_info(f"Build trace: {trace_path}")
+    return report
+
+
+def log_build_profile(report: Dict) -> None:
+    """Log the headline numbers of a build report"""
+    log_info(
+        f"\n📊 {report['steps']} steps, {report['wall_ms'] / 1000:.1f}s wall, "
+        f"{report['cpu_ms'] / 1000:.1f}s CPU "
+        f"(average parallelism {report['average_parallelism']})"
+    )
+
+    path = report["critical_path"]
+    path_ms = sum(step["duration_ms"] for step in path)
+    log_info(f"  Critical path: {len(path)} steps, {path_ms / 1000:.1f}s")
+    for step in sorted(path, key=lambda s: s["duration_ms"], reverse=True)[:5]:
+        log_info(f"    {step['duration_ms'] / 1000:7.1f}s  {step['output']}")
+
+    for kind in ("compile", "link"):
+        slowest = report[f"slowest_{kind}"]
+        if slowest:
+            top = slowest[0]
+            log_info(
+                f"  Slowest {kind}: {top['output']} ({top['duration_ms'] / 1000:.1f}s)"
+            )
+
+    patched = report["patched_on_critical_path"]
+    if patched:
+        log_warning(f"  Patched files on the critical path ({len(patched)}):")
+        for path_str in patched:
+            log_warning(f"    {path_str}")
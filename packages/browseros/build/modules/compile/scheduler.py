@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Scheduler - Memory-aware compile parallelism
+
+Derives ninja's -j from cores and available memory, and the link pool size
+(Chromium's `concurrent_links` GN arg) from total memory, so big builders
+don't OOM on parallel `chrome` links and small runners don't thrash. The
+link pool is only set when the config has a `compile:` section (and total
+memory is known) or sets link_jobs; otherwise Chromium's GN default applies.
+
+Defaults can be overridden in the build config's `compile:` section, with
+per-host tuning under `hosts:` (keys are hostnames or fnmatch patterns):
+
+    compile:
+      jobs: auto               # or a number
+      link_jobs: auto          # or a number
+      memory_per_job_gb: 2
+      memory_per_link_gb: 12
+      hosts:
+        "linux-builder-*":
+          jobs: 56
+          link_jobs: 4
+
+While ninja runs, a MemoryWatcher samples available memory (/proc/meminfo
+on Linux, GlobalMemoryStatusEx on Windows) and warns when it runs low. Each
+build's settings, throughput (steps/sec) and memory low-water mark are
+appended to a history file in the build state dir, so the per-host settings
+can be tuned from data.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional
+
+from ...common.context import Context
+from ...common.utils import log_info, log_warning, write_json_atomic
+
+HISTORY_FILENAME = "compile_history.json"
+HISTORY_LIMIT = 100
+
+DEFAULT_MEMORY_PER_JOB_GB = 2.0
+DEFAULT_MEMORY_PER_LINK_GB = 12.0
+# Warn when available memory drops below this fraction of total
+LOW_MEMORY_FRACTION = 0.05
+SAMPLE_INTERVAL_SECONDS = 5.0
+
+_GB = 1024 * 1024 * 1024
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _MemoryStatusEx(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", wintypes.DWORD),
+            ("dwMemoryLoad", wintypes.DWORD),
+            ("ullTotalPhys", ctypes.c_ulonglong),
+            ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong),
+            ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong),
+            ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+        ]
+
+    def _read_windows_meminfo() -> Dict[str, int]:
+        status = _MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(_MemoryStatusEx)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return {}
+        return {"MemTotal": status.ullTotalPhys, "MemAvailable": status.ullAvailPhys}
+
+
+def read_meminfo() -> Dict[str, int]:
+    """Memory figures in bytes ("MemTotal", "MemAvailable").
+
+    Reads /proc/meminfo on Linux and GlobalMemoryStatusEx on Windows;
+    elsewhere only MemTotal is known (from sysconf). Figures that can't be
+    read are missing.
+    """
+    if sys.platform == "win32":
+        return _read_windows_meminfo()
+
+    info: Dict[str, int] = {}
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                parts = value.split()
+                if parts and parts[0].isdigit():
+                    info[name] = int(parts[0]) * 1024
+    except OSError:
+        try:
+            info["MemTotal"] = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (ValueError, OSError, AttributeError):
+            pass
+    return info
+
+
+def available_cores() -> int:
+    # Respects CPU affinity/cgroup pinning where the OS exposes it
+    if sys.platform == "linux":
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def host_compile_config(ctx: Context, hostname: Optional[str] = None) -> Dict[str, Any]:
+    """The `compile:` config with the matching `hosts:` entry merged in"""
+    config = dict(ctx.compile_config or {})
+    hosts = config.pop("hosts", None) or {}
+    hostname = hostname or socket.gethostname()
+    short_name = hostname.split(".")[0]
+    for pattern, overrides in hosts.items():
+        if fnmatch(hostname, pattern) or fnmatch(short_name, pattern):
+            config.update(overrides or {})
+            config["host"] = pattern
+            break
+    return config
+
+
+def _configured_count(value: Any, name: str) -> Optional[int]:
+    """A positive job count from config, or None for "auto"/unset"""
+    if value is None or value == "auto":
+        return None
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        log_warning(f"Ignoring invalid compile.{name}: {value!r}")
+        return None
+    return count if count > 0 else None
+
+
+@dataclass
+class CompileSettings:
+    """Resolved parallelism for one build"""
+
+    jobs: int
+    # None leaves concurrent_links to Chromium's GN default
+    link_jobs: Optional[int]
+    cores: int
+    memory_total: int
+    memory_available: int
+    # hosts: pattern that matched this machine
+    host_config: Optional[str] = None
+    # Which values came from config rather than being derived
+    configured: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        links = self.link_jobs if self.link_jobs is not None else "default"
+        if self.memory_total:
+            memory = (
+                f"{self.memory_available / _GB:.0f}/"
+                f"{self.memory_total / _GB:.0f} GB available"
+            )
+        else:
+            memory = "memory unknown"
+        text = f"-j{self.jobs}, {links} concurrent links ({self.cores} cores, {memory})"
+        if self.host_config:
+            text += f" [host config: {self.host_config}]"
+        return text
+
+
+def resolve_compile_settings(
+    ctx: Context, meminfo: Optional[Dict[str, int]] = None
+) -> CompileSettings:
+    """Work out -j and the link pool size for this host.
+
+    -j follows currently available memory (it's a runtime flag). The link
+    pool follows total memory: it's a GN arg, so it must stay stable between
+    runs to avoid regenerating the build.
+    """
+    config = host_compile_config(ctx)
+    meminfo = meminfo if meminfo is not None else read_meminfo()
+    cores = available_cores()
+    total = meminfo.get("MemTotal", 0)
+    available = meminfo.get("MemAvailable", total)
+
+    per_job = float(config.get("memory_per_job_gb", DEFAULT_MEMORY_PER_JOB_GB)) * _GB
+    per_link = float(config.get("memory_per_link_gb", DEFAULT_MEMORY_PER_LINK_GB)) * _GB
+
+    configured = []
+    jobs = _configured_count(config.get("jobs"), "jobs")
+    if jobs is None:
+        # autoninja's own default for local builds is cores + 2
+        jobs = cores + 2
+        if available:
+            jobs = min(jobs, int(available // per_job))
+        jobs = max(1, jobs)
+    else:
+        configured.append("jobs")
+
+    link_jobs = _configured_count(config.get("link_jobs"), "link_jobs")
+    if link_jobs is not None:
+        configured.append("link_jobs")
+    elif total and ctx.compile_config:
+        link_jobs = max(1, min(cores, int(total // per_link)))
+
+    return CompileSettings(
+        jobs=jobs,
+        link_jobs=link_jobs,
+        cores=cores,
+        memory_total=total,
+        memory_available=available,
+        host_config=config.get("host"),
+        configured=configured,
+    )
+
+
+class MemoryWatcher:
+    """Samples memory in a background thread while a build runs"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.min_available: Optional[int] = None
+        self.samples = 0
+        self.low_memory_samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "MemoryWatcher":
+        if "MemAvailable" in read_meminfo():
+            self._thread = threading.Thread(
+                target=self._run, name="memory-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        warned = False
+        while not self._stop.is_set():
+            meminfo = read_meminfo()
+            available = meminfo.get("MemAvailable")
+            total = meminfo.get("MemTotal")
+            if available is not None:
+                self.samples += 1
+                if self.min_available is None or available < self.min_available:
+                    self.min_available = available
+            if available is not None and total:
+                if available < total * LOW_MEMORY_FRACTION:
+                    self.low_memory_samples += 1
+                    if not warned:
+                        log_warning(
+                            f"Memory pressure: {available / _GB:.1f} GB available "
+                            f"of {total / _GB:.0f} GB - consider lowering "
+                            "compile.jobs / compile.link_jobs for this host"
+                        )
+                        warned = True
+                elif warned and available > total * LOW_MEMORY_FRACTION * 2:
+                    warned = False
+            self._stop.wait(self.interval)
+
+
+def record_compile_run(
+    ctx: Context,
+    settings: CompileSettings,
+    watcher: MemoryWatcher,
+    report: Optional[Dict],
+) -> Dict:
+    """Append this build's settings and throughput to the history file"""
+    entry: Dict[str, Any] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": socket.gethostname(),
+        "out_dir": str(ctx.out_dir),
+        "build_type": ctx.build_type,
+        **asdict(settings),
+        "min_memory_available": watcher.min_available,
+        "low_memory_samples": watcher.low_memory_samples,
+    }
+    if report and report.get("wall_ms"):
+        entry["steps"] = report["steps"]
+        entry["wall_seconds"] = round(report["wall_ms"] / 1000, 1)
+        entry["steps_per_second"] = round(report["steps"] / (report["wall_ms"] / 1000), 2)
+        log_info(
+            f"Throughput: {entry['steps_per_second']} steps/sec with -j{settings.jobs}"
+        )
+
+    history_path = ctx.get_state_dir() / HISTORY_FILENAME
+    try:
+        history = json.loads(history_path.read_text(encoding="utf-8"))
+        if not isinstance(history, list):
+            history = []
+    except (OSError, ValueError):
+        history = []
+    history = (history + [entry])[-HISTORY_LIMIT:]
+
+    try:
+        write_json_atomic(history_path, history)
+    except OSError as e:
+        log_warning(f"Could not record compile history: {e}")
+    return entry
@@ -1,25 +1,35 @@
 #!/usr/bin/env python3
 """Standard single-architecture build module for BrowserOS"""
 
-import tempfile
 import shutil
-from pathlib import Path
 from ...common.module import CommandModule, ValidationError
 from ...common.context import Context
+from ...common.trace import get_tracer, now_us
 from ...common.utils import (
     run_command,
     log_info,
     log_success,
-    log_warning,
-    join_paths,
     IS_WINDOWS,
 )
+from .prepare import write_generated_inputs, log_predicted_work
+from .cache import compiler_cache_from_config, report_cache_usage
+from .profile import NinjaLogReader, profile_build, trace_events
+from .scheduler import MemoryWatcher, record_compile_run, resolve_compile_settings
+
+BUILD_TARGETS = ["chrome", "chromedriver"]
 
 
 class CompileModule(CommandModule):
     produces = ["built_app"]
     requires = []
     description = "Build BrowserOS using autoninja"
+    reads = ["chromium_src"]
+    writes = [
+        "out_dir",
+        "chromium_src/chrome/VERSION",
+        "chromium_src/chrome/BROWSEROS_VERSION",
+        "state",
+    ]
 
     def validate(self, ctx: Context) -> None:
         if not ctx.chromium_src.exists():
@@ -35,12 +45,40 @@ class CompileModule(CommandModule):
     def execute(self, ctx: Context) -> None:
         log_info("\n🔨 Building BrowserOS (this will take a while)...")
 
-        self._create_version_file(ctx)
+        write_generated_inputs(ctx)
+        log_predicted_work(ctx, BUILD_TARGETS)
 
         autoninja_cmd = "autoninja.bat" if IS_WINDOWS() else "autoninja"
-        log_info("Using default autoninja parallelism")
-
-        run_command([autoninja_cmd, "-C", ctx.out_dir, "chrome", "chromedriver"], cwd=ctx.chromium_src)
+        settings = resolve_compile_settings(ctx)
+        log_info(f"Parallelism: {settings.describe()}")
+
+        cache = compiler_cache_from_config(ctx)
+        cache_before = None
+        if cache:
+            log_info(f"Compiler cache: {cache.tool} at {cache.directory} ({cache.max_size})")
+            cache.prepare()
+            cache_before = cache.stats()
+
+        log_reader = NinjaLogReader(ctx)
+        log_reader.mark()
+        ninja_start = now_us()
+        with MemoryWatcher() as watcher:
+            run_command(
+                [autoninja_cmd, f"-j{settings.jobs}", "-C", ctx.out_dir, *BUILD_TARGETS],
+                cwd=ctx.chromium_src,
+                env=cache.env() if cache else None,
+            )
+        steps = log_reader.read_new()
+        report = profile_build(ctx, steps)
+        tracer = get_tracer()
+        if tracer is not None and steps:
+            # .ninja_log times count from ninja's start, close to autoninja's
+            tracer.add_process("ninja", trace_events(steps, set()), ninja_start)
+        record_compile_run(ctx, settings, watcher, report)
+
+        if cache:
+            report_cache_usage(ctx, cache, cache_before, cache.stats(), steps)
+            cache.evict()
 
         app_path = ctx.get_chromium_app_path()
         new_path = ctx.get_app_path()
@@ -52,24 +90,6 @@ class CompileModule(CommandModule):
 
         log_success("Build complete!")
 
-    def _create_version_file(self, ctx: Context) -> None:
-        parts = ctx.browseros_chromium_version.split(".")
-        if len(parts) != 4:
-            log_warning(f"Invalid version format: {ctx.browseros_chromium_version}")
-            return
-
-        version_content = f"MAJOR={parts[0]}\nMINOR={parts[1]}\nBUILD={parts[2]}\nPATCH={parts[3]}"
-
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as temp_file:
-            temp_file.write(version_content)
-            temp_path = temp_file.name
-
-        chrome_version_path = join_paths(ctx.chromium_src, "chrome", "VERSION")
-        shutil.copy2(temp_path, chrome_version_path)
-        Path(temp_path).unlink()
-
-        log_info(f"Created VERSION file: {ctx.browseros_chromium_version}")
-
 
 def build_target(ctx: Context, target: str) -> bool:
     """Build a specific target (e.g., mini_installer)"""
@@ -262,6 +262,8 @@ class UniversalBuildModule(CommandModule):
             chromium_src=base_ctx.chromium_src,
             architecture=arch,
             build_type=base_ctx.build_type,
+            compile_config=base_ctx.compile_config,
+            summary=base_ctx.summary,
         )
         # Set fixed app path to prevent universal auto-detection in get_app_path()
         # This is critical: after arm64 is built, get_app_path() would otherwise
@@ -6,27 +6,31 @@ Contains core extraction logic used by extract_commit and extract_range.
 
 import click
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 from ...common.context import Context
-from ...common.utils import log_info, log_error, log_warning
+from ...common.utils import log_info, log_warning
+from .writer import PatchWriter
 from .utils import (
     FilePatch,
     FileOperation,
     run_git_command,
+    file_exists_in_commit,
     parse_diff_output,
-    write_patch_file,
-    create_deletion_marker,
-    create_binary_marker,
+    stream_diff_patches,
     log_extraction_summary,
     get_commit_changed_files,
 )
 
 
-def check_overwrite(ctx: Context, file_patches: Dict, verbose: bool) -> bool:
-    """Check for existing patches and prompt for overwrite"""
+def check_overwrite(ctx: Context, file_paths: Iterable[str], verbose: bool) -> bool:
+    """Check for existing patches and prompt for overwrite
+
+    Args:
+        file_paths: Chromium file paths (or a dict keyed by them)
+    """
     existing_patches = []
-    for file_path in file_patches.keys():
+    for file_path in file_paths:
         patch_path = ctx.get_patch_path_for_file(file_path)
         if patch_path.exists():
             existing_patches.append(file_path)
@@ -50,88 +54,71 @@ def write_patches(
     file_patches: Dict[str, FilePatch],
     verbose: bool,
     include_binary: bool,
+    stale_paths: Iterable[str] = (),
+    prune: bool = False,
 ) -> Tuple[int, List[str]]:
-    """Write patches to disk.
+    """Write patches to disk, skipping files whose content is unchanged.
+
+    Args:
+        stale_paths: Chromium paths the range touched without producing a
+            patch; their existing patch files are reported as stale
+        prune: Remove the stale patch files instead of only reporting them
 
     Returns:
         Tuple of (success_count, list of successfully extracted file paths)
     """
-    success_count = 0
-    fail_count = 0
+    writer = PatchWriter(ctx)
     skip_count = 0
-    extracted_files: List[str] = []
 
     for file_path, patch in file_patches.items():
         if verbose:
             op_str = patch.operation.value.capitalize()
             log_info(f"Processing ({op_str}): {file_path}")
+        if not queue_patch_write(writer, patch, include_binary):
+            skip_count += 1
 
-        # Handle different operations
-        if patch.operation == FileOperation.DELETE:
-            # Create deletion marker
-            if create_deletion_marker(ctx, file_path):
-                success_count += 1
-                extracted_files.append(file_path)
-            else:
-                fail_count += 1
-
-        elif patch.is_binary:
-            if include_binary:
-                # Create binary marker
-                if create_binary_marker(ctx, file_path, patch.operation):
-                    success_count += 1
-                    extracted_files.append(file_path)
-                else:
-                    fail_count += 1
-            else:
-                log_warning(f"  Skipping binary file: {file_path}")
-                skip_count += 1
-
-        elif patch.operation == FileOperation.RENAME:
-            # Write patch with rename info
-            if patch.patch_content:
-                # If there are changes beyond the rename
-                if write_patch_file(ctx, file_path, patch.patch_content):
-                    success_count += 1
-                    extracted_files.append(file_path)
-                else:
-                    fail_count += 1
-            else:
-                # Pure rename - create marker
-                marker_path = ctx.get_patches_dir() / file_path
-                marker_path = marker_path.with_suffix(marker_path.suffix + ".rename")
-                marker_path.parent.mkdir(parents=True, exist_ok=True)
-                try:
-                    marker_content = f"Renamed from: {patch.old_path}\nSimilarity: {patch.similarity}%\n"
-                    marker_path.write_text(marker_content)
-                    log_info(f"  Rename marked: {file_path}")
-                    success_count += 1
-                    extracted_files.append(file_path)
-                except Exception as e:
-                    log_error(f"  Failed to mark rename: {e}")
-                    fail_count += 1
-
-        else:
-            # Normal patch (ADD, MODIFY, COPY)
-            if patch.patch_content:
-                if write_patch_file(ctx, file_path, patch.patch_content):
-                    success_count += 1
-                    extracted_files.append(file_path)
-                else:
-                    fail_count += 1
-            else:
-                log_warning(f"  No patch content for: {file_path}")
-                skip_count += 1
+    extracted_files, failed = writer.finish()
+    writer.handle_stale(stale_paths, prune=prune, verbose=verbose)
 
     # Log summary
     log_extraction_summary(file_patches)
+    writer.log_summary()
 
-    if fail_count > 0:
-        log_warning(f"Failed to extract {fail_count} patches")
+    if failed:
+        log_warning(f"Failed to extract {len(failed)} patches")
     if skip_count > 0:
         log_info(f"Skipped {skip_count} files")
 
-    return success_count, extracted_files
+    return len(extracted_files), extracted_files
+
+
+def queue_patch_write(
+    writer: PatchWriter, patch: FilePatch, include_binary: bool
+) -> bool:
+    """Queue the patch or marker write for one FilePatch.
+
+    Returns:
+        False if the patch was skipped (nothing to write)
+    """
+    file_path = patch.file_path
+
+    if patch.operation == FileOperation.DELETE:
+        writer.write_deletion_marker(file_path)
+    elif patch.is_binary:
+        if not include_binary:
+            log_warning(f"  Skipping binary file: {file_path}")
+            return False
+        writer.write_binary_marker(file_path, patch.operation)
+    elif patch.operation == FileOperation.RENAME and not patch.patch_content:
+        # Pure rename - create marker
+        writer.write_rename_marker(file_path, patch.old_path, patch.similarity)
+    elif patch.patch_content:
+        # Normal patch (ADD, MODIFY, COPY, RENAME with changes)
+        writer.write_patch(file_path, patch.patch_content)
+    else:
+        log_warning(f"  No patch content for: {file_path}")
+        return False
+    return True
 
 
 def extract_normal(
@@ -153,13 +140,14 @@ def extract_normal(
     if include_binary:
         diff_cmd.append("--binary")
 
-    result = run_git_command(diff_cmd, cwd=ctx.chromium_src)
-
-    if result.returncode != 0:
-        raise GitError(f"Failed to get diff for commit {commit_hash}: {result.stderr}")
-
-    # Parse diff into file patches
-    file_patches = parse_diff_output(result.stdout)
+    # Parse diff into file patches while git streams it
+    try:
+        file_patches = {
+            patch.file_path: patch
+            for patch in stream_diff_patches(diff_cmd, ctx.chromium_src)
+        }
+    except GitError as e:
+        raise GitError(f"Failed to get diff for commit {commit_hash}: {e}")
 
     if not file_patches:
         log_warning("No changes found in commit")
@@ -224,20 +212,9 @@ def extract_with_base(
         else:
             # File might have been added/deleted
             # Check if file exists in base and commit
-            base_exists = (
-                run_git_command(
-                    ["git", "cat-file", "-e", f"{base}:{file_path}"],
-                    cwd=ctx.chromium_src,
-                ).returncode
-                == 0
-            )
-
-            commit_exists = (
-                run_git_command(
-                    ["git", "cat-file", "-e", f"{commit_hash}:{file_path}"],
-                    cwd=ctx.chromium_src,
-                ).returncode
-                == 0
+            base_exists = file_exists_in_commit(file_path, base, ctx.chromium_src)
+            commit_exists = file_exists_in_commit(
+                file_path, commit_hash, ctx.chromium_src
             )
 
             if not base_exists and commit_exists:
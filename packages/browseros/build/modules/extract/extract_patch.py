@@ -8,6 +8,7 @@ from ...common.context import Context
 from ...common.utils import log_info, log_warning
 from .utils import (
     run_git_command,
+    file_exists_in_commit,
     parse_diff_output,
     write_patch_file,
     create_deletion_marker,
@@ -52,12 +53,8 @@ def extract_single_file_patch(
 
     if not result.stdout.strip():
         # No diff - check if file exists in base vs working directory
-        base_exists = (
-            run_git_command(
-                ["git", "cat-file", "-e", f"{base}:{chromium_path}"],
-                cwd=build_ctx.chromium_src,
-            ).returncode
-            == 0
+        base_exists = file_exists_in_commit(
+            chromium_path, base, build_ctx.chromium_src
         )
 
         working_file = build_ctx.chromium_src / chromium_path
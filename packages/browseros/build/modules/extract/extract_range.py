@@ -3,26 +3,32 @@ Extract Range - Extract patches from a range of git commits.
 """
 
 import click
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from ...common.context import Context
 from ...common.module import CommandModule, ValidationError
-from ...common.utils import log_info, log_error, log_success, log_warning
+from ...common.utils import log_info, log_success, log_warning
 from .utils import (
+    FilePatch,
     FileOperation,
     GitError,
     run_git_command,
     validate_git_repository,
     validate_commit_exists,
-    parse_diff_output,
-    write_patch_file,
-    create_deletion_marker,
-    create_binary_marker,
+    stream_diff_patches,
+    stream_git_lines,
+    iter_log_patches,
+    get_range_touched_files,
+    LOG_COMMIT_MARKER,
     log_extraction_summary,
 )
-from .common import check_overwrite, extract_with_base
-from .extract_commit import extract_single_commit
+from .common import check_overwrite, queue_patch_write, write_patches
+from .writer import PatchWriter
+
+# Max paths per git diff invocation (keeps command lines short on Windows)
+DIFF_PATHSPEC_CHUNK = 200
 
 
 def extract_commit_range(
@@ -33,9 +39,13 @@ def extract_commit_range(
     force: bool = False,
     include_binary: bool = False,
     custom_base: Optional[str] = None,
+    prune: bool = False,
 ) -> Tuple[int, List[str]]:
     """Extract patches from a commit range as a single cumulative diff
 
+    Unchanged patch files are left untouched. Patch files of paths the
+    range touched but no longer changes are reported (removed with prune).
+
     Returns:
         Tuple of (count, list of extracted file paths)
     """
@@ -60,35 +70,36 @@ def extract_commit_range(
 
     log_info(f"Processing {commit_count} commits")
 
-    # Step 2: Get diff based on whether we have a custom base
-    if custom_base:
-        # First get list of files changed in the range
-        range_files_cmd = [
-            "git",
-            "diff",
-            "--name-only",
-            f"{base_commit}..{head_commit}",
-        ]
-        result = run_git_command(range_files_cmd, cwd=ctx.chromium_src)
-
-        if result.returncode != 0:
-            raise GitError(f"Failed to get changed files: {result.stderr}")
-
-        changed_files = (
-            result.stdout.strip().split("\n") if result.stdout.strip() else []
-        )
+    # Step 2: Get list of files changed in the range
+    range_files_cmd = [
+        "git",
+        "diff",
+        "--name-only",
+        f"{base_commit}..{head_commit}",
+    ]
+    result = run_git_command(range_files_cmd, cwd=ctx.chromium_src)
+
+    if result.returncode != 0:
+        raise GitError(f"Failed to get changed files: {result.stderr}")
+
+    changed_files = result.stdout.strip().split("\n") if result.stdout.strip() else []
+
+    if not changed_files:
+        log_warning("No changes found in commit range")
+        return 0, []
 
-        if not changed_files:
-            log_warning("No files changed in range")
-            return 0, []
+    log_info(f"Found {len(changed_files)} files changed in range")
 
-        log_info(f"Found {len(changed_files)} files changed in range")
+    # Check for existing patches
+    if not force and not check_overwrite(ctx, changed_files, verbose):
+        return 0, []
 
-        # Now get diff from custom base to head for these files
+    # Step 3: Build the diff command
+    if custom_base:
+        # Diff from custom base to head for the files changed in the range
         diff_cmd = ["git", "diff", f"{custom_base}..{head_commit}"]
         if include_binary:
             diff_cmd.append("--binary")
-        # Add the specific files to diff command
         diff_cmd.append("--")
         diff_cmd.extend(changed_files)
     else:
@@ -97,71 +108,49 @@ def extract_commit_range(
         if include_binary:
             diff_cmd.append("--binary")
 
-    result = run_git_command(diff_cmd, cwd=ctx.chromium_src, timeout=120)
-
-    if result.returncode != 0:
-        raise GitError(f"Failed to get diff for range: {result.stderr}")
-
-    # Step 3-5: Process diff
-    file_patches = parse_diff_output(result.stdout)
-
-    if not file_patches:
-        log_warning("No changes found in commit range")
-        return 0, []
-
-    # Check for existing patches
-    if not force and not check_overwrite(ctx, file_patches, verbose):
-        return 0, []
-
-    success_count = 0
-    fail_count = 0
+    writer = PatchWriter(ctx)
     skip_count = 0
-    extracted_files: List[str] = []
+    # Metadata only (no content), for the summary
+    file_patches: Dict[str, FilePatch] = {}
 
-    # Process with progress indicator
+    # Steps 4-5: Stream the diff and queue each patch write as git produces it
     with click.progressbar(
-        file_patches.items(),
+        stream_diff_patches(diff_cmd, ctx.chromium_src),
+        length=len(changed_files),
         label="Extracting patches",
         show_pos=True,
         show_percent=True,
     ) as patches_bar:
-        for file_path, patch in patches_bar:
-            # Handle different operations
-            if patch.operation == FileOperation.DELETE:
-                if create_deletion_marker(ctx, file_path):
-                    success_count += 1
-                    extracted_files.append(file_path)
-                else:
-                    fail_count += 1
-
-            elif patch.is_binary:
-                if include_binary:
-                    if create_binary_marker(ctx, file_path, patch.operation):
-                        success_count += 1
-                        extracted_files.append(file_path)
-                    else:
-                        fail_count += 1
-                else:
-                    skip_count += 1
-
-            elif patch.patch_content:
-                if write_patch_file(ctx, file_path, patch.patch_content):
-                    success_count += 1
-                    extracted_files.append(file_path)
-                else:
-                    fail_count += 1
-            else:
+        for patch in patches_bar:
+            file_patches[patch.file_path] = replace(patch, patch_content=None)
+            if not queue_patch_write(writer, patch, include_binary):
                 skip_count += 1
 
+    extracted_files, failed = writer.finish()
+
+    if not file_patches:
+        log_warning("No changes found in commit range")
+        return 0, []
+
+    # Paths touched by the range's commits that its net diff no longer
+    # changes (reverted to base, renamed away)
+    touched = get_range_touched_files(base_commit, head_commit, ctx.chromium_src)
+    writer.handle_stale(
+        (path for path in touched if path not in file_patches),
+        prune=prune,
+        verbose=verbose,
+    )
+
     # Step 6: Log summary
     log_extraction_summary(file_patches)
+    writer.log_summary()
 
-    if fail_count > 0:
-        log_warning(f"Failed to extract {fail_count} patches")
+    if failed:
+        log_warning(f"Failed to extract {len(failed)} patches")
     if skip_count > 0:
         log_info(f"Skipped {skip_count} files")
 
-    return success_count, extracted_files
+    return len(extracted_files), extracted_files
 
 
 def extract_commits_individually(
@@ -172,10 +161,21 @@ def extract_commits_individually(
     force: bool = False,
     include_binary: bool = False,
     custom_base: Optional[str] = None,
+    keep_all_commits: bool = False,
+    prune: bool = False,
 ) -> Tuple[int, List[str]]:
     """Extract patches from each commit in a range individually
 
     This preserves commit boundaries and can help with conflict resolution.
+    The whole range is read as one `git log -p --reverse` stream. For each
+    file only the patch from the last commit touching it is kept, and every
+    patch file is written once at the end.
+
+    Args:
+        keep_all_commits: Keep every commit's patch for a file, stacked in
+            commit order in one patch file (ignored with custom_base)
+        prune: Remove patch files of paths the range touched but no longer
+            changes (reverted to base, renamed away)
 
     Returns:
         Tuple of (count, list of extracted file paths)
@@ -184,70 +184,109 @@ def extract_commits_individually(
     if custom_base and not validate_commit_exists(custom_base, ctx.chromium_src):
         raise GitError(f"Custom base commit not found: {custom_base}")
 
-    # Get list of commits in range
-    result = run_git_command(
-        ["git", "rev-list", "--reverse", f"{base_commit}..{head_commit}"],
-        cwd=ctx.chromium_src,
-    )
+    commits: List[str] = []
 
-    if result.returncode != 0:
-        raise GitError(f"Failed to list commits: {result.stderr}")
+    def track_commits(lines: Iterator[str]) -> Iterator[str]:
+        for line in lines:
+            if line.startswith(LOG_COMMIT_MARKER):
+                commits.append(line[len(LOG_COMMIT_MARKER) :].strip())
+            yield line
 
-    commits = [c.strip() for c in result.stdout.strip().split("\n") if c.strip()]
+    log_cmd = [
+        "git",
+        "log",
+        "--reverse",
+        "--diff-merges=first-parent",  # Same as diffing a merge against commit^
+        f"--format={LOG_COMMIT_MARKER}%H",
+    ]
+
+    file_patches: Dict[str, FilePatch] = {}
+    history: Dict[str, List[FilePatch]] = {}
+    # Every path a commit in the range touched
+    touched: Set[str] = set()
+
+    if custom_base:
+        if keep_all_commits:
+            log_warning("Keeping every commit's patch is not supported with --base")
+
+        # Only the last commit touching each file matters: its patch is the
+        # full diff from the custom base
+        last_commit: Dict[str, str] = {}
+        lines = stream_git_lines(
+            log_cmd + ["--name-only", f"{base_commit}..{head_commit}"],
+            ctx.chromium_src,
+        )
+        for line in track_commits(lines):
+            if commits and line.strip() and not line.startswith(LOG_COMMIT_MARKER):
+                last_commit[line.strip()] = commits[-1]
+        touched.update(last_commit)
+
+        files_by_commit: Dict[str, List[str]] = {}
+        for file_path, commit in last_commit.items():
+            files_by_commit.setdefault(commit, []).append(file_path)
+
+        log_info(f"Using custom base: {custom_base}")
+        for commit, files in files_by_commit.items():
+            for i in range(0, len(files), DIFF_PATHSPEC_CHUNK):
+                diff_cmd = ["git", "diff", f"{custom_base}..{commit}"]
+                if include_binary:
+                    diff_cmd.append("--binary")
+                diff_cmd.append("--")
+                diff_cmd.extend(files[i : i + DIFF_PATHSPEC_CHUNK])
+                for patch in stream_diff_patches(diff_cmd, ctx.chromium_src):
+                    file_patches[patch.file_path] = patch
+    else:
+        log_cmd += ["-p", f"{base_commit}..{head_commit}"]
+        if include_binary:
+            log_cmd.append("--binary")
+
+        lines = track_commits(stream_git_lines(log_cmd, ctx.chromium_src))
+        for _, patch in iter_log_patches(lines):
+            file_patches[patch.file_path] = patch
+            touched.add(patch.file_path)
+            if patch.operation == FileOperation.RENAME and patch.old_path:
+                touched.add(patch.old_path)
+            if keep_all_commits:
+                history.setdefault(patch.file_path, []).append(patch)
+
+        # Stack each file's patches in commit order; git apply applies
+        # repeated diffs for one file in sequence
+        for file_path, patches in history.items():
+            final = file_patches[file_path]
+            if (
+                len(patches) > 1
+                and final.operation != FileOperation.DELETE
+                and not any(p.is_binary or not p.patch_content for p in patches)
+            ):
+                file_patches[file_path] = replace(
+                    final,
+                    patch_content="\n".join(p.patch_content or "" for p in patches),
+                )
 
     if not commits:
         log_warning(f"No commits between {base_commit} and {head_commit}")
         return 0, []
 
-    log_info(f"Extracting patches from {len(commits)} commits individually")
-    if custom_base:
-        log_info(f"Using custom base: {custom_base}")
+    if not file_patches:
+        log_warning("No patches to extract")
+        return 0, []
 
-    total_extracted = 0
-    all_extracted_files: List[str] = []
-    failed_commits = []
+    log_info(
+        f"Extracting {len(file_patches)} patches from {len(commits)} commits individually"
+    )
 
-    with click.progressbar(
-        commits, label="Processing commits", show_pos=True, show_percent=True
-    ) as commits_bar:
-        for commit in commits_bar:
-            try:
-                if custom_base:
-                    # Use extract_with_base for full diff from custom base
-                    extracted, files = extract_with_base(
-                        ctx,
-                        commit,
-                        custom_base,
-                        verbose=False,
-                        force=force,
-                        include_binary=include_binary,
-                    )
-                else:
-                    # Normal extraction from parent
-                    extracted, files = extract_single_commit(
-                        ctx,
-                        commit,
-                        verbose=False,
-                        force=force,
-                        include_binary=include_binary,
-                    )
-                total_extracted += extracted
-                all_extracted_files.extend(files)
-            except GitError as e:
-                failed_commits.append((commit, str(e)))
-                if verbose:
-                    log_error(f"Failed to extract {commit}: {e}")
-
-    if failed_commits:
-        log_warning(f"Failed to extract {len(failed_commits)} commits:")
-        for commit, error in failed_commits[:5]:
-            log_warning(f"  - {commit[:8]}: {error}")
-        if len(failed_commits) > 5:
-            log_warning(f"  ... and {len(failed_commits) - 5} more")
-
-    # Deduplicate files (same file may appear in multiple commits)
-    unique_files = list(dict.fromkeys(all_extracted_files))
-    return total_extracted, unique_files
+    # Check for existing patches
+    if not force and not check_overwrite(ctx, file_patches, verbose):
+        return 0, []
+
+    return write_patches(
+        ctx,
+        file_patches,
+        verbose,
+        include_binary,
+        stale_paths=touched - set(file_patches),
+        prune=prune,
+    )
 
 
 class ExtractRangeModule(CommandModule):
@@ -277,6 +316,8 @@ class ExtractRangeModule(CommandModule):
         squash: bool = False,
         base: Optional[str] = None,
         feature: bool = False,
+        all_commits: bool = False,
+        prune: bool = False,
     ) -> None:
         """Execute extract range
 
@@ -291,6 +332,9 @@ class ExtractRangeModule(CommandModule):
             squash: Squash all commits into single patches
             base: Use different base for diff (full diff from base for files in range)
             feature: Prompt to add extracted files to a feature in features.yaml
+            all_commits: Keep every commit's patch per file, not just the last
+            prune: Remove patch files of paths the range touched but no longer
+            changes (reverted to base, renamed away)
         """
         try:
             if squash:
@@ -302,6 +346,7 @@ class ExtractRangeModule(CommandModule):
                     force=force,
                     include_binary=include_binary,
                     custom_base=base,
+                    prune=prune,
                 )
             else:
                 count, extracted_files = extract_commits_individually(
@@ -312,6 +357,8 @@ class ExtractRangeModule(CommandModule):
                     force=force,
                     include_binary=include_binary,
                     custom_base=base,
+                    keep_all_commits=all_commits,
+                    prune=prune,
                 )
             if count == 0:
                 log_warning(f"No patches extracted from range {start}..{end}")
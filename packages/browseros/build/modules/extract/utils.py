@@ -5,15 +5,23 @@ This module provides robust utilities for git operations, diff parsing,
 and patch management with comprehensive error handling.
 """
 
-import subprocess
 import click
 import re
+import subprocess
+import tempfile
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from ...common.context import Context
-from ...common.utils import log_error, log_success, log_warning
+from ...common.git import (  # noqa: F401 - re-exported
+    GitError,
+    run_git_command,
+    file_exists_in_commit,
+    resolve_commit,
+    read_commit_info,
+)
+from ...common.utils import log_error, log_success, log_warning, write_text_if_changed
 
 
 class FileOperation(Enum):
@@ -39,89 +47,6 @@ class FilePatch:
     similarity: Optional[int] = None  # For renames (percentage)
 
 
-class GitError(Exception):
-    """Custom exception for git operations"""
-
-    pass
-
-
-def run_git_command(
-    cmd: List[str],
-    cwd: Path,
-    capture: bool = True,
-    check: bool = False,
-    timeout: Optional[int] = None,
-    binary_output: bool = False,
-) -> subprocess.CompletedProcess:
-    """Run a git command and return the result
-
-    Args:
-        cmd: Command to run
-        cwd: Working directory
-        capture: Whether to capture output
-        check: Whether to raise on non-zero return
-        timeout: Command timeout in seconds
-        binary_output: If True, handle binary output (don't decode as text)
-
-    Returns:
-        CompletedProcess result
-
-    Raises:
-        GitError: If command fails and check=True
-    """
-    try:
-        # For commands that might output binary data (like git diff with binary files),
-        # we need to handle them specially
-        if binary_output or ("diff" in cmd and "--binary" not in cmd):
-            # First try with text mode
-            try:
-                result = subprocess.run(
-                    cmd,
-                    cwd=cwd,
-                    capture_output=capture,
-                    text=True,
-                    check=False,
-                    timeout=timeout or 60,
-                    errors="replace",  # Replace invalid UTF-8 sequences
-                )
-            except UnicodeDecodeError:
-                # Fall back to binary mode
-                result = subprocess.run(
-                    cmd,
-                    cwd=cwd,
-                    capture_output=capture,
-                    text=False,
-                    check=False,
-                    timeout=timeout or 60,
-                )
-                # Convert to text with error handling
-                if result.stdout:
-                    result.stdout = result.stdout.decode("utf-8", errors="replace")
-                if result.stderr:
-                    result.stderr = result.stderr.decode("utf-8", errors="replace")
-        else:
-            result = subprocess.run(
-                cmd,
-                cwd=cwd,
-                capture_output=capture,
-                text=True,
-                check=False,
-                timeout=timeout or 60,
-            )
-
-        if check and result.returncode != 0:
-            error_msg = result.stderr or result.stdout or "Unknown error"
-            raise GitError(f"Git command failed: {' '.join(cmd)}\nError: {error_msg}")
-
-        return result
-    except subprocess.TimeoutExpired:
-        log_error(f"Git command timed out after {timeout} seconds: {' '.join(cmd)}")
-        raise GitError(f"Command timed out: {' '.join(cmd)}")
-    except Exception as e:
-        log_error(f"Failed to run git command: {' '.join(cmd)}")
-        raise GitError(f"Command failed: {e}")
-
-
 def validate_git_repository(path: Path) -> bool:
     """Validate that a path is a git repository"""
     try:
@@ -136,20 +61,36 @@ def validate_git_repository(path: Path) -> bool:
 def validate_commit_exists(commit_hash: str, chromium_src: Path) -> bool:
     """Validate that a commit exists in the repository"""
     try:
-        result = run_git_command(
-            ["git", "rev-parse", "--verify", f"{commit_hash}^{{commit}}"],
-            cwd=chromium_src,
-        )
-
-        if result.returncode != 0:
+        if resolve_commit(commit_hash, chromium_src) is None:
             log_error(f"Commit '{commit_hash}' not found in repository")
             return False
         return True
-    except GitError as e:
+    except (OSError, ValueError) as e:
         log_error(f"Failed to validate commit: {e}")
         return False
 
 
+def get_range_touched_files(
+    base_commit: str, head_commit: str, chromium_src: Path
+) -> List[str]:
+    """Get every path any commit in base..head touched (renames as old + new)"""
+    result = run_git_command(
+        [
+            "git",
+            "log",
+            "--format=",
+            "--name-only",
+            "--no-renames",
+            "--diff-merges=first-parent",
+            f"{base_commit}..{head_commit}",
+        ],
+        cwd=chromium_src,
+    )
+    if result.returncode != 0:
+        raise GitError(f"Failed to list files touched by range: {result.stderr}")
+    return sorted({f.strip() for f in result.stdout.split("\n") if f.strip()})
+
+
 def get_commit_changed_files(commit_hash: str, chromium_src: Path) -> List[str]:
     """Get list of files changed in a commit"""
     try:
@@ -169,9 +110,10 @@ def get_commit_changed_files(commit_hash: str, chromium_src: Path) -> List[str]:
         return []
 
 
-def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
+def iter_diff_patches(lines: Iterable[str]) -> Iterator[FilePatch]:
     """
-    Parse git diff output into individual file patches with full metadata.
+    Parse git diff output line by line, yielding each file's patch as soon
+    as its diff ends.
 
     Handles:
     - Regular file modifications
@@ -182,45 +124,41 @@ def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
     - File copies
     - Mode changes
 
-    Returns:
-        Dict mapping file path to FilePatch objects
+    Args:
+        lines: Diff output lines without line endings
+
+    Yields:
+        FilePatch objects in diff order
     """
-    patches = {}
     current_file = None
-    current_patch_lines = []
+    current_patch_lines: List[str] = []
     current_operation = FileOperation.MODIFY
     is_binary = False
     old_path = None
     similarity = None
 
-    lines = diff_output.splitlines()
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
+    def build_patch(file_path: str) -> FilePatch:
+        patch_content = "\n".join(current_patch_lines) if not is_binary else None
+        return FilePatch(
+            file_path=file_path,
+            operation=current_operation,
+            old_path=old_path,
+            patch_content=patch_content,
+            is_binary=is_binary,
+            similarity=similarity,
+        )
 
+    for line in lines:
         # Start of a new file diff
         if line.startswith("diff --git"):
-            # Save previous patch if exists
+            # Emit previous patch if exists
             if current_file and current_patch_lines:
-                patch_content = (
-                    "\n".join(current_patch_lines) if not is_binary else None
-                )
-                patches[current_file] = FilePatch(
-                    file_path=current_file,
-                    operation=current_operation,
-                    old_path=old_path,
-                    patch_content=patch_content,
-                    is_binary=is_binary,
-                    similarity=similarity,
-                )
+                yield build_patch(current_file)
 
             # Parse file paths from diff line
             match = re.match(r"diff --git a/(.*) b/(.*)", line)
             if match:
-                _old_file = match.group(1)
-                new_file = match.group(2)
-                current_file = new_file
+                current_file = match.group(2)
                 current_patch_lines = [line]
                 current_operation = FileOperation.MODIFY
                 is_binary = False
@@ -230,86 +168,163 @@ def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
                 log_warning(f"Could not parse diff line: {line}")
                 current_file = None
                 current_patch_lines = []
+            continue
 
-            i += 1
+        if not current_file:
             continue
 
-        # Check for file metadata
-        if current_file:
-            if line.startswith("deleted file"):
-                current_operation = FileOperation.DELETE
-                current_patch_lines.append(line)
-            elif line.startswith("new file"):
-                current_operation = FileOperation.ADD
-                current_patch_lines.append(line)
-            elif line.startswith("similarity index"):
-                # Extract similarity percentage for renames
-                match = re.match(r"similarity index (\d+)%", line)
-                if match:
-                    similarity = int(match.group(1))
-                current_patch_lines.append(line)
-            elif line.startswith("rename from"):
-                current_operation = FileOperation.RENAME
-                old_path = line[12:].strip()  # Remove 'rename from '
-                current_patch_lines.append(line)
-            elif line.startswith("rename to"):
-                # Confirm rename operation
-                current_patch_lines.append(line)
-            elif line.startswith("copy from"):
-                current_operation = FileOperation.COPY
-                old_path = line[10:].strip()  # Remove 'copy from '
-                current_patch_lines.append(line)
-            elif line.startswith("copy to"):
-                # Confirm copy operation
-                current_patch_lines.append(line)
-            elif line == "Binary files differ" or line.startswith("Binary files"):
-                is_binary = True
-                current_operation = (
-                    FileOperation.BINARY
-                    if current_operation == FileOperation.MODIFY
-                    else current_operation
-                )
-                current_patch_lines.append(line)
-            elif (
-                line.startswith("index ")
-                or line.startswith("---")
-                or line.startswith("+++")
-            ):
-                current_patch_lines.append(line)
-            elif line.startswith("@@"):
-                # Hunk header
-                current_patch_lines.append(line)
-            elif line.startswith("+") or line.startswith("-") or line.startswith(" "):
-                # Actual diff content
-                current_patch_lines.append(line)
-            elif line.startswith("\\"):
-                # Special markers like "\ No newline at end of file"
-                current_patch_lines.append(line)
-            else:
-                # Other content
-                current_patch_lines.append(line)
+        # File metadata; every line is kept as part of the patch
+        if line.startswith("deleted file"):
+            current_operation = FileOperation.DELETE
+        elif line.startswith("new file"):
+            current_operation = FileOperation.ADD
+        elif line.startswith("similarity index"):
+            # Extract similarity percentage for renames
+            match = re.match(r"similarity index (\d+)%", line)
+            if match:
+                similarity = int(match.group(1))
+        elif line.startswith("rename from"):
+            current_operation = FileOperation.RENAME
+            old_path = line[12:].strip()  # Remove 'rename from '
+        elif line.startswith("copy from"):
+            current_operation = FileOperation.COPY
+            old_path = line[10:].strip()  # Remove 'copy from '
+        elif line.startswith("Binary files"):
+            is_binary = True
+            if current_operation == FileOperation.MODIFY:
+                current_operation = FileOperation.BINARY
+        current_patch_lines.append(line)
+
+    # Emit last patch
+    if current_file and current_patch_lines:
+        yield build_patch(current_file)
 
-        i += 1
 
-    # Save last patch
-    if current_file and current_patch_lines:
-        patch_content = "\n".join(current_patch_lines) if not is_binary else None
-        patches[current_file] = FilePatch(
-            file_path=current_file,
-            operation=current_operation,
-            old_path=old_path,
-            patch_content=patch_content,
-            is_binary=is_binary,
-            similarity=similarity,
+def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
+    """
+    Parse git diff output into individual file patches with full metadata.
+
+    Returns:
+        Dict mapping file path to FilePatch objects
+    """
+    return {
+        patch.file_path: patch
+        for patch in iter_diff_patches(diff_output.splitlines())
+    }
+
+
+def stream_git_lines(cmd: List[str], cwd: Path) -> Iterator[str]:
+    """
+    Run a git command and yield its stdout lines (without line endings)
+    while it runs.
+
+    Output is read through a pipe with no timeout. Stopping iteration early
+    terminates git.
+
+    Raises:
+        GitError: If git exits with an error
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            text=True,
+            encoding="utf-8",
+            errors="replace",  # Replace invalid UTF-8 sequences
         )
+        assert proc.stdout is not None  # stdout=PIPE
+        finished = False
+        try:
+            for line in proc.stdout:
+                yield line.rstrip("\n")
+            finished = True
+        finally:
+            if not finished:
+                proc.kill()
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            error = stderr_file.read().decode("utf-8", errors="replace")
+            raise GitError(f"Git command failed: {' '.join(cmd)}\nError: {error}")
+
+
+def stream_diff_patches(cmd: List[str], cwd: Path) -> Iterator[FilePatch]:
+    """
+    Run a git diff command and yield FilePatch objects while it runs.
+
+    The diff is read from git's stdout through a pipe, so memory stays
+    bounded by the largest single file diff and there is no timeout.
+
+    Raises:
+        GitError: If git exits with an error
+    """
+    yield from iter_diff_patches(stream_git_lines(cmd, cwd))
+
+
+# Marks the start of each commit in `git log -p` output. Can't collide with
+# diff content: those lines start with a diff prefix, and base85 binary data
+# contains no spaces.
+LOG_COMMIT_MARKER = "browseros-commit "
+
+
+def iter_log_patches(lines: Iterable[str]) -> Iterator[Tuple[str, FilePatch]]:
+    """
+    Split `git log -p --format=LOG_COMMIT_MARKER%H` output per commit and
+    per file.
+
+    Yields:
+        (commit_hash, FilePatch) in log order
+    """
+    commit = None
+    commit_lines: List[str] = []
+
+    for line in lines:
+        if line.startswith(LOG_COMMIT_MARKER):
+            if commit:
+                for patch in iter_diff_patches(commit_lines):
+                    yield commit, patch
+            commit = line[len(LOG_COMMIT_MARKER) :].strip()
+            commit_lines = []
+        elif commit:
+            commit_lines.append(line)
+
+    if commit:
+        for patch in iter_diff_patches(commit_lines):
+            yield commit, patch
+
+
+# Marker suffixes written next to (instead of) a patch file
+PATCH_MARKER_SUFFIXES = (".deleted", ".binary", ".rename")
 
-    return patches
+
+def get_patch_output_path(ctx: Context, file_path: str, suffix: str = "") -> Path:
+    """Get the patch (suffix="") or marker file path for a chromium file"""
+    output_path = ctx.get_patch_path_for_file(file_path)
+    return output_path.with_name(output_path.name + suffix) if suffix else output_path
+
+
+def deletion_marker_content(file_path: str) -> str:
+    return f"File deleted in patch\nOriginal path: {file_path}\n"
+
+
+def binary_marker_content(file_path: str, operation: FileOperation) -> str:
+    return f"Binary file\nOperation: {operation.value}\nOriginal path: {file_path}\n"
+
+
+def rename_marker_content(old_path: Optional[str], similarity: Optional[int]) -> str:
+    return f"Renamed from: {old_path}\nSimilarity: {similarity}%\n"
 
 
 def write_patch_file(ctx: Context, file_path: str, patch_content: str) -> bool:
     """
     Write a patch file to chromium_src directory structure.
 
+    The file is left untouched (mtime included) if its content is unchanged.
+
     Args:
         ctx: Build context
         file_path: Path of the file being patched
@@ -318,19 +333,15 @@ def write_patch_file(ctx: Context, file_path: str, patch_content: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    # Construct output path
-    output_path = ctx.get_patch_path_for_file(file_path)
-
-    # Create directory structure
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path = get_patch_output_path(ctx, file_path)
 
     try:
         # Ensure patch ends with newline
         if patch_content and not patch_content.endswith("\n"):
             patch_content += "\n"
 
-        output_path.write_text(patch_content, encoding="utf-8")
-        log_success(f"  Written: {output_path.relative_to(ctx.root_dir)}")
+        if write_text_if_changed(output_path, patch_content):
+            log_success(f"  Written: {output_path.relative_to(ctx.root_dir)}")
         return True
     except Exception as e:
         log_error(f"  Failed to write {output_path}: {e}")
@@ -348,15 +359,11 @@ def create_deletion_marker(ctx: Context, file_path: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    marker_path = ctx.get_patches_dir() / file_path
-    marker_path = marker_path.with_suffix(marker_path.suffix + ".deleted")
-
-    marker_path.parent.mkdir(parents=True, exist_ok=True)
+    marker_path = get_patch_output_path(ctx, file_path, ".deleted")
 
     try:
-        marker_content = f"File deleted in patch\nOriginal path: {file_path}\n"
-        marker_path.write_text(marker_content, encoding="utf-8")
-        log_warning(f"  Marked deleted: {marker_path.relative_to(ctx.root_dir)}")
+        if write_text_if_changed(marker_path, deletion_marker_content(file_path)):
+            log_warning(f"  Marked deleted: {marker_path.relative_to(ctx.root_dir)}")
         return True
     except Exception as e:
         log_error(f"  Failed to create deletion marker: {e}")
@@ -377,17 +384,12 @@ def create_binary_marker(
     Returns:
         True if successful, False otherwise
     """
-    marker_path = ctx.get_patches_dir() / file_path
-    marker_path = marker_path.with_suffix(marker_path.suffix + ".binary")
-
-    marker_path.parent.mkdir(parents=True, exist_ok=True)
+    marker_path = get_patch_output_path(ctx, file_path, ".binary")
 
     try:
-        marker_content = (
-            f"Binary file\nOperation: {operation.value}\nOriginal path: {file_path}\n"
-        )
-        marker_path.write_text(marker_content, encoding="utf-8")
-        log_warning(f"  Binary file marked: {marker_path.relative_to(ctx.root_dir)}")
+        content = binary_marker_content(file_path, operation)
+        if write_text_if_changed(marker_path, content):
+            log_warning(f"  Binary file marked: {marker_path.relative_to(ctx.root_dir)}")
         return True
     except Exception as e:
         log_error(f"  Failed to create binary marker: {e}")
@@ -401,10 +403,8 @@ def apply_single_patch(
     Apply a single patch file to chromium source with multiple strategies.
 
     Tries in order:
-    1. Standard git apply
-    2. Three-way merge
-    3. Patch command fallback
-    4. Interactive conflict resolution
+    1. Shared apply path (in-process apply, then git apply --3way)
+    2. Interactive conflict resolution
 
     Returns:
         Tuple of (success, message)
@@ -430,33 +430,17 @@ def apply_single_patch(
     if patch_path.suffix == ".binary":
         return False, f"Binary file patch not supported: {patch_path.name}"
 
-    # Try standard apply
-    result = run_git_command(["git", "apply", "-p1", str(patch_path)], cwd=chromium_src)
+    from ..apply.common import apply_patch_file
 
-    if result.returncode == 0:
+    success, error = apply_patch_file(patch_path, chromium_src)
+    if success:
         return True, f"Applied: {patch_path.name}"
 
-    # Try 3-way merge
-    result = run_git_command(
-        ["git", "apply", "-p1", "--3way", str(patch_path)], cwd=chromium_src
-    )
-
-    if result.returncode == 0:
-        return True, f"Applied (3-way): {patch_path.name}"
-
-    # Try with whitespace options
-    result = run_git_command(
-        ["git", "apply", "-p1", "--whitespace=fix", str(patch_path)], cwd=chromium_src
-    )
-
-    if result.returncode == 0:
-        return True, f"Applied (whitespace fixed): {patch_path.name}"
-
     # Handle conflict
     if interactive:
-        return handle_patch_conflict(patch_path, chromium_src, result.stderr)
+        return handle_patch_conflict(patch_path, chromium_src, error or "")
     else:
-        return False, f"Failed: {patch_path.name} - {result.stderr}"
+        return False, f"Failed: {patch_path.name} - {error}"
 
 
 def handle_patch_conflict(
@@ -551,33 +535,8 @@ def create_git_commit(chromium_src: Path, message: str) -> bool:
 def get_commit_info(commit_hash: str, chromium_src: Path) -> Optional[Dict[str, str]]:
     """Get detailed information about a commit"""
     try:
-        # Get commit info in a structured format
-        result = run_git_command(
-            [
-                "git",
-                "show",
-                "--format=%H%n%an%n%ae%n%at%n%s%n%b",
-                "--no-patch",
-                commit_hash,
-            ],
-            cwd=chromium_src,
-        )
-
-        if result.returncode != 0:
-            return None
-
-        lines = result.stdout.strip().split("\n")
-        if len(lines) >= 5:
-            return {
-                "hash": lines[0],
-                "author_name": lines[1],
-                "author_email": lines[2],
-                "timestamp": lines[3],
-                "subject": lines[4],
-                "body": "\n".join(lines[5:]) if len(lines) > 5 else "",
-            }
-        return None
-    except GitError:
+        return read_commit_info(commit_hash, chromium_src)
+    except OSError:
         return None
 
 
@@ -0,0 +1,187 @@
+"""
+Writer - Write-if-changed emission of patch and marker files.
+
+Patch content is compared with what is already on disk and only changed
+files are written (atomically, in a thread pool), so unchanged patches keep
+their mtimes. Writing a patch also removes conflicting markers for the same
+path (e.g. a stale .deleted marker), and patch files of paths the range
+touched but no longer changes can be reported or pruned in the same pass.
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+from ...common.context import Context
+from ...common.utils import (
+    log_info,
+    log_error,
+    log_success,
+    log_warning,
+    write_text_if_changed,
+)
+from .utils import (
+    FileOperation,
+    PATCH_MARKER_SUFFIXES,
+    get_patch_output_path,
+    deletion_marker_content,
+    binary_marker_content,
+    rename_marker_content,
+)
+
+
+class PatchWriter:
+    """Queue patch/marker writes and run them concurrently.
+
+    Usage:
+        writer = PatchWriter(ctx)
+        writer.write_patch("chrome/foo.cc", content)
+        writer.finish()
+        writer.log_summary()
+    """
+
+    def __init__(self, ctx: Context, jobs: Optional[int] = None):
+        self.ctx = ctx
+        self.patches_dir = ctx.get_patches_dir()
+        self._executor = ThreadPoolExecutor(
+            max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)
+        )
+        self._pending: List[Tuple[str, Path, Future]] = []
+        self._emitted: Set[Path] = set()
+
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+        self.failed: List[str] = []
+
+    def write_patch(self, file_path: str, content: str) -> None:
+        if content and not content.endswith("\n"):
+            content += "\n"
+        self._submit(file_path, "", content)
+
+    def write_deletion_marker(self, file_path: str) -> None:
+        self._submit(file_path, ".deleted", deletion_marker_content(file_path))
+
+    def write_binary_marker(self, file_path: str, operation: FileOperation) -> None:
+        self._submit(file_path, ".binary", binary_marker_content(file_path, operation))
+
+    def write_rename_marker(
+        self, file_path: str, old_path: Optional[str], similarity: Optional[int]
+    ) -> None:
+        self._submit(file_path, ".rename", rename_marker_content(old_path, similarity))
+
+    def _submit(self, file_path: str, suffix: str, content: str) -> None:
+        output_path = get_patch_output_path(self.ctx, file_path, suffix)
+        self._emitted.add(output_path)
+        future = self._executor.submit(self._write, file_path, suffix, content)
+        self._pending.append((file_path, output_path, future))
+
+    def _write(self, file_path: str, suffix: str, content: str) -> Tuple[bool, List[Path]]:
+        """Write one file; runs in a worker thread.
+
+        Returns:
+            (written, conflicting files removed)
+        """
+        output_path = get_patch_output_path(self.ctx, file_path, suffix)
+        written = write_text_if_changed(output_path, content)
+
+        # A path has exactly one of: patch, .deleted, .binary, .rename
+        removed = []
+        for other in ("",) + PATCH_MARKER_SUFFIXES:
+            if other == suffix:
+                continue
+            other_path = get_patch_output_path(self.ctx, file_path, other)
+            if other_path.is_file():
+                other_path.unlink()
+                removed.append(other_path)
+        return written, removed
+
+    def finish(self) -> Tuple[List[str], List[str]]:
+        """Wait for all queued writes.
+
+        Returns:
+            Tuple of (emitted file paths, failed file paths)
+        """
+        emitted = []
+        for file_path, output_path, future in self._pending:
+            display = self._display(output_path)
+            try:
+                written, removed = future.result()
+            except Exception as e:
+                log_error(f"  Failed to write {display}: {e}")
+                self.failed.append(file_path)
+                continue
+
+            emitted.append(file_path)
+            if written:
+                log_success(f"  Written: {display}")
+                self.written.append(file_path)
+            else:
+                self.unchanged.append(file_path)
+            for path in removed:
+                log_warning(f"  Removed conflicting: {self._display(path)}")
+                self.removed.append(self._display(path))
+
+        self._pending = []
+        self._executor.shutdown()
+        return emitted, self.failed
+
+    def find_stale(self, file_paths: Iterable[str]) -> List[Path]:
+        """Find patch and marker files this run didn't emit for chromium paths.
+
+        Args:
+            file_paths: Chromium paths the range touched but produced no
+                patch for (reverted to base, renamed away)
+        """
+        stale = set()
+        for file_path in file_paths:
+            for suffix in ("",) + PATCH_MARKER_SUFFIXES:
+                path = get_patch_output_path(self.ctx, file_path, suffix)
+                if path not in self._emitted and path.is_file():
+                    stale.add(path)
+        return sorted(stale)
+
+    def handle_stale(
+        self, file_paths: Iterable[str], prune: bool = False, verbose: bool = False
+    ) -> List[Path]:
+        """Report (and optionally remove) stale patch files of chromium paths.
+
+        Patch files of paths outside file_paths are never touched.
+
+        Returns:
+            List of stale files found
+        """
+        stale = self.find_stale(file_paths)
+        if not stale:
+            return stale
+
+        if prune:
+            for path in stale:
+                path.unlink()
+                self.removed.append(self._display(path))
+            log_info(f"🧹 Removed {len(stale)} stale patch files")
+        else:
+            log_warning(
+                f"Found {len(stale)} patch files for paths the range no longer "
+                "changes (use --prune to remove them)"
+            )
+        if verbose or not prune:
+            for path in stale[:5]:
+                log_warning(f"  - {self._display(path)}")
+            if len(stale) > 5:
+                log_warning(f"  ... and {len(stale) - 5} more")
+        return stale
+
+    def log_summary(self) -> None:
+        log_info(
+            f"📝 Patch files: {len(self.written)} written, "
+            f"{len(self.unchanged)} unchanged, {len(self.removed)} removed"
+            + (f", {len(self.failed)} failed" if self.failed else "")
+        )
+
+    def _display(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.ctx.root_dir))
+        except ValueError:
+            return str(path)
@@ -8,6 +8,7 @@ Provides commands for managing features:
 - prompt_feature_selection: Interactive feature selection for extract commands
 - add_files_to_feature: Add files to a feature (with duplicate handling)
 - classify_files: Classify unclassified patch files into features
+- FeatureIndex / load_feature_index: Compiled path -> feature lookup
 - validate_description: Validate description has required prefix
 - validate_feature_name: Validate feature name format
 """
@@ -27,6 +28,7 @@ from .feature import (
     show_feature,
     ShowFeatureModule,
     ClassifyFeaturesModule,
+    report_feature_index,
 )
 from .select import (
     prompt_feature_selection,
@@ -34,6 +36,7 @@ from .select import (
     classify_files,
     get_unclassified_files,
 )
+from .index import FeatureIndex, load_feature_index, chromium_path_for_patch
 
 __all__ = [
     "add_feature",
@@ -52,4 +55,8 @@ __all__ = [
     "add_files_to_feature",
     "classify_files",
     "get_unclassified_files",
+    "report_feature_index",
+    "FeatureIndex",
+    "load_feature_index",
+    "chromium_path_for_patch",
 ]
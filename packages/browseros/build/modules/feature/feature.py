@@ -1,15 +1,15 @@
 """
 Feature module - Manage feature-to-file mappings
 
-Simple feature management with YAML persistence.
+Simple feature management with YAML persistence (through store.py).
 """
 
-import yaml
 from typing import Dict, List, Optional, Tuple
 from ...common.context import Context
 from ...common.module import CommandModule, ValidationError
 from ..extract.utils import get_commit_changed_files
 from ...common.utils import log_info, log_error, log_success, log_warning
+from .store import get_feature_store
 from .validation import validate_description, validate_feature_name, VALID_PREFIXES
 
 
@@ -50,14 +50,10 @@ def add_or_update_feature(
         return False, f"No changed files found in commit {commit}"
 
     # Load existing features
-    features: Dict = {"version": "1.0", "features": {}}
-    if features_file.exists():
-        with open(features_file, "r") as f:
-            content = yaml.safe_load(f)
-            if content:
-                features = content
-                if "features" not in features:
-                    features["features"] = {}
+    store = get_feature_store(features_file)
+    features: Dict = store.load()
+    if not features.get("features"):
+        features["features"] = {}
 
     existing_feature = features["features"].get(feature_name)
 
@@ -99,8 +95,7 @@ def add_or_update_feature(
         }
 
     # Save to file
-    with open(features_file, "w") as f:
-        yaml.safe_dump(features, f, sort_keys=False, default_flow_style=False)
+    store.save(features)
 
     total_files = len(features["features"][feature_name]["files"])
     if existing_feature:
@@ -130,11 +125,10 @@ def list_features(ctx: Context):
         log_warning("No features.yaml found")
         return
 
-    with open(features_file, "r") as f:
-        content = yaml.safe_load(f)
-        if not content or "features" not in content:
-            log_warning("No features defined")
-            return
+    content = get_feature_store(features_file).load()
+    if not content or "features" not in content:
+        log_warning("No features defined")
+        return
 
     features = content["features"]
     log_info(f"Features ({len(features)}):")
@@ -153,11 +147,10 @@ def show_feature(ctx: Context, feature_name: str):
         log_error("No features.yaml found")
         return
 
-    with open(features_file, "r") as f:
-        content = yaml.safe_load(f)
-        if not content or "features" not in content:
-            log_error("No features defined")
-            return
+    content = get_feature_store(features_file).load()
+    if not content or "features" not in content:
+        log_error("No features defined")
+        return
 
     features = content["features"]
     if feature_name not in features:
@@ -177,6 +170,38 @@ def show_feature(ctx: Context, feature_name: str):
         log_info(f"  - {file_path}")
 
 
+def report_feature_index(ctx: Context) -> Tuple[int, int]:
+    """Log overlapping ownership and orphaned entries in features.yaml.
+
+    Orphaned entries are files (or directories) with no patch in
+    chromium_patches/.
+
+    Returns:
+        Tuple of (overlap_count, orphan_count)
+    """
+    from .index import chromium_path_for_patch, load_feature_index
+    from .select import get_all_patch_files
+
+    index = load_feature_index(ctx.get_features_yaml_path())
+
+    overlaps = index.overlaps()
+    if overlaps:
+        log_warning(f"{len(overlaps)} path(s) owned by more than one feature:")
+        for path, owners in sorted(overlaps.items()):
+            log_warning(f"  {path}: {', '.join(owners)}")
+
+    patched = [chromium_path_for_patch(p) for p in get_all_patch_files(ctx)]
+    orphans = index.orphans(patched)
+    orphan_count = sum(len(entries) for entries in orphans.values())
+    if orphan_count:
+        log_warning(f"{orphan_count} feature entries with no patch:")
+        for name, entries in orphans.items():
+            for entry in entries:
+                log_warning(f"  {name}: {entry}")
+
+    return len(overlaps), orphan_count
+
+
 # CommandModule wrappers for dev CLI
 
 class ListFeaturesModule(CommandModule):
@@ -253,7 +278,8 @@ class ClassifyFeaturesModule(CommandModule):
     def execute(self, ctx: Context, **kwargs) -> None:
         from .select import classify_files, get_unclassified_files
 
-        # Show summary first
+        # Show ownership problems and summary first
+        report_feature_index(ctx)
         unclassified = get_unclassified_files(ctx)
         if not unclassified:
             log_success("All patch files are already classified!")
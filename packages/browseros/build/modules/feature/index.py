@@ -0,0 +1,204 @@
+"""
+Feature index - Compiled path → feature lookup over features.yaml
+
+features.yaml mixes exact file paths with directory entries (ending in "/",
+e.g. chrome/app/theme/). The index loads the file once and builds a trie
+over path components, so any Chromium path resolves to its owning
+feature(s) in O(path depth). A directory entry owns everything below it.
+
+The compiled index is cached per features.yaml and rebuilt only when the
+feature store's data changes.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..extract.utils import PATCH_MARKER_SUFFIXES
+from .store import get_feature_store
+
+
+def chromium_path_for_patch(patch_rel_path: str) -> str:
+    """Map a path relative to chromium_patches/ to the Chromium file it covers."""
+    for suffix in PATCH_MARKER_SUFFIXES:
+        if patch_rel_path.endswith(suffix):
+            return patch_rel_path[: -len(suffix)]
+    return patch_rel_path
+
+
+@dataclass
+class _TrieNode:
+    children: Dict[str, "_TrieNode"] = field(default_factory=dict)
+    # Features listing this exact path
+    file_owners: List[str] = field(default_factory=list)
+    # Features listing this path as a directory entry
+    dir_owners: List[str] = field(default_factory=list)
+
+
+class FeatureIndex:
+    """Path trie over the file entries of every feature."""
+
+    def __init__(self, features: Dict[str, Dict]):
+        self.features = features
+        self._order = {name: i for i, name in enumerate(features)}
+        self._root = _TrieNode()
+        # (entry, is_dir) per feature, in declared order
+        self._entries: Dict[str, List[Tuple[str, bool]]] = {}
+
+        for name, data in features.items():
+            entries = []
+            for entry in (data or {}).get("files", []) or []:
+                entry = str(entry)
+                is_dir = entry.endswith("/")
+                # Entries naming a marker patch (foo.cc.deleted) cover foo.cc
+                path = chromium_path_for_patch(entry.rstrip("/"))
+                if not path:
+                    continue
+                node = self._node(path)
+                owners = node.dir_owners if is_dir else node.file_owners
+                if name not in owners:
+                    owners.append(name)
+                entries.append((path, is_dir))
+            self._entries[name] = entries
+
+    @classmethod
+    def load(cls, features_file: Path) -> "FeatureIndex":
+        """Build an index from a features.yaml file."""
+        return cls(get_feature_store(features_file).features)
+
+    def _node(self, path: str) -> _TrieNode:
+        node = self._root
+        for part in path.split("/"):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _TrieNode()
+            node = child
+        return node
+
+    def _sorted(self, names: Iterable[str]) -> List[str]:
+        return sorted(set(names), key=self._order.__getitem__)
+
+    def owners(self, path: str) -> List[str]:
+        """Features owning a Chromium path, in features.yaml order.
+
+        A path is owned by features listing it exactly and by features with
+        a directory entry for any of its parents.
+        """
+        owners: List[str] = []
+        node = self._root
+        for part in path.strip("/").split("/"):
+            node = node.children.get(part)
+            if node is None:
+                return self._sorted(owners)
+            owners.extend(node.dir_owners)
+        owners.extend(node.file_owners)
+        return self._sorted(owners)
+
+    def owner(self, path: str) -> Optional[str]:
+        """First owning feature in features.yaml order, if any."""
+        owners = self.owners(path)
+        return owners[0] if owners else None
+
+    def is_classified(self, path: str) -> bool:
+        return bool(self.owners(path))
+
+    def entries(self, feature_name: str) -> List[str]:
+        """A feature's file entries as written (directory entries keep "/")."""
+        return [
+            path + "/" if is_dir else path
+            for path, is_dir in self._entries.get(feature_name, [])
+        ]
+
+    def resolve(self, feature_name: str, candidates: Iterable[str]) -> List[str]:
+        """Expand a feature's entries into concrete paths.
+
+        Exact entries are kept in declared order; directory entries are
+        expanded to the candidate paths below them (sorted).
+
+        Args:
+            feature_name: Feature to resolve
+            candidates: Known paths to expand directory entries against
+        """
+        entries = self._entries.get(feature_name, [])
+        files = [path for path, is_dir in entries if not is_dir]
+        dirs = tuple(path + "/" for path, is_dir in entries if is_dir)
+        if dirs:
+            seen = set(files)
+            files.extend(
+                path
+                for path in sorted(set(candidates))
+                if path.startswith(dirs) and path not in seen
+            )
+        return files
+
+    def overlaps(self) -> Dict[str, List[str]]:
+        """Entries owned by more than one feature.
+
+        Covers the same path listed twice as well as entries inside another
+        feature's directory entry.
+
+        Returns:
+            Dict of entry path -> owning features
+        """
+        result: Dict[str, List[str]] = {}
+
+        def walk(node: _TrieNode, path: str, inherited: Set[str]) -> None:
+            for part, child in node.children.items():
+                child_path = f"{path}/{part}" if path else part
+                here = inherited | set(child.dir_owners)
+                for entry_owners, suffix in (
+                    (child.file_owners, ""),
+                    (child.dir_owners, "/"),
+                ):
+                    if not entry_owners:
+                        continue
+                    owners = self._sorted(inherited | set(entry_owners))
+                    if len(owners) > 1:
+                        result[child_path + suffix] = owners
+                walk(child, child_path, here)
+
+        walk(self._root, "", set())
+        return result
+
+    def orphans(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """Entries that match none of the given paths.
+
+        Args:
+            paths: Chromium paths that exist (e.g. paths with patches)
+
+        Returns:
+            Dict of feature name -> orphaned entries
+        """
+        present = set(paths)
+        dirs_present: Set[str] = set()
+        for path in present:
+            parts = path.split("/")
+            for i in range(1, len(parts)):
+                dirs_present.add("/".join(parts[:i]))
+
+        result: Dict[str, List[str]] = {}
+        for name, entries in self._entries.items():
+            missing = [
+                path + "/" if is_dir else path
+                for path, is_dir in entries
+                if (path not in dirs_present if is_dir else path not in present)
+            ]
+            if missing:
+                result[name] = missing
+        return result
+
+
+_cache: Dict[Path, Tuple[int, FeatureIndex]] = {}
+
+
+def load_feature_index(features_file: Path) -> FeatureIndex:
+    """Get the compiled index for a features.yaml, rebuilding it on change."""
+    store = get_feature_store(features_file)
+    features = store.features
+    cached = _cache.get(store.path)
+    if cached and cached[0] == store.generation:
+        return cached[1]
+
+    index = FeatureIndex(features)
+    _cache[store.path] = (store.generation, index)
+    return index
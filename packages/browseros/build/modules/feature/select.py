@@ -5,31 +5,23 @@ Provides functions to prompt users to select or create features
 and add files to them.
 """
 
-import yaml
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple, Set
 
 from ...common.context import Context
 from ...common.utils import log_info, log_success, log_warning, log_error
+from .store import get_feature_store
 from .validation import validate_feature_name, validate_description, VALID_PREFIXES
 
 
 def load_features_yaml(features_file: Path) -> Dict:
-    """Load features from YAML file."""
-    if not features_file.exists():
-        return {"version": "1.0", "features": {}}
-
-    with open(features_file, "r") as f:
-        content = yaml.safe_load(f)
-        if not content:
-            return {"version": "1.0", "features": {}}
-        return content
+    """Load features from YAML file (cached, see store.py)."""
+    return get_feature_store(features_file).load()
 
 
 def save_features_yaml(features_file: Path, data: Dict) -> None:
-    """Save features to YAML file."""
-    with open(features_file, "w") as f:
-        yaml.safe_dump(data, f, sort_keys=False, default_flow_style=False)
+    """Save features to YAML file (deferred inside a store batch)."""
+    get_feature_store(features_file).save(data)
 
 
 def prompt_feature_selection(
@@ -294,13 +286,20 @@ def get_all_classified_files(ctx: Context) -> Set[str]:
 def get_unclassified_files(ctx: Context) -> List[str]:
     """Get list of patch files not in any feature.
 
+    Marker files (.deleted, .binary, .rename) count as the file they mark,
+    and directory entries cover every patch below them.
+
     Returns:
         List of unclassified file paths
     """
-    all_patches = set(get_all_patch_files(ctx))
-    classified = get_all_classified_files(ctx)
-    unclassified = all_patches - classified
-    return sorted(unclassified)
+    from .index import chromium_path_for_patch, load_feature_index
+
+    index = load_feature_index(ctx.get_features_yaml_path())
+    return [
+        patch_path
+        for patch_path in get_all_patch_files(ctx)
+        if not index.is_classified(chromium_path_for_patch(patch_path))
+    ]
 
 
 def classify_files(ctx: Context) -> Tuple[int, int]:
@@ -326,26 +325,37 @@ def classify_files(ctx: Context) -> Tuple[int, int]:
     classified_count = 0
     skipped_count = 0
 
-    for i, file_path in enumerate(unclassified, 1):
-        log_info(f"\n[{i}/{len(unclassified)}] {file_path}")
-        log_info("-" * 40)
+    from .index import chromium_path_for_patch
 
-        try:
-            # Prompt for feature selection (no commit context for classify)
-            result = prompt_feature_selection_for_file(ctx, file_path)
+    # Persist features.yaml once at the end instead of after every file
+    store = get_feature_store(ctx.get_features_yaml_path())
+    with store.batch():
+        for i, file_path in enumerate(unclassified, 1):
+            log_info(f"\n[{i}/{len(unclassified)}] {file_path}")
+            log_info("-" * 40)
 
-            if result is None:
-                log_warning("Skipped")
-                skipped_count += 1
-                continue
+            try:
+                # Prompt for feature selection (no commit context for classify)
+                result = prompt_feature_selection_for_file(ctx, file_path)
 
-            feature_name, description = result
-            add_files_to_feature(ctx, feature_name, description, [file_path])
-            classified_count += 1
+                if result is None:
+                    log_warning("Skipped")
+                    skipped_count += 1
+                    continue
 
-        except KeyboardInterrupt:
-            log_info("\n\nStopped by user")
-            break
+                feature_name, description = result
+                # Features list Chromium paths, not marker patch names
+                add_files_to_feature(
+                    ctx,
+                    feature_name,
+                    description,
+                    [chromium_path_for_patch(file_path)],
+                )
+                classified_count += 1
+
+            except KeyboardInterrupt:
+                log_info("\n\nStopped by user")
+                break
 
     log_info("")
     log_info("=" * 60)
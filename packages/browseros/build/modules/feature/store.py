@@ -0,0 +1,190 @@
+"""
+Feature store - Cached loading and batched saving of features.yaml
+
+features.yaml is parsed at most once per process (with the libyaml C loader
+when PyYAML was built with it). Parsed data is also kept in a binary cache
+under the package root's .cache/ directory, keyed on the YAML file's size
+and mtime, so later processes skip YAML parsing entirely while the file is
+unchanged.
+
+Writes go through save(); inside a batch() block they are deferred and
+flushed once when the block exits. Files are written atomically and only
+when their content changed.
+"""
+
+import hashlib
+import pickle
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import yaml
+
+from ...common.paths import get_package_root
+from ...common.utils import log_warning, write_bytes_atomic, write_text_if_changed
+
+# Prefer libyaml's C implementation; output is identical to the Python one
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+CACHE_DIR_NAME = ".cache"
+# Bump when the cache payload format changes
+CACHE_VERSION = 1
+
+
+def empty_features() -> Dict:
+    return {"version": "1.0", "features": {}}
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FeatureStore:
+    """Process-wide view of one features.yaml file.
+
+    The data returned by load() is shared: callers that modify it must
+    call save() (or mark_dirty() inside a batch).
+    """
+
+    def __init__(self, features_file: Path, cache_dir: Optional[Path] = None):
+        self.path = Path(features_file).resolve()
+        self.cache_dir = cache_dir
+        self._data: Optional[Dict] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._batch_depth = 0
+        self._dirty = False
+        # Bumped whenever the data changes, for derived caches (see index.py)
+        self.generation = 0
+
+    @property
+    def cache_path(self) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha1(str(self.path).encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"features-{key}.pickle"
+
+    def load(self) -> Dict:
+        """Return the parsed features.yaml (empty structure if missing)."""
+        if self._batch_depth and self._data is not None:
+            # Pending in-memory edits win over the file on disk
+            return self._data
+
+        stamp = _stamp(self.path)
+        if self._data is not None and stamp == self._stamp:
+            return self._data
+
+        if stamp is None:
+            data = empty_features()
+        else:
+            data = self._read_cache(stamp)
+            if data is None:
+                with open(self.path, "r") as f:
+                    data = yaml.load(f, Loader=_Loader) or empty_features()
+                self._write_cache(stamp, data)
+
+        self._data = data
+        self._stamp = stamp
+        self.generation += 1
+        return data
+
+    @property
+    def features(self) -> Dict:
+        data = self.load()
+        if not data.get("features"):
+            data["features"] = {}
+        return data["features"]
+
+    def save(self, data: Optional[Dict] = None) -> None:
+        """Persist data (default: the loaded data); deferred inside batch()."""
+        if data is not None:
+            self._data = data
+        self.mark_dirty()
+        if not self._batch_depth:
+            self.flush()
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+        self.generation += 1
+
+    def flush(self) -> None:
+        """Write pending changes to disk."""
+        if not self._dirty or self._data is None:
+            return
+        text = yaml.dump(
+            self._data, Dumper=_Dumper, sort_keys=False, default_flow_style=False
+        )
+        write_text_if_changed(self.path, text)
+        self._dirty = False
+        self._stamp = _stamp(self.path)
+        if self._stamp is not None:
+            self._write_cache(self._stamp, self._data)
+
+    @contextmanager
+    def batch(self) -> Iterator["FeatureStore"]:
+        """Defer saves until the outermost batch exits (even on error)."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def _read_cache(self, stamp: Tuple[int, int]) -> Optional[Dict]:
+        cache_path = self.cache_path
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != CACHE_VERSION
+            or payload.get("source") != str(self.path)
+            or tuple(payload.get("stamp", ())) != stamp
+        ):
+            return None
+        return payload.get("data")
+
+    def _write_cache(self, stamp: Tuple[int, int], data: Dict) -> None:
+        cache_path = self.cache_path
+        if cache_path is None:
+            return
+        payload = {
+            "version": CACHE_VERSION,
+            "source": str(self.path),
+            "stamp": stamp,
+            "data": data,
+        }
+        try:
+            write_bytes_atomic(
+                cache_path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        except OSError as e:
+            log_warning(f"Could not write features cache: {e}")
+
+
+_stores: Dict[Path, FeatureStore] = {}
+
+
+def _default_cache_dir() -> Optional[Path]:
+    try:
+        return get_package_root() / CACHE_DIR_NAME
+    except RuntimeError:
+        return None
+
+
+def get_feature_store(features_file: Path) -> FeatureStore:
+    """Get the shared store for a features.yaml path."""
+    key = Path(features_file).resolve()
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = FeatureStore(key, _default_cache_dir())
+    return store
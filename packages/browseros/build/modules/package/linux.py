@@ -4,28 +4,34 @@
 import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
-from ...common.module import CommandModule, ValidationError
+from ...common.module import CommandModule, ModuleInputs, ValidationError
 from ...common.context import Context
 from ...common.utils import (
     log_info,
     log_error,
     log_warning,
     log_success,
+    log_prefix,
+    get_log_prefix,
     run_command,
     safe_rmtree,
     join_paths,
     IS_LINUX,
 )
 from ...common.notify import get_notifier, COLOR_GREEN
+from ...common.rusage import collect_usage, get_usage_collectors
 
 
 class LinuxPackageModule(CommandModule):
     produces = ["appimage", "deb"]
     requires = []
     description = "Create AppImage and .deb packages for Linux"
+    reads = ["out_dir"]
+    writes = ["dist"]
 
     def validate(self, ctx: Context) -> None:
         if not IS_LINUX():
@@ -37,6 +43,21 @@ class LinuxPackageModule(CommandModule):
         if not chrome_binary.exists():
             raise ValidationError(f"Chrome binary not found: {chrome_binary}")
 
+    def inputs(self, ctx: Context) -> ModuleInputs:
+        # The packaged build outputs; unchanged files give unchanged packages
+        packaged = [ctx.BROWSEROS_APP_NAME] + PACKAGED_FILES
+        files = [f"out_dir/{name}" for name in packaged]
+        files += [f"out_dir/{name}/**/*" for name in PACKAGED_DIRS]
+        files.append("root/resources/icons/product_logo.png")
+        return ModuleInputs(
+            files=files,
+            context=["architecture", "semantic_version", "browseros_chromium_version"],
+            outputs=[
+                f"dist/{ctx.get_artifact_name('appimage')}",
+                f"dist/{ctx.get_artifact_name('deb')}",
+            ],
+        )
+
     def execute(self, ctx: Context) -> None:
         log_info(
             f"\n📦 Packaging {ctx.BROWSEROS_APP_BASE_NAME} {ctx.get_browseros_chromium_version()} for Linux ({ctx.architecture})"
@@ -45,8 +66,23 @@ class LinuxPackageModule(CommandModule):
         package_dir = ctx.get_dist_dir()
         package_dir.mkdir(parents=True, exist_ok=True)
 
-        appimage_path = self._package_appimage(ctx, package_dir)
-        deb_path = self._package_deb(ctx, package_dir)
+        if ctx.max_parallel > 1:
+            # Separate staging dirs, so both formats can be built at once
+            prefix = get_log_prefix()
+            collectors = get_usage_collectors()
+
+            def run(name, package):
+                with log_prefix(f"{prefix}[{name}] "), collect_usage(*collectors):
+                    return package(ctx, package_dir)
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                appimage_future = executor.submit(run, "appimage", self._package_appimage)
+                deb_future = executor.submit(run, "deb", self._package_deb)
+                appimage_path = appimage_future.result()
+                deb_path = deb_future.result()
+        else:
+            appimage_path = self._package_appimage(ctx, package_dir)
+            deb_path = self._package_deb(ctx, package_dir)
 
         if appimage_path:
             ctx.artifact_registry.add("appimage", appimage_path)
@@ -92,6 +128,25 @@ class LinuxPackageModule(CommandModule):
 # Shared Helper Functions (used by both AppImage and .deb)
 # =============================================================================
 
+# Build outputs shipped in both packages (besides the browser binary)
+PACKAGED_FILES = [
+    "chrome_crashpad_handler",
+    "chrome_sandbox",
+    "chromedriver",
+    "libEGL.so",
+    "libGLESv2.so",
+    "libvk_swiftshader.so",
+    "libvulkan.so.1",
+    "vk_swiftshader_icd.json",
+    "icudtl.dat",
+    "snapshot_blob.bin",
+    "v8_context_snapshot.bin",
+    "chrome_100_percent.pak",
+    "chrome_200_percent.pak",
+    "resources.pak",
+]
+PACKAGED_DIRS = ["locales", "MEIPreload", "BrowserOSServer"]
+
 
 def copy_browser_files(
     ctx: Context, target_dir: Path, set_sandbox_suid: bool = True
@@ -109,23 +164,7 @@ def copy_browser_files(
     target_dir.mkdir(parents=True, exist_ok=True)
     out_dir = join_paths(ctx.chromium_src, ctx.out_dir)
 
-    files_to_copy = [
-        ctx.BROWSEROS_APP_NAME,
-        "chrome_crashpad_handler",
-        "chrome_sandbox",
-        "chromedriver",
-        "libEGL.so",
-        "libGLESv2.so",
-        "libvk_swiftshader.so",
-        "libvulkan.so.1",
-        "vk_swiftshader_icd.json",
-        "icudtl.dat",
-        "snapshot_blob.bin",
-        "v8_context_snapshot.bin",
-        "chrome_100_percent.pak",
-        "chrome_200_percent.pak",
-        "resources.pak",
-    ]
+    files_to_copy = [ctx.BROWSEROS_APP_NAME] + PACKAGED_FILES
 
     for file in files_to_copy:
         src = join_paths(out_dir, file)
@@ -135,8 +174,7 @@ def copy_browser_files(
         else:
             log_warning(f"  ⚠ File not found: {file}")
 
-    dirs_to_copy = ["locales", "MEIPreload", "BrowserOSServer"]
-    for dir_name in dirs_to_copy:
+    for dir_name in PACKAGED_DIRS:
         src = join_paths(out_dir, dir_name)
         if Path(src).exists():
             shutil.copytree(src, join_paths(target_dir, dir_name), dirs_exist_ok=True)
@@ -14,6 +14,8 @@ class MacOSPackageModule(CommandModule):
     produces = ["dmg"]
     requires = []
     description = "Create DMG package for macOS"
+    reads = ["out_dir"]
+    writes = ["dist"]
 
     def validate(self, ctx: Context) -> None:
         if not IS_MACOS():
@@ -23,6 +23,7 @@ class WindowsPackageModule(CommandModule):
     produces = ["installer", "installer_zip"]
     requires = []
     description = "Create Windows installer and portable ZIP"
+    writes = ["out_dir", "dist"]
 
     def validate(self, ctx: Context) -> None:
         if not IS_WINDOWS():
@@ -53,6 +53,8 @@ def apply_patches_impl(ctx: Context, interactive: bool = False) -> bool:
         build_ctx=ctx,
         dry_run=False,
         interactive=interactive,
+        batch=not interactive,
+        incremental=not interactive,
     )
 
     # Handle results
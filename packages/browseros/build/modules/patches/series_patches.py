@@ -2,13 +2,14 @@
 """Series-based patch module for BrowserOS build system (GNU Quilt format)"""
 
 import shutil
-import subprocess
+import time
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Optional
 
 from ...common.module import CommandModule, ValidationError
 from ...common.context import Context
 from ...common.utils import log_info, log_success, log_error, get_platform
+from ..apply.common import apply_patch_file, DEFAULT_APPLY_STRATEGY
 
 
 ENCODING = "UTF-8"
@@ -93,57 +94,39 @@ def get_series_files(series_dir: Path) -> list[Path]:
     return files
 
 
-def apply_single_patch(patch_path: Path, chromium_src: Path) -> tuple[bool, str]:
+def apply_single_patch(
+    patch_path: Path,
+    chromium_src: Path,
+    strategy: str = DEFAULT_APPLY_STRATEGY,
+) -> tuple[bool, str]:
     """
-    Apply a single patch using git apply.
+    Apply a single patch through the shared apply path.
 
     Returns:
         (success, error_message)
     """
-    cmd = [
-        "git", "apply",
-        "--ignore-whitespace",
-        "--whitespace=nowarn",
-        "-p1",
-        str(patch_path)
-    ]
-
-    result = subprocess.run(
-        cmd,
-        cwd=chromium_src,
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode == 0:
-        return True, ""
-
-    # Fallback to 3-way merge
-    cmd_3way = [
-        "git", "apply",
-        "--3way",
-        "--ignore-whitespace",
-        "--whitespace=nowarn",
-        "-p1",
-        str(patch_path)
-    ]
-
-    result = subprocess.run(
-        cmd_3way,
-        cwd=chromium_src,
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode == 0:
-        return True, ""
-
-    return False, result.stderr or result.stdout
+    success, error = apply_patch_file(patch_path, chromium_src, strategy)
+    return success, error or ""
+
+
+def get_series_patch_list(series_dir: Path) -> list[str]:
+    """
+    Collect patch paths from all applicable series files, in apply order.
+
+    Returns:
+        List of patch paths relative to the series directory
+    """
+    patches = []
+    for series_file in get_series_files(series_dir):
+        patches.extend(parse_series(series_file))
+    return patches
 
 
 def apply_series_patches_impl(
     ctx: Context,
-    dry_run: bool = False
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+    report_path: Optional[Path] = None,
 ) -> tuple[list[Path], list[Path]]:
     """
     Apply all patches listed in series files (common + platform-specific).
@@ -151,6 +134,8 @@ def apply_series_patches_impl(
     Args:
         ctx: Build context
         dry_run: If True, only check if patches would apply
+        jobs: Concurrent checks for dry runs (default: CPU count)
+        report_path: Write a JSON check report here (dry runs only)
 
     Returns:
         (applied_patches, failed_patches)
@@ -163,11 +148,7 @@ def apply_series_patches_impl(
         log_info("  No series files found")
         return [], []
 
-    # Collect all patches from all series files
-    all_patches: list[tuple[str, Path]] = []  # (relative_path, series_file)
-    for series_file in series_files:
-        for relative_path in parse_series(series_file):
-            all_patches.append((relative_path, series_file))
+    all_patches = get_series_patch_list(series_dir)
 
     total = len(all_patches)
     if total == 0:
@@ -180,7 +161,30 @@ def apply_series_patches_impl(
     applied = []
     failed = []
 
-    for i, (relative_path, series_file) in enumerate(all_patches, 1):
+    if dry_run:
+        from ..apply.check import (
+            check_patches,
+            log_check_results,
+            write_check_report,
+        )
+
+        start_time = time.time()
+        entries = [(series_dir / rel, rel) for rel in all_patches]
+        results = check_patches(
+            entries,
+            chromium_src,
+            jobs=jobs,
+            patch_set="series_patches",
+        )
+        log_check_results(results)
+        if report_path:
+            write_check_report(report_path, results, jobs, time.time() - start_time)
+
+        for (patch_path, _), result in zip(entries, results, strict=True):
+            (applied if result.ok else failed).append(patch_path)
+        return applied, failed
+
+    for i, relative_path in enumerate(all_patches, 1):
         patch_path = series_dir / relative_path
 
         if not patch_path.exists():
@@ -188,35 +192,14 @@ def apply_series_patches_impl(
             failed.append(patch_path)
             continue
 
-        if dry_run:
-            cmd = [
-                "git", "apply",
-                "--check",
-                "--ignore-whitespace",
-                "-p1",
-                str(patch_path)
-            ]
-            result = subprocess.run(
-                cmd,
-                cwd=chromium_src,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                log_info(f"  [{i}/{total}] ✓ Would apply: {relative_path}")
-                applied.append(patch_path)
-            else:
-                log_error(f"  [{i}/{total}] ✗ Would fail: {relative_path}")
-                failed.append(patch_path)
+        success, error = apply_single_patch(patch_path, chromium_src)
+        if success:
+            log_info(f"  [{i}/{total}] ✓ Applied: {relative_path}")
+            applied.append(patch_path)
         else:
-            success, error = apply_single_patch(patch_path, chromium_src)
-            if success:
-                log_info(f"  [{i}/{total}] ✓ Applied: {relative_path}")
-                applied.append(patch_path)
-            else:
-                log_error(f"  [{i}/{total}] ✗ Failed: {relative_path}")
-                if error:
-                    log_error(f"      {error.strip()}")
-                failed.append(patch_path)
+            log_error(f"  [{i}/{total}] ✗ Failed: {relative_path}")
+            if error:
+                log_error(f"      {error.strip()}")
+            failed.append(patch_path)
 
     return applied, failed
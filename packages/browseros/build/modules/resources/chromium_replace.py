@@ -1,11 +1,28 @@
 #!/usr/bin/env python3
-"""Chromium file replacement module for BrowserOS build system"""
+"""Chromium file replacement module for BrowserOS build system
 
+Replacements are planned in one scan of chromium_files/ and applied only to
+destinations whose content differs. A manifest in the build state dir
+records every replaced file so it can be restored from git on its own
+(chromium_restore) instead of with a full reset.
+"""
+
+import json
+import os
 import shutil
 from pathlib import Path
+from typing import Dict, List, Tuple
 from ...common.module import CommandModule, ValidationError
 from ...common.context import Context
-from ...common.utils import log_info, log_success, log_error
+from ...common.utils import (
+    file_sha256,
+    log_info,
+    log_success,
+    log_error,
+    log_warning,
+    write_json_atomic,
+)
+from .sync import copy_file_atomic
 
 
 class ChromiumReplaceModule(CommandModule):
@@ -17,14 +34,127 @@ class ChromiumReplaceModule(CommandModule):
         if not ctx.chromium_src.exists():
             raise ValidationError(f"Chromium source not found: {ctx.chromium_src}")
 
+    def claims(self, ctx: Context) -> Tuple[List[str], List[str]]:
+        # Replaced files, previously replaced ones (restored from git) and
+        # the git index used for restoring
+        plan, _ = build_replacement_plan(
+            ctx.get_chromium_replace_files_dir(), ctx.build_type
+        )
+        files = set(plan) | set(ReplaceManifest.for_context(ctx).files)
+        writes = [f"chromium_src/{dest}" for dest in sorted(files)]
+        writes += ["chromium_src/.git/index", f"state/{MANIFEST_FILENAME}"]
+        return [], writes
+
     def execute(self, ctx: Context) -> None:
         log_info("\n🔄 Replacing chromium files...")
         if not replace_chromium_files_impl(ctx):
             raise RuntimeError("Failed to replace chromium files")
 
 
+class ChromiumRestoreModule(CommandModule):
+    produces = []
+    requires = []
+    description = "Restore Chromium files replaced by chromium_replace from git"
+
+    def validate(self, ctx: Context) -> None:
+        if not ctx.chromium_src.exists():
+            raise ValidationError(f"Chromium source not found: {ctx.chromium_src}")
+
+    def execute(self, ctx: Context) -> None:
+        log_info("\n↩️  Restoring replaced chromium files...")
+        restore_replaced_files(ctx)
+
+
+BUILD_TYPE_SUFFIXES = (".debug", ".release")
+MANIFEST_FILENAME = "chromium_replace.json"
+MANIFEST_VERSION = 1
+
+
+def build_replacement_plan(
+    replacement_dir: Path, build_type: str
+) -> Tuple[Dict[str, Path], int]:
+    """Resolve chromium_files/ into destination → source in one scan.
+
+    A file named <path>.debug or <path>.release replaces <path> for that
+    build type and takes precedence over a generic <path>.
+
+    Returns:
+        Tuple of (plan keyed by destination relative to chromium_src,
+        number of source files not used for this build type)
+    """
+    # Destination -> {variant suffix ("" for generic): source}
+    candidates: Dict[str, Dict[str, Path]] = {}
+    total = 0
+    for dirpath, _, filenames in os.walk(replacement_dir):
+        for filename in filenames:
+            src_file = Path(dirpath) / filename
+            relative = src_file.relative_to(replacement_dir).as_posix()
+            variant = ""
+            for suffix in BUILD_TYPE_SUFFIXES:
+                if relative.endswith(suffix):
+                    relative = relative[: -len(suffix)]
+                    variant = suffix
+                    break
+            candidates.setdefault(relative, {})[variant] = src_file
+            total += 1
+
+    plan: Dict[str, Path] = {}
+    for dest, variants in sorted(candidates.items()):
+        src_file = variants.get(f".{build_type}") or variants.get("")
+        if src_file is not None:
+            plan[dest] = src_file
+    return plan, total - len(plan)
+
+
+class ReplaceManifest:
+    """Record of Chromium files currently replaced from chromium_files/"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Destination (relative to chromium_src) -> {"source", "sha256"}
+        self.files: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def for_context(cls, ctx: Context) -> "ReplaceManifest":
+        """Load the manifest for a build context"""
+        manifest = cls(ctx.get_state_dir() / MANIFEST_FILENAME)
+        manifest.load()
+        return manifest
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log_warning(f"Ignoring unreadable replace manifest {self.path}: {e}")
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.files = data.get("files", {})
+
+    def clear(self) -> None:
+        self.files = {}
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically (removed when empty)"""
+        if not self.files:
+            self.path.unlink(missing_ok=True)
+            return
+        data = {"version": MANIFEST_VERSION, "files": self.files}
+        try:
+            write_json_atomic(self.path, data, sort_keys=True)
+        except OSError as e:
+            log_warning(f"Could not save replace manifest {self.path}: {e}")
+
+
 def replace_chromium_files_impl(ctx: Context, replacements=None) -> bool:
-    """Replace files in chromium source with custom files from chromium_files directory"""
+    """Replace files in chromium source with custom files from chromium_files directory
+
+    Only destinations whose content differs from the replacement are
+    written. Files replaced by an earlier run but no longer in
+    chromium_files/ are restored from git.
+    """
     log_info("\n🔄 Replacing chromium files...")
     log_info(f"  Build type: {ctx.build_type}")
 
@@ -35,73 +165,87 @@ def replace_chromium_files_impl(ctx: Context, replacements=None) -> bool:
         log_info(f"⚠️  No chromium_files directory found at: {replacement_dir}")
         return True
 
+    plan, skipped_count = build_replacement_plan(replacement_dir, ctx.build_type)
+    manifest = ReplaceManifest.for_context(ctx)
+
+    # Every destination must already exist in chromium_src
+    for dest_relative in plan:
+        if not (ctx.chromium_src / dest_relative).exists():
+            log_error(
+                f"    Destination file not found in chromium_src: {dest_relative}"
+            )
+            raise FileNotFoundError(
+                f"Destination file not found in chromium_src: {dest_relative}"
+            )
+
     replaced_count = 0
-    skipped_count = 0
-
-    # Find all files recursively in the replacement directory
-    for src_file in replacement_dir.rglob("*"):
-        if src_file.is_file():
-            # Skip build-type specific files that don't match current build type
-            if src_file.suffix in [".debug", ".release"]:
-                # Check if this file matches the current build type
-                if (ctx.build_type == "debug" and src_file.suffix != ".debug") or (
-                    ctx.build_type == "release" and src_file.suffix != ".release"
-                ):
-                    skipped_count += 1
-                    continue
-
-                # For matching build type files, determine the actual destination
-                # Remove the .debug/.release suffix for the destination path
-                relative_path = src_file.relative_to(replacement_dir)
-                # Convert path to string, remove suffix, then back to Path
-                dest_relative = Path(str(relative_path).rsplit(".", 1)[0])
-            else:
-                # Regular file without build type suffix
-                relative_path = src_file.relative_to(replacement_dir)
-                dest_relative = relative_path
-
-                # Check if build-type specific version exists
-                debug_variant = src_file.with_suffix(src_file.suffix + ".debug")
-                release_variant = src_file.with_suffix(src_file.suffix + ".release")
-
-                # If a build-type specific variant exists for current build type, skip the generic file
-                if (ctx.build_type == "debug" and debug_variant.exists()) or (
-                    ctx.build_type == "release" and release_variant.exists()
-                ):
-                    log_info(
-                        f"    ⏭️  Skipping {relative_path} (using {ctx.build_type} variant instead)"
-                    )
-                    skipped_count += 1
-                    continue
-
-            # Destination path in actual chromium source
-            dst_file = ctx.chromium_src / dest_relative
-
-            # Check if destination exists
-            if not dst_file.exists():
-                log_error(
-                    f"    Destination file not found in chromium_src: {dest_relative}"
-                )
-                raise FileNotFoundError(
-                    f"Destination file not found in chromium_src: {dest_relative}"
-                )
+    unchanged_count = 0
 
-            try:
-                # Replace the file
-                shutil.copy2(src_file, dst_file)
-                log_info(f"    ✓ Replaced: {relative_path} → {dest_relative}")
-                replaced_count += 1
+    for dest_relative, src_file in plan.items():
+        relative_path = src_file.relative_to(replacement_dir).as_posix()
+        dst_file = ctx.chromium_src / dest_relative
+        src_hash = file_sha256(src_file)
+        if src_hash is None:
+            raise FileNotFoundError(f"Replacement file disappeared: {src_file}")
 
+        if file_sha256(dst_file) == src_hash:
+            unchanged_count += 1
+        else:
+            try:
+                # Fresh mtime so ninja sees the replaced file as changed
+                copy_file_atomic(src_file, dst_file)
             except Exception as e:
                 log_error(f"    Error replacing file {relative_path}: {e}")
                 raise
+            log_info(f"    ✓ Replaced: {relative_path} → {dest_relative}")
+            replaced_count += 1
+
+        manifest.files[dest_relative] = {"source": relative_path, "sha256": src_hash}
+
+    # Restore files that are no longer replaced
+    dropped = sorted(set(manifest.files) - set(plan))
+    if dropped:
+        if restore_files(ctx, dropped):
+            log_info(f"    ↩️  Restored {len(dropped)} file(s) no longer replaced")
+            for dest_relative in dropped:
+                del manifest.files[dest_relative]
+
+    manifest.save()
 
     log_success(
-        f"Replaced {replaced_count} files (skipped {skipped_count} non-matching files)"
+        f"Replaced {replaced_count} files, {unchanged_count} unchanged "
+        f"(skipped {skipped_count} non-matching files)"
     )
     return True
 
 
+def restore_files(ctx: Context, files: List[str]) -> bool:
+    """Check files out from HEAD in one git invocation"""
+    from ..apply.utils import reset_files_to_commit
+
+    return reset_files_to_commit(files, "HEAD", ctx.chromium_src)
+
+
+def restore_replaced_files(ctx: Context) -> int:
+    """Restore every file replaced from chromium_files/ to its git version.
+
+    Returns:
+        Number of files restored
+    """
+    manifest = ReplaceManifest.for_context(ctx)
+    files = sorted(manifest.files)
+    if not files:
+        log_info("No replaced chromium files to restore")
+        return 0
+
+    if not restore_files(ctx, files):
+        raise RuntimeError("Failed to restore replaced chromium files")
+
+    manifest.clear()
+    log_success(f"Restored {len(files)} replaced chromium files")
+    return len(files)
+
+
 def add_file_to_replacements(
     file_path: Path, chromium_src: Path, root_dir: Path
 ) -> bool:
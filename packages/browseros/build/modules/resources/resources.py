@@ -2,13 +2,22 @@
 """Resource management module for BrowserOS build system"""
 
 import glob
-import shutil
 import yaml
 import subprocess
 from pathlib import Path
+from typing import List, Optional, Tuple
 from ...common.module import CommandModule, ValidationError
 from ...common.context import Context
+from ...common.trace import span
 from ...common.utils import log_info, log_success, log_error, log_warning, get_platform
+from .sync import (
+    MANIFEST_FILENAME,
+    SyncManifest,
+    SyncStats,
+    directory_pairs,
+    prune_operations,
+    sync_files,
+)
 
 
 class ResourcesModule(CommandModule):
@@ -21,14 +30,69 @@ class ResourcesModule(CommandModule):
         if not copy_config_path.exists():
             raise ValidationError(f"Copy configuration file not found: {copy_config_path}")
 
+    def claims(self, ctx: Context) -> Tuple[List[str], List[str]]:
+        # Files any operation may write (conditions aside) or remove
+        with open(ctx.get_copy_resources_config(), "r") as f:
+            config = yaml.safe_load(f) or {}
+        files = set()
+        for operation in config.get("copy_operations") or []:
+            pairs = operation_pairs(
+                ctx,
+                operation.get("type", "directory"),
+                operation["source"],
+                operation["destination"],
+            )
+            files.update(
+                dst.relative_to(ctx.chromium_src).as_posix() for _, dst in pairs or []
+            )
+        for outputs in SyncManifest.for_context(ctx).operations.values():
+            files.update(outputs)
+        writes = [f"chromium_src/{path}" for path in sorted(files)]
+        return [], writes + [f"state/{MANIFEST_FILENAME}"]
+
     def execute(self, ctx: Context) -> None:
         log_info("\n📦 Copying resources...")
         if not copy_resources_impl(ctx, commit_each=False):
             raise RuntimeError("Failed to copy resources")
 
 
+OPERATION_TYPES = ("directory", "files", "file")
+
+
+def operation_pairs(
+    ctx: Context, op_type: str, source: str, destination: str
+) -> Optional[List[Tuple[Path, Path]]]:
+    """(source, destination) file pairs of a copy operation (None if no source)"""
+    src_path = ctx.root_dir / source
+    dst_base = ctx.chromium_src / destination
+
+    if op_type == "directory":
+        if src_path.is_dir():
+            return directory_pairs(src_path, dst_base)
+    elif op_type == "files":
+        files = [Path(p) for p in sorted(glob.glob(str(ctx.root_dir / source)))]
+        return [(p, dst_base / p.name) for p in files if p.is_file()] or None
+    elif op_type == "file":
+        if src_path.is_file():
+            dst_file = dst_base
+            if destination.endswith("/") or dst_base.is_dir():
+                dst_file = dst_base / src_path.name
+            return [(src_path, dst_file)]
+    return None
+
+
+def operation_key(operation: dict) -> str:
+    """Manifest key for the files a copy operation owns"""
+    name = operation.get("name", "Unnamed operation")
+    return f"{name} → {operation['destination']}"
+
+
 def copy_resources_impl(ctx: Context, commit_each: bool = False) -> bool:
-    """Copy AI extensions and icons based on YAML configuration"""
+    """Copy AI extensions and icons based on YAML configuration
+
+    Copies are incremental: unchanged files are left untouched and files
+    dropped from a source are removed from Chromium.
+    """
     log_info("\n📦 Copying resources...")
 
     # Load copy configuration
@@ -51,6 +115,20 @@ def copy_resources_impl(ctx: Context, commit_each: bool = False) -> bool:
             "📝 Git commit mode enabled - will create a commit after each resource copy"
         )
 
+    # Only files whose content changed are copied (see sync.py)
+    manifest = SyncManifest.for_context(ctx)
+    totals = SyncStats()
+
+    # Operations renamed or removed from the config leave their files behind
+    pruned = prune_operations(
+        manifest,
+        [operation_key(operation) for operation in config["copy_operations"]],
+        ctx.chromium_src,
+    )
+    if pruned.changed or pruned.failed:
+        log_info(f"  Removed operations: {pruned.summary()}")
+    totals.failed.extend(pruned.failed)
+
     # Process each copy operation
     for operation in config["copy_operations"]:
         name = operation.get("name", "Unnamed operation")
@@ -85,62 +163,57 @@ def copy_resources_impl(ctx: Context, commit_each: bool = False) -> bool:
                 )
                 continue
 
-        # Resolve paths
-        src_path = ctx.root_dir / source
-        dst_base = ctx.chromium_src / destination
-
         log_info(f"  • {name}")
+        op_key = operation_key(operation)
 
         try:
-            if op_type == "directory":
-                # Copy entire directory
-                if src_path.exists() and src_path.is_dir():
-                    dst_path = dst_base
-                    dst_path.mkdir(parents=True, exist_ok=True)
-                    shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
-                    log_info(f"    ✓ Copied directory: {source} → {destination}")
-                    if commit_each:
-                        commit_resource_copy(
-                            name, source, destination, ctx.chromium_src
-                        )
-                else:
+            if op_type not in OPERATION_TYPES:
+                log_warning(f"    Unknown operation type: {op_type}")
+                continue
+            pairs = operation_pairs(ctx, op_type, source, destination)
+            if pairs is None:
+                if op_type == "directory":
                     log_warning(f"    Source directory not found: {source}")
-
-            elif op_type == "files":
-                # Copy files matching pattern
-                files = glob.glob(str(ctx.root_dir / source))
-                if files:
-                    dst_base.mkdir(parents=True, exist_ok=True)
-                    for file_path in files:
-                        file_path = Path(file_path)
-                        if file_path.is_file():
-                            shutil.copy2(file_path, dst_base)
-                    log_info(
-                        f"    ✓ Copied {len(files)} files: {source} → {destination}"
-                    )
-                    if commit_each:
-                        commit_resource_copy(
-                            name, source, destination, ctx.chromium_src
-                        )
-                else:
+                elif op_type == "files":
                     log_warning(f"    No files found matching: {source}")
-
-            elif op_type == "file":
-                # Copy single file
-                if src_path.exists() and src_path.is_file():
-                    dst_base.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src_path, dst_base)
-                    log_info(f"    ✓ Copied file: {source} → {destination}")
-                    if commit_each:
-                        commit_resource_copy(
-                            name, source, destination, ctx.chromium_src
-                        )
                 else:
                     log_warning(f"    Source file not found: {source}")
+                continue
+
+            with span(name, "copy", source=source, destination=destination) as step:
+                stats = sync_files(op_key, pairs, ctx.chromium_src, manifest)
+                step.set(
+                    copied=stats.copied, skipped=stats.skipped, removed=stats.removed
+                )
+            if op_type == "directory":
+                log_info(f"    ✓ Synced directory: {source} → {destination}")
+            elif op_type == "files":
+                log_info(f"    ✓ Synced {len(pairs)} files: {source} → {destination}")
+            else:
+                log_info(f"    ✓ Synced file: {source} → {destination}")
+
+            log_info(f"      {stats.summary()}")
+            totals.copied += stats.copied
+            totals.skipped += stats.skipped
+            totals.removed += stats.removed
+            totals.restored += stats.restored
+            totals.bytes_copied += stats.bytes_copied
+            totals.bytes_skipped += stats.bytes_skipped
+            totals.failed.extend(stats.failed)
+
+            if commit_each and stats.changed:
+                commit_resource_copy(name, source, destination, ctx.chromium_src)
 
         except Exception as e:
             log_error(f"    Error: {e}")
 
+    manifest.save()
+    log_info(f"  Total: {totals.summary()}")
+    if totals.failed:
+        log_error(f"Failed to sync {len(totals.failed)} resource files:")
+        for path in totals.failed:
+            log_error(f"    {path}")
+        return False
     log_success("Resources copied")
     return True
 
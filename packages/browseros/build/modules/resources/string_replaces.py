@@ -1,10 +1,25 @@
 #!/usr/bin/env python3
-"""String replacement module for BrowserOS build system"""
+"""String replacement module for BrowserOS build system
+
+Branding replacements are compiled into a single regex (see
+BrandingRewriter), so each file is rewritten in one scan. The branded
+.grd/.grdp files and their XTB translations are processed; large batches
+fan out over a process pool, and only files that changed are written.
+"""
 
 import re
-from ...common.module import CommandModule, ValidationError
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, List, Optional, Tuple
+from ...common.module import CommandModule, ModuleInputs, ValidationError
 from ...common.context import Context
-from ...common.utils import log_info, log_success, log_error, log_warning
+from ...common.utils import (
+    log_info,
+    log_success,
+    log_error,
+    log_warning,
+    write_text_if_changed,
+)
 
 
 class StringReplacesModule(CommandModule):
@@ -16,6 +31,18 @@ class StringReplacesModule(CommandModule):
         if not ctx.chromium_src.exists():
             raise ValidationError(f"Chromium source not found: {ctx.chromium_src}")
 
+    def claims(self, ctx: Context) -> Tuple[List[str], List[str]]:
+        writes = [f"chromium_src/{path}" for path in target_files]
+        writes += [f"chromium_src/{PurePosixPath(pattern).parent}" for pattern in xtb_globs]
+        return [], writes
+
+    def inputs(self, ctx: Context) -> ModuleInputs:
+        # Rewritten in place: unchanged since the last run means still branded
+        return ModuleInputs(
+            files=[f"chromium_src/{path}" for path in target_files + xtb_globs],
+            values={"replacements": branding_replacements},
+        )
+
     def execute(self, ctx: Context) -> None:
         log_info("\n🔤 Applying string replacements...")
         if not apply_string_replacements_impl(ctx):
@@ -46,48 +73,170 @@ target_files = [
     "chrome/app/settings_chromium_strings.grdp",
 ]
 
+# Translations of the files above, rewritten with the same replacements
+xtb_globs = [
+    "chrome/app/resources/chromium_strings_*.xtb",
+]
+
+# Below this many files the process pool costs more than it saves
+MIN_FILES_FOR_POOL = 8
+
+
+def _literal_first_char(pattern: str) -> Optional[str]:
+    """First character a pattern can match, if it is a plain literal"""
+    stripped = pattern.lstrip("(")
+    if stripped and stripped[0].isalnum():
+        return stripped[0]
+    return None
+
+
+class BrandingRewriter:
+    """All branding replacements compiled into one alternation regex.
+
+    Alternatives are tried in list order at each position, which matches
+    applying the replacements one after another (no replacement output
+    contains a later pattern), but every file is scanned only once.
+    """
+
+    def __init__(self, replacements: List[Tuple[str, str]]):
+        self.patterns = [pattern for pattern, _ in replacements]
+        # Named group -> (pattern index, replacement, pattern for templates)
+        self._dispatch: Dict[str, Tuple[int, str, Optional["re.Pattern[str]"]]] = {}
+        alternatives = []
+        for i, (pattern, replacement) in enumerate(replacements):
+            name = f"p{i}"
+            alternatives.append(f"(?P<{name}>{pattern})")
+            # Templates with backreferences are expanded against the pattern
+            # alone, since group numbers shift in the combined regex
+            single = re.compile(pattern) if "\\" in replacement else None
+            self._dispatch[name] = (i, replacement, single)
+        combined = "|".join(alternatives)
+
+        # When every pattern starts with a literal character, a lookahead
+        # on those characters lets the scan skip most positions without
+        # trying each alternative (several times faster on large files)
+        first_chars = {_literal_first_char(pattern) for pattern, _ in replacements}
+        if first_chars and None not in first_chars:
+            chars = "".join(sorted(char for char in first_chars if char is not None))
+            combined = f"(?=[{re.escape(chars)}])(?:{combined})"
+        self.regex = re.compile(combined)
+
+    def rewrite(self, content: str) -> Tuple[str, List[int]]:
+        """Apply all replacements in one scan.
+
+        Returns:
+            Tuple of (new content, match count per pattern)
+        """
+        counts = [0] * len(self.patterns)
+
+        def replace(match: "re.Match[str]") -> str:
+            # Every alternative is a named group, so one always matched
+            index, replacement, single = self._dispatch[match.lastgroup or ""]
+            counts[index] += 1
+            if single is None:
+                return replacement
+            return single.sub(replacement, match.group(), count=1)
+
+        return self.regex.sub(replace, content), counts
+
+
+_rewriter = BrandingRewriter(branding_replacements)
+
+
+def rewrite_file(path: Path) -> Tuple[bool, List[int]]:
+    """Rewrite one file in place if any replacement matched.
+
+    Module-level so it can run in a worker process.
+
+    Returns:
+        Tuple of (written, match count per pattern)
+    """
+    # newline="" keeps the file's line endings as they are
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        content = f.read()
+    new_content, counts = _rewriter.rewrite(content)
+    written = new_content != content and write_text_if_changed(path, new_content)
+    return written, counts
+
+
+def rewrite_files(
+    paths: List[Path], jobs: Optional[int] = None
+) -> Iterator[Tuple[Path, Optional[Tuple[bool, List[int]]], Optional[Exception]]]:
+    """Rewrite files, fanning out over a process pool for large batches.
+
+    Yields:
+        (path, (written, counts) or None, error or None) in input order
+    """
+    if len(paths) < MIN_FILES_FOR_POOL:
+        for path in paths:
+            try:
+                yield path, rewrite_file(path), None
+            except Exception as e:
+                yield path, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(rewrite_file, path) for path in paths]
+        for path, future in zip(paths, futures, strict=True):
+            try:
+                yield path, future.result(), None
+            except Exception as e:
+                yield path, None, e
+
 
 def apply_string_replacements_impl(ctx: Context) -> bool:
     """Internal implementation for applying string replacements"""
 
     success = True
 
+    # Explicit targets: per-file, per-pattern report
+    paths = []
     for file_path in target_files:
         full_path = ctx.chromium_src / file_path
-
         if not full_path.exists():
             log_warning(f"  ⚠️  File not found: {file_path}")
             continue
+        paths.append(full_path)
 
+    for full_path, result, error in rewrite_files(paths):
+        file_path = full_path.relative_to(ctx.chromium_src).as_posix()
         log_info(f"  • Processing: {file_path}")
-
-        try:
-            # Read the file content
-            with open(full_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            original_content = content
-            replacement_count = 0
-
-            # Apply each replacement
-            for pattern, replacement in branding_replacements:
-                matches = len(re.findall(pattern, content))
-                if matches > 0:
-                    content = re.sub(pattern, replacement, content)
-                    replacement_count += matches
-                    log_info(f"    ✓ Replaced {matches} occurrences of '{pattern}'")
-
-            # Write back if changes were made
-            if content != original_content:
-                with open(full_path, "w", encoding="utf-8") as f:
-                    f.write(content)
-                log_success(f"    Updated with {replacement_count} total replacements")
-            else:
-                log_info("    No replacements needed")
-
-        except Exception as e:
-            log_error(f"    Error processing {file_path}: {e}")
+        if error is not None or result is None:
+            log_error(f"    Error processing {file_path}: {error}")
             success = False
+            continue
+
+        written, counts = result
+        for pattern, matches in zip(_rewriter.patterns, counts, strict=True):
+            if matches > 0:
+                log_info(f"    ✓ Replaced {matches} occurrences of '{pattern}'")
+        if written:
+            log_success(f"    Updated with {sum(counts)} total replacements")
+        else:
+            log_info("    No replacements needed")
+
+    # Translations: one summary line for the whole tree
+    xtb_paths = sorted(
+        path for pattern in xtb_globs for path in ctx.chromium_src.glob(pattern)
+    )
+    if xtb_paths:
+        log_info(f"  • Processing {len(xtb_paths)} XTB translation files")
+        updated = 0
+        totals = [0] * len(_rewriter.patterns)
+        for full_path, result, error in rewrite_files(xtb_paths):
+            if error is not None or result is None:
+                log_error(f"    Error processing {full_path.name}: {error}")
+                success = False
+                continue
+            written, counts = result
+            updated += written
+            totals = [
+                total + count for total, count in zip(totals, counts, strict=True)
+            ]
+        for pattern, matches in zip(_rewriter.patterns, totals, strict=True):
+            if matches > 0:
+                log_info(f"    ✓ Replaced {matches} occurrences of '{pattern}'")
+        log_info(f"    {updated} updated, {len(xtb_paths) - updated} unchanged")
 
     if success:
         log_success("String replacements completed")
@@ -0,0 +1,317 @@
+"""
+Sync - Incremental, content-hash based resource copying
+
+Replaces blind copytree/copy2 for copy_resources.yaml operations. For every
+source → destination file pair the engine compares size and mtime against a
+sidecar manifest (kept in the build state dir), falls back to a SHA-256
+content hash when they differ, and copies only files whose content actually
+changed. Unchanged destinations keep their timestamps, so ninja doesn't
+rebuild targets that depend on them.
+
+The manifest also remembers which destination files each operation wrote,
+so files dropped from the source (or written by an operation that is no
+longer configured) are cleaned up on the next sync: files tracked by
+Chromium's git are restored from HEAD, others are deleted. Files no
+operation wrote are left alone.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...common.context import Context
+from ...common.utils import file_sha256, log_warning, write_json_atomic
+
+MANIFEST_FILENAME = "resources_sync.json"
+MANIFEST_VERSION = 1
+
+# {"size", "mtime_ns", "sha256"} of a file as last seen
+FileState = Dict[str, Any]
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _state(path: Path, sha256: Optional[str]) -> FileState:
+    key = _stat_key(path)
+    if key is None:
+        raise FileNotFoundError(f"File disappeared while syncing: {path}")
+    return {"size": key[0], "mtime_ns": key[1], "sha256": sha256}
+
+
+def _matches(state: Optional[FileState], key: Optional[Tuple[int, int]]) -> bool:
+    return (
+        state is not None
+        and key is not None
+        and (state.get("size"), state.get("mtime_ns")) == key
+    )
+
+
+def format_size(size_bytes: int) -> str:
+    """Format bytes as human-readable size"""
+    if size_bytes >= 1024 * 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    elif size_bytes >= 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.0f} MB"
+    elif size_bytes >= 1024:
+        return f"{size_bytes / 1024:.0f} KB"
+    return f"{size_bytes} B"
+
+
+@dataclass
+class SyncStats:
+    """Per-operation sync results"""
+
+    copied: int = 0
+    skipped: int = 0
+    removed: int = 0
+    restored: int = 0
+    bytes_copied: int = 0
+    bytes_skipped: int = 0
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.copied or self.removed or self.restored)
+
+    def summary(self) -> str:
+        text = (
+            f"{self.copied} copied ({format_size(self.bytes_copied)}), "
+            f"{self.skipped} unchanged ({format_size(self.bytes_skipped)})"
+        )
+        if self.removed:
+            text += f", {self.removed} removed"
+        if self.restored:
+            text += f", {self.restored} restored from git"
+        if self.failed:
+            text += f", {len(self.failed)} failed"
+        return text
+
+
+class SyncManifest:
+    """Sidecar record of synced files: hashes and per-operation outputs"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Destination (relative to chromium_src) -> {"src": state, "dst": state}
+        self.files: Dict[str, Dict[str, FileState]] = {}
+        # Operation name -> destination files it wrote
+        self.operations: Dict[str, List[str]] = {}
+
+    @classmethod
+    def for_context(cls, ctx: Context) -> "SyncManifest":
+        """Load the manifest for a build context"""
+        manifest = cls(ctx.get_state_dir() / MANIFEST_FILENAME)
+        manifest.load()
+        return manifest
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log_warning(f"Ignoring unreadable resources manifest {self.path}: {e}")
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.files = data.get("files", {})
+            self.operations = data.get("operations", {})
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": self.files,
+            "operations": self.operations,
+        }
+        try:
+            write_json_atomic(self.path, data, sort_keys=True)
+        except OSError as e:
+            log_warning(f"Could not save sync manifest {self.path}: {e}")
+
+
+def copy_file_atomic(src: Path, dst: Path) -> None:
+    """Copy content and mode (not mtime: dst must look newer to ninja)"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{dst.name}.", dir=dst.parent)
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp_name)
+        shutil.copymode(src, tmp_name)
+        os.replace(tmp_name, dst)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def _sync_one(
+    src: Path, dst: Path, cached: Dict[str, FileState]
+) -> Tuple[bool, int, Dict[str, FileState]]:
+    """Bring one destination up to date; runs in a worker thread.
+
+    Returns:
+        (copied, size, new manifest entry)
+    """
+    src_key = _stat_key(src)
+    if src_key is None:
+        raise FileNotFoundError(f"Source disappeared while syncing: {src}")
+    dst_key = _stat_key(dst)
+    src_state = cached.get("src")
+    dst_state = cached.get("dst")
+
+    # Fast path: neither side changed since the last sync
+    if _matches(src_state, src_key) and _matches(dst_state, dst_key):
+        return False, src_key[0], cached
+
+    if src_state is not None and _matches(src_state, src_key):
+        src_hash = src_state["sha256"]
+    else:
+        src_hash = file_sha256(src)
+    if dst_key is not None and dst_key[0] == src_key[0]:
+        if dst_state is not None and _matches(dst_state, dst_key):
+            dst_hash = dst_state["sha256"]
+        else:
+            dst_hash = file_sha256(dst)
+        if dst_hash == src_hash:
+            return False, src_key[0], {
+                "src": _state(src, src_hash),
+                "dst": _state(dst, dst_hash),
+            }
+
+    copy_file_atomic(src, dst)
+    return True, src_key[0], {
+        "src": _state(src, src_hash),
+        "dst": _state(dst, src_hash),
+    }
+
+
+def sync_files(
+    operation: str,
+    pairs: List[Tuple[Path, Path]],
+    chromium_src: Path,
+    manifest: SyncManifest,
+    jobs: Optional[int] = None,
+) -> SyncStats:
+    """Sync (source, destination) file pairs for one copy operation.
+
+    Destinations this operation wrote last time but no longer produces are
+    restored from git or deleted (see remove_outputs).
+
+    Args:
+        operation: Operation name (manifest key)
+        pairs: Source and destination file paths
+        chromium_src: Chromium source directory (destinations are recorded
+            relative to it)
+        manifest: Sync manifest, updated in place
+        jobs: Worker threads (default: based on CPU count)
+    """
+    stats = SyncStats()
+
+    def rel(path: Path) -> str:
+        try:
+            return path.relative_to(chromium_src).as_posix()
+        except ValueError:
+            return str(path)
+
+    outputs = [rel(dst) for _, dst in pairs]
+    workers = jobs or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_sync_one, src, dst, manifest.files.get(key, {}))
+            for (src, dst), key in zip(pairs, outputs, strict=True)
+        ]
+        for (src, _), key, future in zip(pairs, outputs, futures, strict=True):
+            try:
+                copied, size, entry = future.result()
+            except OSError as e:
+                log_warning(f"    Failed to sync {src}: {e}")
+                stats.failed.append(key)
+                manifest.files.pop(key, None)
+                continue
+            manifest.files[key] = entry
+            if copied:
+                stats.copied += 1
+                stats.bytes_copied += size
+            else:
+                stats.skipped += 1
+                stats.bytes_skipped += size
+
+    # Clean up files dropped from the source since the last sync
+    current = set(outputs)
+    dropped = [
+        key for key in manifest.operations.get(operation, []) if key not in current
+    ]
+    manifest.operations[operation] = sorted(current)
+    remove_outputs(dropped, chromium_src, manifest, stats)
+    return stats
+
+
+def remove_outputs(
+    keys: List[str], chromium_src: Path, manifest: SyncManifest, stats: SyncStats
+) -> None:
+    """Undo synced files that no operation produces any more.
+
+    Files tracked in Chromium's HEAD are checked out again (a resource may
+    overwrite an upstream file, e.g. the product logo); untracked files are
+    deleted. Files still listed by another operation are kept.
+    """
+    from ..apply.utils import files_existing_in_commit, reset_files_to_commit
+
+    owned = {key for outputs in manifest.operations.values() for key in outputs}
+    keys = sorted(set(keys) - owned)
+    if not keys:
+        return
+
+    tracked = files_existing_in_commit(keys, "HEAD", chromium_src)
+    if tracked:
+        if reset_files_to_commit(sorted(tracked), "HEAD", chromium_src):
+            stats.restored += len(tracked)
+        else:
+            log_warning(f"    Failed to restore {len(tracked)} file(s) from git")
+            stats.failed.extend(sorted(tracked))
+    for key in keys:
+        manifest.files.pop(key, None)
+        if key in tracked:
+            continue
+        path = chromium_src / key
+        if path.is_file():
+            path.unlink()
+            stats.removed += 1
+
+
+def prune_operations(
+    manifest: SyncManifest, configured: List[str], chromium_src: Path
+) -> SyncStats:
+    """Forget operations no longer in the config, cleaning up their files
+
+    Args:
+        manifest: Sync manifest, updated in place
+        configured: Manifest keys of every configured operation (including
+            ones skipped by a build_type/os/arch condition)
+        chromium_src: Chromium source directory
+    """
+    stats = SyncStats()
+    stale = [name for name in manifest.operations if name not in configured]
+    dropped = [key for name in stale for key in manifest.operations.pop(name)]
+    remove_outputs(dropped, chromium_src, manifest, stats)
+    return stats
+
+
+def directory_pairs(src_dir: Path, dst_dir: Path) -> List[Tuple[Path, Path]]:
+    """File pairs for mirroring a directory tree"""
+    return [
+        (path, dst_dir / path.relative_to(src_dir))
+        for path in sorted(src_dir.rglob("*"))
+        if path.is_file()
+    ]
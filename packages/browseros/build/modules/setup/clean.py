@@ -4,6 +4,7 @@
 from ...common.module import CommandModule, ValidationError
 from ...common.context import Context
 from ...common.utils import run_command, log_info, log_success, safe_rmtree
+from ..resources.chromium_replace import ReplaceManifest
 
 
 class CleanModule(CommandModule):
@@ -55,4 +56,7 @@ class CleanModule(CommandModule):
             ],
             cwd=ctx.chromium_src,
         )
+
+        # The reset restored every file chromium_replace had replaced
+        ReplaceManifest.for_context(ctx).clear()
         log_success("Git reset and clean complete")
@@ -1,15 +1,183 @@
 #!/usr/bin/env python3
-"""Build configuration module for BrowserOS build system"""
+"""Build configuration module for BrowserOS build system
 
-from ...common.module import CommandModule, ValidationError
+`gn gen` is skipped when the effective args (flags file + target_cpu) match
+the existing args.gn and the hash recorded by the last configure, and
+build.ninja is newer than args.gn. Leaving args.gn untouched keeps ninja from
+regenerating build.ninja and re-evaluating the whole Chromium graph.
+"""
+
+import hashlib
+import json
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ...common.module import CommandModule, ModuleInputs, ValidationError
 from ...common.context import Context
-from ...common.utils import run_command, log_info, log_success, join_paths, IS_WINDOWS
+from ...common.utils import (
+    run_command,
+    log_info,
+    log_success,
+    log_warning,
+    join_paths,
+    write_text_if_changed,
+    IS_WINDOWS,
+)
+from ..compile.cache import compiler_cache_from_config
+from ..compile.scheduler import resolve_compile_settings
+
+# Hash of the args.gn content the last successful `gn gen` ran with
+ARGS_STAMP_FILENAME = ".browseros_gn_args.sha256"
+
+_ARG_LINE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$")
+
+
+def get_gn_command() -> str:
+    return "gn.bat" if IS_WINDOWS() else "gn"
+
+
+def gn_flags_path(ctx: Context) -> Path:
+    """The build's GN flags file"""
+    if not ctx.paths.gn_flags_file:
+        raise ValidationError("GN flags file not set")
+    return join_paths(ctx.root_dir, ctx.paths.gn_flags_file)
+
+
+def effective_args_content(ctx: Context) -> str:
+    """args.gn content: flags file, target_cpu, link pool and compiler cache"""
+    args_content = gn_flags_path(ctx).read_text()
+    args_content += f'\ntarget_cpu = "{ctx.architecture}"\n'
+
+    # The flags file wins if it sets these itself
+    declared = parse_gn_args(args_content)
+    if "concurrent_links" not in declared:
+        settings = resolve_compile_settings(ctx)
+        if settings.link_jobs is not None:
+            args_content += f"concurrent_links = {settings.link_jobs}\n"
+    if "cc_wrapper" not in declared:
+        cache = compiler_cache_from_config(ctx)
+        if cache:
+            args_content += f'cc_wrapper = "{cache.tool}"\n'
+    return args_content
+
+
+def _strip_comment(line: str) -> str:
+    """Drop a trailing `#` comment that is not inside a string literal"""
+    in_string = False
+    for i, char in enumerate(line):
+        if char == '"' and (i == 0 or line[i - 1] != "\\"):
+            in_string = not in_string
+        elif char == "#" and not in_string:
+            return line[:i]
+    return line
+
+
+def parse_gn_args(text: str) -> Dict[str, str]:
+    """Parse top-level `name = value` assignments from args.gn text.
+
+    Comments and blank lines are ignored; a later assignment wins, as in GN.
+    Values are kept as written (whitespace-normalized).
+    """
+    args: Dict[str, str] = {}
+    for line in text.splitlines():
+        match = _ARG_LINE.match(_strip_comment(line))
+        if match:
+            args[match.group(1)] = " ".join(match.group(2).split())
+    return args
+
+
+def needs_gn_gen(ctx: Context, args_content: str) -> Tuple[bool, str]:
+    """Decide whether args.gn must be rewritten and `gn gen` rerun.
+
+    Returns:
+        Tuple of (needed, reason)
+    """
+    out_path = join_paths(ctx.chromium_src, ctx.out_dir)
+    args_file = ctx.get_gn_args_file()
+    build_ninja = out_path / "build.ninja"
+    stamp_file = out_path / ARGS_STAMP_FILENAME
+
+    if not args_file.exists():
+        return True, "no args.gn"
+    if args_file.read_text() != args_content:
+        return True, "args changed"
+    if not build_ninja.exists():
+        return True, "no build.ninja"
+
+    digest = hashlib.sha256(args_content.encode("utf-8")).hexdigest()
+    try:
+        if stamp_file.read_text().strip() != digest:
+            return True, "args hash mismatch"
+    except FileNotFoundError:
+        return True, "no args hash recorded"
+
+    if build_ninja.stat().st_mtime < args_file.stat().st_mtime:
+        return True, "build.ninja older than args.gn"
+    return False, "up to date"
+
+
+def list_gn_args(ctx: Context) -> Optional[Dict[str, str]]:
+    """Effective values of every GN arg (`gn args --list --json`).
+
+    Returns:
+        Dict of arg name -> current value, or None if gn failed
+    """
+    try:
+        result = subprocess.run(
+            [get_gn_command(), "args", ctx.out_dir, "--list", "--json"],
+            cwd=ctx.chromium_src,
+            capture_output=True,
+            text=True,
+        )
+    except OSError as e:
+        log_warning(f"Could not run gn args: {e}")
+        return None
+    if result.returncode != 0:
+        log_warning(f"gn args --list failed: {result.stderr.strip()}")
+        return None
+
+    try:
+        entries = json.loads(result.stdout)
+    except ValueError:
+        return None
+    values = {}
+    for entry in entries:
+        current = entry.get("current") or entry.get("default") or {}
+        values[entry["name"]] = str(current.get("value", ""))
+    return values
+
+
+def log_args_diff(old: Dict[str, str], new: Dict[str, str], label: str) -> int:
+    """Log added, removed and changed args.
+
+    Returns:
+        Number of differing args
+    """
+    changed = sorted(
+        name for name in old.keys() | new.keys() if old.get(name) != new.get(name)
+    )
+    if not changed:
+        return 0
+
+    log_info(f"  {label} args changed ({len(changed)}):")
+    for name in changed:
+        if name not in old:
+            log_info(f"    + {name} = {new[name]}")
+        elif name not in new:
+            log_info(f"    - {name} (was {old[name]})")
+        else:
+            log_info(f"    ~ {name}: {old[name]} → {new[name]}")
+    return len(changed)
 
 
 class ConfigureModule(CommandModule):
     produces = []
     requires = []
     description = "Configure build with GN"
+    reads = ["chromium_src"]
+    writes = ["out_dir"]
 
     def validate(self, ctx: Context) -> None:
         if not ctx.chromium_src.exists():
@@ -22,21 +190,55 @@ class ConfigureModule(CommandModule):
         if not flags_file.exists():
             raise ValidationError(f"GN flags file not found: {flags_file}")
 
+    def inputs(self, ctx: Context) -> ModuleInputs:
+        return ModuleInputs(
+            files=[str(gn_flags_path(ctx))],
+            context=["architecture", "build_type", "out_dir"],
+            # Includes the derived concurrent_links and cc_wrapper args
+            values={"args.gn": effective_args_content(ctx)},
+            outputs=["out_dir/args.gn", "out_dir/build.ninja"],
+        )
+
     def execute(self, ctx: Context) -> None:
         log_info(f"\n⚙️  Configuring {ctx.build_type} build for {ctx.architecture}...")
 
         out_path = join_paths(ctx.chromium_src, ctx.out_dir)
         out_path.mkdir(parents=True, exist_ok=True)
 
-        flags_file = join_paths(ctx.root_dir, ctx.paths.gn_flags_file)
         args_file = ctx.get_gn_args_file()
+        args_content = effective_args_content(ctx)
+
+        needed, reason = needs_gn_gen(ctx, args_content)
+        if not needed:
+            log_success("GN args unchanged and build.ninja up to date - skipping gn gen")
+            return
+
+        log_info(f"  Regenerating ({reason})")
+        if args_file.exists():
+            log_args_diff(
+                parse_gn_args(args_file.read_text()),
+                parse_gn_args(args_content),
+                "Declared",
+            )
+
+        # Effective values before the change, for a full diff afterwards
+        before = None
+        if ctx.env.gn_args_diff and (out_path / "build.ninja").exists():
+            before = list_gn_args(ctx)
+
+        write_text_if_changed(args_file, args_content)
 
-        args_content = flags_file.read_text()
-        args_content += f'\ntarget_cpu = "{ctx.architecture}"\n'
+        run_command(
+            [get_gn_command(), "gen", ctx.out_dir, "--fail-on-unused-args"],
+            cwd=ctx.chromium_src,
+        )
 
-        args_file.write_text(args_content)
+        digest = hashlib.sha256(args_content.encode("utf-8")).hexdigest()
+        (out_path / ARGS_STAMP_FILENAME).write_text(digest + "\n")
 
-        gn_cmd = "gn.bat" if IS_WINDOWS() else "gn"
-        run_command([gn_cmd, "gen", ctx.out_dir, "--fail-on-unused-args"], cwd=ctx.chromium_src)
+        if before is not None:
+            after = list_gn_args(ctx)
+            if after is not None:
+                log_args_diff(before, after, "Effective")
 
         log_success("Build configured")
@@ -11,6 +11,7 @@ class LinuxSignModule(CommandModule):
     produces = []
     requires = []
     description = "Linux code signing (no-op)"
+    reads = ["out_dir"]
 
     def validate(self, ctx: Context) -> None:
         pass
@@ -56,6 +56,7 @@ class MacOSSignModule(CommandModule):
     produces = ["signed_app"]
     requires = ["built_app"]
     description = "Sign and notarize macOS application"
+    writes = ["out_dir", "dist"]
 
     def validate(self, ctx: Context) -> None:
         if not IS_MACOS:
@@ -27,6 +27,7 @@ class SparkleSignModule(CommandModule):
     produces = ["sparkle_signatures"]
     requires = []
     description = "Sign DMG files with Sparkle Ed25519 key for auto-update"
+    writes = ["dist"]
 
     def validate(self, ctx: Context) -> None:
         if not IS_MACOS():
@@ -26,6 +26,7 @@ class WindowsSignModule(CommandModule):
     produces = ["signed_installer"]
     requires = ["built_app"]
     description = "Sign Windows binaries and create signed installer"
+    writes = ["out_dir"]
 
     def validate(self, ctx: Context) -> None:
         if not IS_WINDOWS():
@@ -20,6 +20,7 @@ from ..common.utils import (
     IS_LINUX,
 )
 from ..common.notify import get_notifier, COLOR_GREEN
+from ..common.trace import span
 
 # Try to import boto3 for R2 (S3-compatible)
 try:
@@ -47,6 +48,7 @@ class UploadModule(CommandModule):
     produces = []
     requires = []
     description = "Upload build artifacts to Cloudflare R2"
+    reads = ["dist"]
 
     def validate(self, ctx: Context) -> None:
         if not BOTO3_AVAILABLE:
@@ -121,7 +123,9 @@ def upload_file_to_r2(
     """
     try:
         log_info(f"📤 Uploading {local_path.name}...")
-        client.upload_file(str(local_path), bucket, r2_key)
+        size = local_path.stat().st_size
+        with span(local_path.name, "upload", key=r2_key, bytes=size):
+            client.upload_file(str(local_path), bucket, r2_key)
         log_success(f"✓ Uploaded: {r2_key}")
         return True
     except Exception as e:
@@ -0,0 +1,54 @@
+"""Tests for per-module artifact recording (build/common/context.py)"""
+
+import threading
+from pathlib import Path
+
+from build.common.context import ArtifactRegistry, LegacyArtifacts
+
+
+def test_recording_only_sees_this_threads_artifacts():
+    registry = ArtifactRegistry()
+    legacy = LegacyArtifacts()
+    registry.add("before", Path("before"))
+    started = threading.Barrier(2)
+    recorded = {}
+
+    def module(name):
+        with registry.recording() as added, legacy.recording() as added_legacy:
+            started.wait()
+            registry.add(name, Path(name))
+            legacy[f"{name}_legacy"] = [Path(name)]
+            started.wait()
+        recorded[name] = (added, added_legacy)
+
+    threads = [threading.Thread(target=module, args=(n,)) for n in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert recorded["a"] == ({"a": Path("a")}, {"a_legacy": [Path("a")]})
+    assert recorded["b"] == ({"b": Path("b")}, {"b_legacy": [Path("b")]})
+    assert set(registry.all()) == {"before", "a", "b"}
+
+
+def test_legacy_setdefault_and_update_are_recorded():
+    legacy = LegacyArtifacts(existing=1)
+
+    with legacy.recording() as added:
+        legacy.setdefault("existing", 2)
+        legacy.setdefault("new", 3)
+        legacy.update(other=4)
+
+    assert added == {"new": 3, "other": 4}
+    assert legacy == {"existing": 1, "new": 3, "other": 4}
+
+
+def test_nothing_recorded_outside_a_block():
+    registry = ArtifactRegistry()
+    registry.add("x", Path("x"))
+
+    with registry.recording() as added:
+        pass
+
+    assert added == {}
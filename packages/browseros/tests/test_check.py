@@ -0,0 +1,70 @@
+"""Tests for the parallel patch dry run (build/modules/apply/check.py)"""
+
+from build.modules.apply.check import check_patches
+
+FIRST = """\
+diff --git a/src/file.txt b/src/file.txt
+--- a/src/file.txt
++++ b/src/file.txt
+@@ -1,3 +1,3 @@
+ a
+-b
++B
+ c
+"""
+
+# Only applies on top of FIRST
+SECOND = """\
+diff --git a/src/file.txt b/src/file.txt
+--- a/src/file.txt
++++ b/src/file.txt
+@@ -1,3 +1,3 @@
+-a
++A
+ B
+ c
+"""
+
+
+def make_tree(tmp_path):
+    src = tmp_path / "src_root"
+    (src / "src").mkdir(parents=True)
+    (src / "src/file.txt").write_text("a\nb\nc\n", encoding="utf-8")
+    patches = tmp_path / "patches"
+    patches.mkdir()
+    return src, patches
+
+
+def entries_for(patches, *contents):
+    entries = []
+    for n, content in enumerate(contents):
+        path = patches / f"{n}.patch"
+        path.write_text(content, encoding="utf-8")
+        entries.append((path, path.name))
+    return entries
+
+
+def test_stacked_patches_check_in_order(tmp_path):
+    src, patches = make_tree(tmp_path)
+
+    results = check_patches(entries_for(patches, FIRST, SECOND), src, jobs=2)
+
+    assert [r.status for r in results] == ["ok", "ok"]
+    assert (src / "src/file.txt").read_text(encoding="utf-8") == "a\nb\nc\n"
+
+
+def test_later_patch_fails_without_earlier_one(tmp_path):
+    src, patches = make_tree(tmp_path)
+
+    results = check_patches(entries_for(patches, SECOND), src)
+
+    assert results[0].status == "failed"
+    assert results[0].stderr
+
+
+def test_missing_patch(tmp_path):
+    src, patches = make_tree(tmp_path)
+
+    results = check_patches([(patches / "gone.patch", "gone.patch")], src)
+
+    assert results[0].status == "missing"
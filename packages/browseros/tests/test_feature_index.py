@@ -0,0 +1,52 @@
+"""Tests for the features.yaml path index (build/modules/feature/index.py)"""
+
+from build.modules.feature.index import FeatureIndex, chromium_path_for_patch
+
+FEATURES = {
+    "branding": {"files": ["chrome/app/theme/", "chrome/browser/ui/logo.cc"]},
+    "sidebar": {"files": ["chrome/browser/ui/views/side_panel/"]},
+    "cleanup": {"files": ["chrome/browser/old_feature.cc.deleted"]},
+}
+
+
+def test_chromium_path_for_patch():
+    assert chromium_path_for_patch("chrome/foo.cc") == "chrome/foo.cc"
+    assert chromium_path_for_patch("chrome/foo.cc.deleted") == "chrome/foo.cc"
+    assert chromium_path_for_patch("chrome/logo.png.binary") == "chrome/logo.png"
+    assert chromium_path_for_patch("chrome/new.cc.rename") == "chrome/new.cc"
+
+
+def test_exact_and_directory_entries():
+    index = FeatureIndex(FEATURES)
+
+    assert index.owners("chrome/browser/ui/logo.cc") == ["branding"]
+    assert index.owners("chrome/app/theme/default_100_percent/logo.png") == [
+        "branding"
+    ]
+    assert index.owner("chrome/browser/ui/views/side_panel/a/b.cc") == "sidebar"
+    assert not index.is_classified("chrome/browser/ui/other.cc")
+
+
+def test_marker_entries_cover_the_chromium_file():
+    index = FeatureIndex(FEATURES)
+
+    assert index.is_classified(
+        chromium_path_for_patch("chrome/browser/old_feature.cc.deleted")
+    )
+    assert index.owners("chrome/browser/old_feature.cc") == ["cleanup"]
+    assert index.resolve("cleanup", []) == ["chrome/browser/old_feature.cc"]
+
+
+def test_resolve_expands_directories_against_candidates():
+    index = FeatureIndex(FEATURES)
+    candidates = [
+        "chrome/app/theme/b.png",
+        "chrome/app/theme/a.png",
+        "chrome/app/other.cc",
+    ]
+
+    assert index.resolve("branding", candidates) == [
+        "chrome/browser/ui/logo.cc",
+        "chrome/app/theme/a.png",
+        "chrome/app/theme/b.png",
+    ]
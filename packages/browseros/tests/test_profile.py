@@ -0,0 +1,110 @@
+"""Tests for ninja build profiling (build/modules/compile/profile.py)"""
+
+from build.modules.compile.profile import (
+    NinjaStep,
+    build_report,
+    patched_source_for,
+    patched_sources,
+)
+
+# Object paths as written by Chromium's toolchains:
+# object_subdir = {{target_out_dir}}/{{label_name}}
+PATCHED = [
+    "base/files/file_path.cc",
+    "chrome/browser/chrome_content_browser_client.cc",
+    "chrome/browser/ui/views/frame/browser_view.cc",
+    "chrome/browser/ui/views/tabs/tab_strip.cc",
+    "components/omnibox/browser/autocomplete_controller.cc",
+]
+
+
+def step(output, start_ms=0, end_ms=10):
+    return NinjaStep(start_ms, end_ms, [output], "0")
+
+
+def make_patches(tmp_path, paths):
+    patches_dir = tmp_path / "chromium_patches"
+    for path in paths:
+        patch = patches_dir / path
+        patch.parent.mkdir(parents=True, exist_ok=True)
+        patch.write_text("diff\n")
+    return patches_dir
+
+
+def test_target_dir_of_chromium_objects():
+    assert step("obj/base/base/file_path.o").target_dir == "base"
+    assert (
+        step("obj/chrome/browser/ui/ui/browser_view.obj").target_dir
+        == "chrome/browser/ui"
+    )
+    assert step("obj/foo/foo.o").target_dir == ""
+    assert step("chrome").target_dir is None
+    assert step("gen/base/base_jni_headers.h").target_dir is None
+
+
+def test_matches_sources_in_subdirectories(tmp_path):
+    patched = patched_sources(make_patches(tmp_path, PATCHED))
+
+    expected = {
+        "obj/base/base/file_path.o": "base/files/file_path.cc",
+        "obj/chrome/browser/browser/chrome_content_browser_client.o": (
+            "chrome/browser/chrome_content_browser_client.cc"
+        ),
+        "obj/chrome/browser/ui/ui/browser_view.o": (
+            "chrome/browser/ui/views/frame/browser_view.cc"
+        ),
+        "obj/chrome/browser/ui/views/tabs/tabs/tab_strip.obj": (
+            "chrome/browser/ui/views/tabs/tab_strip.cc"
+        ),
+        "obj/components/omnibox/browser/browser/autocomplete_controller.o": (
+            "components/omnibox/browser/autocomplete_controller.cc"
+        ),
+    }
+    for output, source in expected.items():
+        assert patched_source_for(step(output), patched) == source
+
+
+def test_ignores_objects_outside_the_source_tree(tmp_path):
+    patched = patched_sources(make_patches(tmp_path, PATCHED))
+
+    # Same stem, but the target lives elsewhere
+    assert patched_source_for(step("obj/net/net/file_path.o"), patched) is None
+    # A target in a sibling directory
+    assert (
+        patched_source_for(
+            step("obj/chrome/browser/ui/views/frame/frame/tab_strip.o"), patched
+        )
+        is None
+    )
+    assert patched_source_for(step("obj/base/base/values.o"), patched) is None
+
+
+def test_marker_patches_count_as_patched(tmp_path):
+    patched = patched_sources(
+        make_patches(tmp_path, ["base/files/file_util_posix.cc.deleted"])
+    )
+
+    assert patched == {"file_util_posix": ["base/files/file_util_posix.cc"]}
+
+
+def test_patched_files_on_critical_path(tmp_path):
+    patched = patched_sources(make_patches(tmp_path, PATCHED))
+    steps = [
+        step("obj/base/base/file_path.o", 0, 100),
+        step("obj/net/net/url_request.o", 0, 50),
+        step("obj/chrome/browser/ui/ui/browser_view.o", 100, 400),
+        step("chrome", 400, 900),
+    ]
+
+    report = build_report(steps, patched)
+
+    assert report["patched_on_critical_path"] == [
+        "base/files/file_path.cc",
+        "chrome/browser/ui/views/frame/browser_view.cc",
+    ]
+    assert report["directory_cpu_ms"] == {
+        "chrome/browser/ui": 300,
+        "base": 100,
+        "net": 50,
+        "(other)": 500,
+    }
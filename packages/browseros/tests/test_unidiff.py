@@ -0,0 +1,279 @@
+"""Tests for the in-process unified diff applier (build/modules/apply/unidiff.py)"""
+
+import os
+import stat
+
+import pytest
+
+from build.modules.apply.unidiff import (
+    PatchApplyError,
+    UnsupportedPatchError,
+    apply_patch_text,
+    split_lines,
+)
+
+LINES = "".join(f"line {n}\n" for n in range(1, 11))
+
+MODIFY_PATCH = """\
+diff --git a/src/file.txt b/src/file.txt
+--- a/src/file.txt
++++ b/src/file.txt
+@@ -4,7 +4,7 @@
+ line 4
+ line 5
+ line 6
+-line 7
++line seven
+ line 8
+ line 9
+ line 10
+"""
+
+
+@pytest.fixture
+def umask_022():
+    old = os.umask(0o022)
+    yield
+    os.umask(old)
+
+
+def write(root, name, content, newline=None):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline=newline) as f:
+        f.write(content)
+    return path
+
+
+def read(path):
+    return path.read_bytes().decode("utf-8")
+
+
+def test_applies_at_expected_position(tmp_path):
+    path = write(tmp_path, "src/file.txt", LINES)
+
+    assert apply_patch_text(MODIFY_PATCH, tmp_path) == ["src/file.txt"]
+
+    assert read(path) == LINES.replace("line 7\n", "line seven\n")
+
+
+def test_applies_at_offset(tmp_path):
+    path = write(tmp_path, "src/file.txt", "header 1\nheader 2\n" + LINES)
+
+    apply_patch_text(MODIFY_PATCH, tmp_path)
+
+    assert read(path) == "header 1\nheader 2\n" + LINES.replace(
+        "line 7\n", "line seven\n"
+    )
+
+
+def test_offset_beyond_window_fails(tmp_path):
+    headers = "".join(f"header {n}\n" for n in range(5))
+    path = write(tmp_path, "src/file.txt", headers + LINES)
+
+    with pytest.raises(PatchApplyError):
+        apply_patch_text(MODIFY_PATCH, tmp_path, max_offset=3)
+    assert read(path) == headers + LINES
+
+
+def test_outer_context_mismatch_needs_fuzz(tmp_path):
+    content = LINES.replace("line 4\n", "changed 4\n")
+    path = write(tmp_path, "src/file.txt", content)
+
+    with pytest.raises(PatchApplyError):
+        apply_patch_text(MODIFY_PATCH, tmp_path)
+
+    apply_patch_text(MODIFY_PATCH, tmp_path, fuzz=1)
+    assert read(path) == content.replace("line 7\n", "line seven\n")
+
+
+def test_changed_line_never_fuzzed(tmp_path):
+    path = write(tmp_path, "src/file.txt", LINES.replace("line 7\n", "other\n"))
+
+    with pytest.raises(PatchApplyError):
+        apply_patch_text(MODIFY_PATCH, tmp_path, fuzz=3)
+    assert "other\n" in read(path)
+
+
+def test_dry_run_leaves_files_alone(tmp_path):
+    path = write(tmp_path, "src/file.txt", LINES)
+
+    assert apply_patch_text(MODIFY_PATCH, tmp_path, dry_run=True) == ["src/file.txt"]
+
+    assert read(path) == LINES
+
+
+def test_new_file_uses_umask_permissions(tmp_path, umask_022):
+    patch = """\
+diff --git a/src/new.txt b/src/new.txt
+new file mode 100644
+--- /dev/null
++++ b/src/new.txt
+@@ -0,0 +1,2 @@
++first
++second
+"""
+    apply_patch_text(patch, tmp_path)
+
+    path = tmp_path / "src/new.txt"
+    assert read(path) == "first\nsecond\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_new_executable_file(tmp_path, umask_022):
+    patch = """\
+diff --git a/run.sh b/run.sh
+new file mode 100755
+--- /dev/null
++++ b/run.sh
+@@ -0,0 +1 @@
++#!/bin/sh
+"""
+    apply_patch_text(patch, tmp_path)
+
+    assert stat.S_IMODE((tmp_path / "run.sh").stat().st_mode) == 0o755
+
+
+def test_new_file_that_exists_fails(tmp_path):
+    write(tmp_path, "src/new.txt", "already here\n")
+    patch = """\
+--- /dev/null
++++ b/src/new.txt
+@@ -0,0 +1 @@
++first
+"""
+    with pytest.raises(PatchApplyError):
+        apply_patch_text(patch, tmp_path)
+
+
+def test_modified_file_keeps_its_mode(tmp_path):
+    path = write(tmp_path, "src/file.txt", LINES)
+    os.chmod(path, 0o750)
+
+    apply_patch_text(MODIFY_PATCH, tmp_path)
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o750
+
+
+def test_deleted_file(tmp_path):
+    path = write(tmp_path, "src/old.txt", "a\nb\n")
+    patch = """\
+diff --git a/src/old.txt b/src/old.txt
+deleted file mode 100644
+--- a/src/old.txt
++++ /dev/null
+@@ -1,2 +0,0 @@
+-a
+-b
+"""
+    apply_patch_text(patch, tmp_path)
+
+    assert not path.exists()
+
+
+def test_deleted_file_with_other_content_fails(tmp_path):
+    path = write(tmp_path, "src/old.txt", "a\nb\nc\n")
+    patch = """\
+--- a/src/old.txt
++++ /dev/null
+@@ -1,2 +0,0 @@
+-a
+-b
+"""
+    with pytest.raises(PatchApplyError):
+        apply_patch_text(patch, tmp_path)
+    assert path.exists()
+
+
+def test_crlf_file(tmp_path):
+    path = write(tmp_path, "win.txt", "one\ntwo\nthree\n", newline="\r\n")
+    patch = (
+        "--- a/win.txt\r\n"
+        "+++ b/win.txt\r\n"
+        "@@ -1,3 +1,3 @@\r\n"
+        " one\r\n"
+        "-two\r\n"
+        "+TWO\r\n"
+        " three\r\n"
+    )
+    apply_patch_text(patch, tmp_path)
+
+    assert read(path) == "one\r\nTWO\r\nthree\r\n"
+
+
+def test_adds_missing_newline_at_end_of_file(tmp_path):
+    path = write(tmp_path, "src/file.txt", "a\nb")
+    patch = """\
+--- a/src/file.txt
++++ b/src/file.txt
+@@ -1,2 +1,2 @@
+ a
+-b
+\\ No newline at end of file
++b
+"""
+    apply_patch_text(patch, tmp_path)
+
+    assert read(path) == "a\nb\n"
+
+
+def test_removes_newline_at_end_of_file(tmp_path):
+    path = write(tmp_path, "src/file.txt", "a\nb\n")
+    patch = """\
+--- a/src/file.txt
++++ b/src/file.txt
+@@ -1,2 +1,2 @@
+ a
+-b
++c
+\\ No newline at end of file
+"""
+    apply_patch_text(patch, tmp_path)
+
+    assert read(path) == "a\nc"
+
+
+def test_stacked_diffs_for_one_file(tmp_path):
+    path = write(tmp_path, "src/file.txt", "a\nb\nc\n")
+    patch = """\
+--- a/src/file.txt
++++ b/src/file.txt
+@@ -1,3 +1,3 @@
+ a
+-b
++B
+ c
+--- a/src/file.txt
++++ b/src/file.txt
+@@ -1,3 +1,3 @@
+-a
++A
+ B
+ c
+"""
+    assert apply_patch_text(patch, tmp_path) == ["src/file.txt"]
+
+    assert read(path) == "A\nB\nc\n"
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        "diff --git a/a.txt b/b.txt\n"
+        "similarity index 90%\nrename from a.txt\nrename to b.txt\n",
+        "diff --git a/a.txt b/a.txt\nold mode 100644\nnew mode 100755\n"
+        "--- a/a.txt\n+++ b/a.txt\n@@ -1 +1 @@\n-a\n+b\n",
+        "diff --git a/a.txt b/a.txt\nGIT binary patch\nliteral 0\n",
+    ],
+    ids=["rename", "mode change", "binary"],
+)
+def test_unsupported_patches(tmp_path, patch):
+    path = write(tmp_path, "a.txt", "a\n")
+
+    with pytest.raises(UnsupportedPatchError):
+        apply_patch_text(patch, tmp_path)
+    assert read(path) == "a\n"
+
+
+def test_split_lines_only_splits_on_newline():
+    assert split_lines("a\x0cb\u2028c\nd") == ["a\x0cb\u2028c\n", "d"]
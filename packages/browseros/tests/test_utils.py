@@ -0,0 +1,35 @@
+"""Tests for the atomic file writers (build/common/utils.py)"""
+
+import json
+import threading
+
+from build.common.utils import write_json_atomic
+
+
+def test_write_json_atomic(tmp_path):
+    path = tmp_path / "state" / "data.json"
+
+    write_json_atomic(path, {"b": 1, "a": [1, 2]}, sort_keys=True)
+
+    assert path.read_text(encoding="utf-8") == (
+        '{\n  "a": [\n    1,\n    2\n  ],\n  "b": 1\n}\n'
+    )
+
+
+def test_concurrent_writers_leave_no_temp_files(tmp_path):
+    path = tmp_path / "data.json"
+    start = threading.Barrier(8)
+
+    def writer(n):
+        start.wait()
+        for i in range(20):
+            write_json_atomic(path, {"writer": n, "i": i})
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert json.loads(path.read_text(encoding="utf-8"))["i"] == 19
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]